@@ -0,0 +1,230 @@
+"""
+Static asset pipeline.
+
+    python assets.py           build static/dist and its manifest
+    python assets.py --keep 5  ... keeping the files of the last 5 builds
+    python assets.py --clean   remove static/dist
+
+Every .css/.js file in static/ is minified, written to static/dist under a
+content-hashed name (dashboard.3f2a9c1e.css) and precompressed next to it
+(.gz, plus .br when the `brotli` package is installed). Templates resolve
+names with the `asset_url` Jinja helper; PrecompressedStaticFiles serves the
+smallest variant the client accepts and marks hashed files immutable.
+
+Superseded files are kept for the previous KEEP_BUILDS builds (recorded in
+dist/manifests.json), so during a rolling deploy pages rendered by workers
+still on the old code keep resolving their asset URLs.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import stat
+import sys
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST = "dist"
+MANIFEST = "manifest.json"
+HISTORY = "manifests.json"  # recent manifests, newest first
+KEEP_BUILDS = 3
+EXTENSIONS = (".css", ".js")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# logical name ("dashboard.css") -> path under /static ("dist/dashboard.3f2a9c1e.css")
+manifest = {}
+
+
+# ==================== BUILD ====================
+
+def minify_css(css: str) -> str:
+    if rcssmin:
+        return rcssmin.cssmin(css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    # Not around ':' (descendant + pseudo-class) or '+'/'-' (calc())
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    if rjsmin:
+        return rjsmin.jsmin(js)
+    # Without rjsmin only do what can't change behaviour: drop indentation,
+    # blank lines and whole-line comments, but never inside template literals
+    lines = []
+    in_template = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if not in_template:
+            if not stripped or stripped.startswith("//"):
+                continue
+            line = stripped
+        lines.append(line.rstrip())
+        if len(re.findall(r"(?<!\\)`", line)) % 2:
+            in_template = not in_template
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: str, data: bytes):
+    # Atomic, so several workers building at startup never serve a partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def build(static_dir: str = STATIC_DIR, keep: int = KEEP_BUILDS) -> dict:
+    """
+    Build static/dist and return the manifest; unchanged files produce identical names.
+    Files referenced by the last `keep` distinct builds (this one included) survive pruning.
+    """
+    dist_dir = os.path.join(static_dir, DIST)
+    os.makedirs(dist_dir, exist_ok=True)
+    built = {}
+    for name in sorted(os.listdir(static_dir)):
+        base, ext = os.path.splitext(name)
+        if ext not in EXTENSIONS or not os.path.isfile(os.path.join(static_dir, name)):
+            continue
+        with open(os.path.join(static_dir, name), encoding="utf-8") as f:
+            source = f.read()
+        data = (minify_css(source) if ext == ".css" else minify_js(source)).encode("utf-8")
+        hashed = f"{base}.{hashlib.sha256(data).hexdigest()[:8]}{ext}"
+        path = os.path.join(dist_dir, hashed)
+        if not os.path.exists(path):
+            _write(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli:
+                _write(path + ".br", brotli.compress(data, quality=11))
+            _write(path, data)
+        built[name] = f"{DIST}/{hashed}"
+
+    history = [m for m in _read_json(os.path.join(dist_dir, HISTORY), []) if isinstance(m, dict)]
+    if not history or history[0] != built:
+        history.insert(0, built)
+    history = history[:max(keep, 1)]
+    _write(os.path.join(dist_dir, HISTORY), json.dumps(history, indent=2).encode("utf-8"))
+
+    # Drop outputs that no recent build references
+    referenced = {os.path.basename(path) for m in history for path in m.values()}
+    for name in os.listdir(dist_dir):
+        output = name.removesuffix(".gz").removesuffix(".br")
+        if name not in (MANIFEST, HISTORY) and not name.endswith(".tmp") and output not in referenced:
+            try:
+                os.remove(os.path.join(dist_dir, name))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+    _write(os.path.join(dist_dir, MANIFEST), json.dumps(built, indent=2).encode("utf-8"))
+    manifest.clear()
+    manifest.update(built)
+    return built
+
+
+def load_manifest(static_dir: str = STATIC_DIR) -> dict:
+    """Load a manifest written by build(); missing manifest means unhashed URLs"""
+    manifest.clear()
+    manifest.update(_read_json(os.path.join(static_dir, DIST, MANIFEST), {}))
+    return manifest
+
+
+# ==================== RUNTIME ====================
+
+def asset_url(name: str) -> str:
+    """Jinja helper: URL of the fingerprinted build of a static file (the plain file if not built)"""
+    return "/static/" + manifest.get(name, name)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the .br/.gz sibling of a file when the client
+    accepts it, and sends immutable caching for the fingerprinted files in
+    dist/ (everything else is revalidated with its ETag).
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = {
+            part.split(";")[0].strip().lower()
+            for part in request_headers.get("accept-encoding", "").split(",")
+        }
+        response = None
+        for encoding, suffix in self.ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                response = FileResponse(full_path, stat_result=stat_result, media_type=media_type)
+                response.headers["content-encoding"] = encoding
+                if self.is_not_modified(response.headers, request_headers):
+                    response = NotModifiedResponse(response.headers)
+                break
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["vary"] = "Accept-Encoding"
+            fingerprinted = path.replace(os.sep, "/").startswith(DIST + "/")
+            response.headers["cache-control"] = IMMUTABLE if fingerprinted else REVALIDATE
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets")
+    parser.add_argument("--keep", type=int, default=KEEP_BUILDS, help="builds whose files are kept for rolling deploys")
+    parser.add_argument("--clean", action="store_true", help="remove static/dist")
+    args = parser.parse_args()
+
+    if args.clean:
+        shutil.rmtree(os.path.join(STATIC_DIR, DIST), ignore_errors=True)
+        print("🧹 Removed static/dist")
+        return 0
+
+    built = build(keep=args.keep)
+    for name, path in built.items():
+        size = os.path.getsize(os.path.join(STATIC_DIR, name))
+        minified = os.path.getsize(os.path.join(STATIC_DIR, path))
+        gzipped = os.path.getsize(os.path.join(STATIC_DIR, path + ".gz"))
+        print(f"{name:16} {size:>8} -> {minified:>8} min -> {gzipped:>7} gz  {path}")
+    if not brotli:
+        print("⚠️ brotli not installed: only gzip variants were written")
+    if not (rcssmin and rjsmin):
+        print("⚠️ rcssmin/rjsmin not installed: fell back to whitespace-only minification")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
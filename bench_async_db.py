@@ -0,0 +1,107 @@
+"""
+Load test: concurrent request throughput with blocking vs. executor-backed DB calls.
+
+    python bench_async_db.py --requests 400 --concurrency 50 --query-ms 20
+
+Drives the real GET /api/info handler (routers.auth.getUserInfo) with many
+concurrent callers on one event loop, as uvicorn would. The database is
+stubbed with a function that blocks for --query-ms like a mysql.connector
+round trip, so no MySQL server is needed.
+
+  before  the handler awaits a facade that calls models/database.py directly
+          (the pre-repository code path: every query stalls the event loop)
+  after   the handler awaits models/repository.py (queries run on the
+          bounded DB executor, DB_EXECUTOR_WORKERS threads)
+
+Besides throughput and latency it reports the event loop's worst stall,
+measured by a heartbeat task, i.e. how long any other request would hang.
+"""
+import argparse
+import asyncio
+import time
+from models import database, repository
+from routers import auth as auth_router
+
+
+def slow_dashboard(query_seconds: float):
+    def getUserForDashboard(userId):
+        time.sleep(query_seconds)  # blocking driver round trip
+        return {
+            "user": {"userId": userId, "fname": "Asha", "lname": "Rao", "email": "asha@example.com"},
+            "address": None,
+            "reminders": [],
+        }
+    return getUserForDashboard
+
+
+class BlockingRepository:
+    """The routers' view of the database before the async repository: blocking calls inside async handlers"""
+
+    async def getUserForDashboard(self, userId):
+        return database.getUserForDashboard(userId)
+
+
+async def heartbeat(stalls: list, interval: float = 0.005):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - start - interval)
+
+
+async def load(requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    stalls = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await auth_router.getUserInfo({"sub": f"user-{i % concurrency}"})
+            latencies.append(time.perf_counter() - start)
+
+    beat = asyncio.create_task(heartbeat(stalls))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+        "max_stall": max(stalls, default=0.0),
+    }
+
+
+def report(name: str, result: dict):
+    print(f"{name:7} {result['rps']:9.1f} req/s   p50 {result['p50'] * 1000:8.1f} ms   "
+          f"p95 {result['p95'] * 1000:8.1f} ms   worst loop stall {result['max_stall'] * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent /api/info throughput, blocking vs. async repository")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=20.0, help="simulated query latency")
+    args = parser.parse_args()
+
+    # Replaces the cached read as a whole, so every call pays the query latency
+    database.getUserForDashboard = slow_dashboard(args.query_ms / 1000)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.query_ms:g} ms per query, "
+          f"{repository.executor._max_workers} DB executor threads")
+    auth_router.db = BlockingRepository()
+    before = asyncio.run(load(args.requests, args.concurrency))
+    report("before", before)
+
+    auth_router.db = repository
+    after = asyncio.run(load(args.requests, args.concurrency))
+    report("after", after)
+    print(f"{'':7} {after['rps'] / before['rps']:9.1f}x throughput")
+
+    repository.shutdown()
+
+
+if __name__ == "__main__":
+    main()
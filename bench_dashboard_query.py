@@ -0,0 +1,146 @@
+"""
+Benchmark: getUserForDashboard's single joined query vs. the old three queries.
+
+    python bench_dashboard_query.py --reminders 50 --rtt-ms 1 --rounds 500
+    python bench_dashboard_query.py --mysql <userId>    # against the configured database
+
+By default both read paths run against an in-memory SQLite stand-in with the
+same tables, reached through a getCursor() replacement. SQLite has no network,
+so --rtt-ms adds a simulated client/server round trip to every execute(),
+which is the cost the joined query saves. With --mysql the real pool is used
+for an existing user and nothing is written.
+
+  three queries  SELECT * FROM USERS / ADDRESS / remainders, one after another
+                 (the read path before the joined query)
+  joined         models.database._loadUserForDashboard
+"""
+import argparse
+import re
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from models import database
+
+SCHEMA = """
+CREATE TABLE USERS (
+  userId TEXT PRIMARY KEY, fname TEXT NOT NULL, lname TEXT NOT NULL, mobileNumber INTEGER,
+  email TEXT NOT NULL, password TEXT NOT NULL, gender TEXT, birthDate TEXT, bloodGroup TEXT,
+  emergencyContactNumber INTEGER, allergies TEXT, medicalConditions TEXT,
+  confirmationSms INTEGER DEFAULT 1, confirmationCall INTEGER DEFAULT 1,
+  timezone TEXT DEFAULT 'Asia/Kolkata', countryCode TEXT DEFAULT '+91'
+);
+CREATE TABLE ADDRESS (
+  userId TEXT PRIMARY KEY, streetAddress TEXT, city TEXT, state TEXT, pinCode INTEGER, country TEXT
+);
+CREATE TABLE remainders (
+  reminderId TEXT PRIMARY KEY, userId TEXT, medicineName TEXT, dosage TEXT, time TEXT, minuteOfDay INTEGER
+);
+CREATE INDEX idx_remainders_user_minute_id ON remainders (userId, minuteOfDay, reminderId);
+"""
+
+
+class SQLiteCursor:
+    """The slice of mysql.connector's dict cursor that the read paths use"""
+
+    def __init__(self, conn: sqlite3.Connection, rtt: float):
+        self.cursor = conn.cursor()
+        self.rtt = rtt
+
+    def execute(self, query: str, params=()):
+        if self.rtt:
+            time.sleep(self.rtt)
+        self.cursor.execute(re.sub(r"%s", "?", query), params)
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchall(self):
+        return [dict(row) for row in self.cursor.fetchall()]
+
+
+def sqlite_stand_in(users: int, reminders: int, rtt: float) -> str:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    target = None
+    for u in range(users):
+        user_id = str(uuid.uuid4())
+        target = target or user_id
+        conn.execute(
+            "INSERT INTO USERS (userId, fname, lname, mobileNumber, email, password, gender, birthDate, bloodGroup,"
+            " emergencyContactNumber, allergies, medicalConditions) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+            (user_id, "Asha", "Rao", 9800000000 + u, f"user{u}@example.com", "$2b$12$" + "x" * 53, "female",
+             "1990-01-15", "O+", 9123456789, "Penicillin", "Hypertension")
+        )
+        conn.execute("INSERT INTO ADDRESS VALUES (?,?,?,?,?,?)", (user_id, "12 MG Road", "Pune", "Maharashtra", 411001, "India"))
+        conn.executemany(
+            "INSERT INTO remainders VALUES (?,?,?,?,?,?)",
+            [
+                (str(uuid.uuid4()), user_id, f"Medicine {r}", "500 mg", f"{r % 24:02d}:{r % 60:02d}", (r % 24) * 60 + r % 60)
+                for r in range(reminders)
+            ]
+        )
+    conn.commit()
+
+    @contextmanager
+    def getCursor():
+        yield conn, SQLiteCursor(conn, rtt)
+
+    database.getCursor = getCursor
+    return target
+
+
+def three_queries(userId):
+    with database.getCursor() as (conn, cus):
+        cus.execute("SELECT * FROM USERS WHERE userId = %s", (userId,))
+        user = cus.fetchone()
+        if user:
+            user.pop("password", None)
+        cus.execute("SELECT * FROM ADDRESS WHERE userId = %s", (userId,))
+        address = cus.fetchone()
+        cus.execute("SELECT * FROM remainders WHERE userId = %s", (userId,))
+        reminders = cus.fetchall()
+        return {"user": user, "address": address, "reminders": reminders}
+
+
+def bench(name: str, fn, userId: str, rounds: int) -> float:
+    result = fn(userId)
+    if "error from database" in result:
+        raise SystemExit(f"{name}: {result['error from database']}")
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(userId)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+    print(f"{name:14} p50 {p50 * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms   {len(result['reminders'])} reminders")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard read path latency, joined vs. three queries")
+    parser.add_argument("--reminders", type=int, default=50, help="reminders of the benchmarked user (stand-in)")
+    parser.add_argument("--users", type=int, default=1000, help="users in the stand-in tables")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round trip per query (stand-in)")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--mysql", metavar="USER_ID", help="use the configured database and this existing user")
+    args = parser.parse_args()
+
+    if args.mysql:
+        userId = args.mysql
+        print(f"MySQL/TiDB via the connection pool, user {userId}")
+    else:
+        userId = sqlite_stand_in(args.users, args.reminders, args.rtt_ms / 1000)
+        print(f"SQLite stand-in: {args.users} users, {args.reminders} reminders, {args.rtt_ms:g} ms simulated RTT")
+
+    before = bench("three queries", three_queries, userId, args.rounds)
+    after = bench("joined", database._loadUserForDashboard, userId, args.rounds)
+    print(f"{'':14} joined is {before / after:.2f}x the speed of three queries at p50")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: ReminderEngine add / remove / fire cost at 10k, 100k and 1M reminders.
+
+    python bench_engine.py                      # 10k, 100k, 1M
+    python bench_engine.py --sizes 10000 --ops 5000 --memory
+
+Reminder times follow a realistic skew: most reminders sit on a handful of
+popular times (08:00, 13:00, 20:00, ...) and the rest are spread over the
+day, in three timezones. For each size it reports:
+
+  bulk load   add_many() of every reminder (startup hydration), per reminder
+  add         single add() into a populated engine
+  remove      single cancel() of one reminder's jobs
+  fire        due(slot) for a popular minute and for a quiet minute
+              (what the scheduler tick does once per zone per minute)
+
+--memory also traces the engine's allocations during the bulk load (slow).
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from reminder_engine import ReminderEngine
+
+ZONES = ("Asia/Kolkata", "Europe/London", "America/New_York")
+POPULAR = (8 * 60, 9 * 60, 13 * 60, 20 * 60, 21 * 60, 22 * 60)
+
+
+def reminder_items(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        minute = rng.choice(POPULAR) if rng.random() < 0.7 else rng.randrange(1440)
+        zone = ZONES[i % len(ZONES)]
+        reminder = {
+            "reminder_id": f"r{i}", "user_id": f"u{i // 3}", "user_phone": f"+9198{i:08d}",
+            "medicine_name": "Medicine", "dosage": "500 mg", "time": f"{minute // 60:02d}:{minute % 60:02d}",
+            "timezone": zone,
+        }
+        items.append((f"reminder_r{i}_{minute // 60:02d}{minute % 60:02d}", (zone, minute), reminder))
+    return items
+
+
+def per_op(fn, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - start) / ops
+
+
+def bench(size: int, ops: int, memory: bool):
+    items = reminder_items(size)
+    engine = ReminderEngine()
+
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    engine.add_many(items)
+    load = time.perf_counter() - start
+    if memory:
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    extra = reminder_items(ops, seed=2)
+    add = per_op(lambda i: engine.add(f"extra_{i}", extra[i][1], dict(extra[i][2], reminder_id=f"x{i}")), ops)
+    ids = random.Random(3).sample(range(size), min(ops, size))
+    remove = per_op(lambda i: engine.cancel(f"r{ids[i]}"), len(ids))
+
+    popular = (ZONES[0], POPULAR[0])
+    quiet = (ZONES[0], 7 * 60 + 17)
+    fire_popular = per_op(lambda i: engine.due(popular), 50)
+    fire_quiet = per_op(lambda i: engine.due(quiet), 200)
+
+    stats = engine.stats()
+    print(f"\n{size:,} reminders: {stats['buckets']:,} buckets in {stats['zones']} zones")
+    print(f"  bulk load   {load:8.2f} s total   {load / size * 1e6:8.2f} µs/reminder")
+    print(f"  add         {add * 1e6:8.2f} µs")
+    print(f"  remove      {remove * 1e6:8.2f} µs")
+    print(f"  fire        {fire_popular * 1e3:8.3f} ms for a popular minute ({len(engine.due(popular)):,} jobs)")
+    print(f"  fire        {fire_quiet * 1e3:8.3f} ms for a quiet minute ({len(engine.due(quiet)):,} jobs)")
+    if memory:
+        print(f"  memory      {allocated / 2 ** 20:8.1f} MiB   {allocated / size:8.0f} B/reminder")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ReminderEngine add/remove/fire benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=10_000, help="single adds/removes timed per size")
+    parser.add_argument("--memory", action="store_true", help="trace allocations during the bulk load")
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.ops, args.memory)
+
+
+if __name__ == "__main__":
+    main()
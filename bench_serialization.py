@@ -0,0 +1,99 @@
+"""
+Microbenchmark: serializing the /api/info payload.
+
+    python bench_serialization.py --reminders 500 --rounds 200
+
+Builds a dashboard payload shaped like getUserForDashboard's rows (Decimal
+phone numbers, date birthDate) and times the ways a route can turn it into
+bytes:
+
+  jsonable_encoder  untyped dict route: FastAPI's recursive encoder + json.dumps
+  response_model    DashboardResponse validated and dumped by pydantic-core + orjson
+  model_dump_json   pydantic-core straight to bytes (lower bound)
+
+The typed bodies are a few bytes longer: jsonable_encoder writes the integral
+Decimal phone numbers as JSON numbers, DashboardResponse declares them str.
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from models.models import DashboardResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def payload(reminders: int) -> dict:
+    user_id = str(uuid.uuid4())
+    return {
+        "user": {
+            "userId": user_id, "fname": "Asha", "lname": "Rao", "email": "asha@example.com",
+            "mobileNumber": Decimal("9876543210"), "gender": "Female", "birthDate": date(1990, 1, 15),
+            "bloodGroup": "O+", "emergencyContactNumber": Decimal("9123456789"),
+            "allergies": "Penicillin", "medicalConditions": "Hypertension",
+        },
+        "address": {
+            "streetAddress": "12 MG Road", "city": "Pune", "state": "Maharashtra",
+            "pinCode": 411001, "country": "India",
+        },
+        "reminders": [
+            {
+                "reminderId": str(uuid.uuid4()), "medicineName": f"Medicine {i}",
+                "dosage": f"{(i % 5 + 1) * 100} mg", "time": f"{i * 7 % 24:02d}:{i % 60:02d}",
+            }
+            for i in range(reminders)
+        ],
+    }
+
+
+def bench(name: str, fn, rounds: int):
+    body = fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    per_call = (time.perf_counter() - start) / rounds
+    print(f"{name:18} {per_call * 1e6:10.1f} µs/call  {len(body):>8} bytes")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time /api/info response serialization")
+    parser.add_argument("--reminders", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    data = payload(args.reminders)
+    adapter = TypeAdapter(DashboardResponse)
+
+    def untyped():
+        # JSONResponse.render of jsonable_encoder output (the route without a response_model)
+        return json.dumps(jsonable_encoder(data), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    def typed():
+        # FastAPI's serialize_response with a response_model, then ORJSONResponse.render
+        content = adapter.dump_python(adapter.validate_python(data), mode="json")
+        if orjson:
+            return orjson.dumps(content)
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+    def model_json():
+        return DashboardResponse.model_validate(data).model_dump_json().encode("utf-8")
+
+    print(f"/api/info payload with {args.reminders} reminders, {args.rounds} rounds"
+          f"{'' if orjson else ' (orjson not installed: typed path uses json.dumps)'}")
+    baseline = bench("jsonable_encoder", untyped, args.rounds)
+    for name, fn in (("response_model", typed), ("model_dump_json", model_json)):
+        per_call = bench(name, fn, args.rounds)
+        print(f"{'':18} {baseline / per_call:10.1f}x faster than jsonable_encoder")
+
+
+if __name__ == "__main__":
+    main()
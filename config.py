@@ -7,8 +7,51 @@ class Settings(BaseSettings):
     USER_NAME: str = "root"
     USER_PASSWORD: str = "password"
     DB_NAME: str = "mydatabase"
+    DB_PORT: int = 4000
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = 30.0  # ping connections idle longer than this
+    RUN_MIGRATIONS_ON_STARTUP: bool = False  # otherwise run `python -m models.migrate` before deploying
+    BUILD_ASSETS_ON_STARTUP: bool = True  # otherwise run `python assets.py` before deploying
+    ASSET_KEEP_BUILDS: int = 3  # previous builds' static/dist files kept for workers still on old code
+    DB_EXECUTOR_WORKERS: int = 0  # threads for async DB calls, 0 = DB_POOL_MAX_SIZE
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "local"  # "local" (in-process LRU) or "shared" (LRU in front of the shared-cache stand-in)
+    CACHE_TTL_SECONDS: float = 60.0  # also bounds staleness across workers
+    CACHE_MAX_ENTRIES: int = 10000
+    API_COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller JSON responses are sent uncompressed
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "argon2" (bcrypt hashes are rehashed on login)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # extra hashing requests allowed to wait before returning 503
+    DISPATCH_WORKERS: int = 20  # concurrent reminder deliveries
+    SMS_RATE_PER_SECOND: float = 10.0  # 0 = unlimited
+    CALL_RATE_PER_SECOND: float = 1.0  # 0 = unlimited
+    TWILIO_MAX_CONCURRENCY: int = 20  # in-flight Twilio API requests
+    TWILIO_TIMEOUT: float = 15.0  # seconds
+    TWILIO_API_BASE: str = "https://api.twilio.com"  # point at fake_twilio.py for local testing
+    TWILIO_MAX_RETRIES: int = 3  # retries on 429/5xx with jittered exponential backoff
+    TWILIO_BREAKER_THRESHOLD: int = 5  # consecutive failures before the circuit opens
+    TWILIO_BREAKER_RESET_SECONDS: float = 30.0
+    NOTIFICATION_OUTBOX: bool = True  # persist notifications in notification_outbox before sending; False sends from memory only
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 2.0  # seconds between polls when not woken
+    OUTBOX_CLAIM_SECONDS: int = 120  # a claimed row is retried if not completed in time
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    HYDRATION_BATCH_SIZE: int = 1000  # reminders loaded per query on startup
+    HYDRATE_IN_BACKGROUND: bool = True  # serve requests while reminders are still loading
+    DEFAULT_TIMEZONE: str = "Asia/Kolkata"  # for users without a valid timezone
+    DEFAULT_COUNTRY_CODE: str = "+91"  # prefixed to national phone numbers without a country code
+    SCHEDULER_JOB_STORE: str = "memory"  # "memory" (hydrated index) or "database" (query due reminders each tick)
+    SCHEDULER_LEADER_ELECTION: bool = False  # enable (with the database job store) when running more than one worker
+    SCHEDULER_LEASE_TTL: int = 30  # seconds
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # short-lived; renewed from the refresh cookie
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_COOKIE_SECURE: bool = True  # set False when serving over plain http locally
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # verified JWTs kept in memory
+    TOKEN_CACHE_MAX_TTL: float = 300.0  # seconds, capped by the token's own exp
     TWILIO_SID: str
     TWILIO_AUTH_TOKEN: str
     TWILIO_PHONE_NUMBER: str
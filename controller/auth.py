@@ -6,42 +6,218 @@ from config import settings
 from datetime import datetime, timedelta
 from jose import jwt
 from config import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import OrderedDict
+import asyncio
+import copy
+import hashlib
+import threading
+import time
 
-def verifyToken(token: str):
-    try:
-        # Decode the JWT token to get the payload as a Python dictionary
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        # Extract the 'sub' from the decoded payload (sub should be a string)
+class TokenCache:
+    """
+    Bounded LRU of already-verified tokens keyed by their SHA-256 digest.
+    Entries never outlive the token's own `exp`, so expiry is still enforced.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.entries = OrderedDict()  # digest -> (expires_at, claims)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: bytes, claims: dict, exp=None):
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self.lock:
+            self.entries[key] = (expires_at, copy.deepcopy(claims))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_MAX_TTL)
+
+def verifyToken(token: str, typ: str = "access"):
+    """Verified claims ({"sub", "typ"}) of a token of the given type"""
+    key = token_cache.key(token)
+    claims = token_cache.get(key)
+    if claims is None:
+        try:
+            # Decode the JWT token to get the payload as a Python dictionary
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Token expired")
+        except jwt.JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
         sub = payload.get("sub")
-        user= payload.get("user")
         if sub is None:
-            raise ValueError("The 'sub' field is missing from the token.") 
-        # You can now use 'sub' as a string (e.g., email, user ID)
-        return {"user": user, "sub": sub}
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        claims = {"sub": sub, "typ": payload.get("typ")}
+        token_cache.set(key, claims, payload.get("exp"))
+    # A refresh token must never be accepted as an access token and vice versa
+    if claims["typ"] != typ:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return claims
     
 def getCurrentUserFromCookie(access_token: str = Cookie(None)):
     if not access_token:
         raise HTTPException(status_code=401, detail="Not authenticated - No token provided")
     return verifyToken(access_token)
 
-pwd_context = CryptContext(schemes= ["bcrypt"],deprecated= "auto")
-def createAccessToken(data:dict,expires_delta: timedelta):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=1)
-    to_encode.update({"exp":expire})
-    encode_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encode_jwt
+def getCurrentUser(request: Request) -> dict:
+    """
+    FastAPI dependency: the verified claims for the `token` cookie.
+    The result is kept on request.state so a request verifies at most once.
+    """
+    claims = getattr(request.state, "auth", None)
+    if claims is None:
+        claims = getCurrentUserFromCookie(request.cookies.get("token"))
+        request.state.auth = claims
+    return claims
+
+def getOptionalUser(request: Request):
+    """Like getCurrentUser but returns None for anonymous or invalid sessions (page routes)"""
+    try:
+        return getCurrentUser(request)
+    except HTTPException:
+        return None
+
+# bcrypt stays verifiable when argon2 is enabled; old hashes are upgraded on login
+PASSWORD_SCHEMES = ["argon2", "bcrypt"] if settings.PASSWORD_HASH_SCHEME == "argon2" else ["bcrypt"]
+pwd_context = CryptContext(schemes=PASSWORD_SCHEMES, deprecated="auto")
+
+
+class HashingPool:
+    """
+    Bounded worker pool for password hashing so bcrypt/argon2 never run on the event loop.
+    Both libraries release the GIL, so threads give real parallelism.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_time = 0.0
+
+    async def run(self, func, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Too many login attempts, please retry shortly")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self.executor, partial(self._timed, func, *args))
+            self.busy_time += elapsed
+            return result
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    @staticmethod
+    def _timed(func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "busy_time_seconds": round(self.busy_time, 6),
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+def _encodeToken(userId, typ: str, expires_delta: timedelta) -> str:
+    # Only the essential claims: the cookie is sent with every request
+    now = datetime.utcnow()
+    claims = {"sub": str(userId), "typ": typ, "iat": now, "exp": now + expires_delta}
+    return jwt.encode(claims, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+def createAccessToken(userId, expires_delta: timedelta = None):
+    return _encodeToken(userId, "access", expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+
+def createRefreshToken(userId, expires_delta: timedelta = None):
+    return _encodeToken(userId, "refresh", expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+
+REFRESH_COOKIE_PATH = "/api/refresh"
+
+def setAuthCookies(response, userId, refresh: bool = True):
+    """Set the short-lived access cookie and (optionally) the refresh cookie, which only goes to /api/refresh"""
+    response.set_cookie(
+        key="token",
+        value=createAccessToken(userId),
+        httponly=True,
+        secure=settings.AUTH_COOKIE_SECURE,
+        samesite="Strict"
+    )
+    if refresh:
+        response.set_cookie(
+            key="refresh_token",
+            value=createRefreshToken(userId),
+            max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+            path=REFRESH_COOKIE_PATH,
+            httponly=True,
+            secure=settings.AUTH_COOKIE_SECURE,
+            samesite="Strict"
+        )
+    return response
+
+def clearAuthCookies(response):
+    response.delete_cookie(key="token")
+    response.delete_cookie(key="refresh_token", path=REFRESH_COOKIE_PATH)
+    return response
 
 def verifyPassword(plain_password:str,hashed_password:str)->bool:
     return pwd_context.verify(plain_password,hashed_password)
 
 def getPasswordHash(password:str)->str:
     return pwd_context.hash(password)
+
+async def verifyAndUpdatePassword(plain_password: str, hashed_password: str) -> tuple:
+    """Verify on the hashing pool; returns (valid, new_hash) where new_hash is set when the stored hash should be upgraded"""
+    return await hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def getPasswordHashAsync(password: str) -> str:
+    return await hashing_pool.run(pwd_context.hash, password)
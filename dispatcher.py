@@ -0,0 +1,318 @@
+import asyncio
+import time
+from collections import deque
+import os
+import uuid
+from datetime import datetime, timezone
+from twilio_service import twilio_service
+from models import repository
+from config import settings
+import metrics
+
+
+class RateLimiter:
+    """Async token bucket; a rate of 0 disables limiting"""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate = rate_per_second
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class LatenessStats:
+    """Scheduled-time vs. actual-send-time statistics for one channel"""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> dict:
+        recent = sorted(self.recent)
+
+        def percentile(p):
+            if not recent:
+                return None
+            return round(recent[min(int(len(recent) * p), len(recent) - 1)], 3)
+
+        return {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 3) if self.count else None,
+            "max_seconds": round(self.max, 3),
+            "p50_seconds": percentile(0.50),
+            "p95_seconds": percentile(0.95),
+        }
+
+
+def utcnow() -> datetime:
+    """Naive UTC, the format stored in notification_outbox.scheduledAt"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def reminder_notifications(reminders: list, scheduled_at: datetime, channels=("sms", "call")) -> list:
+    """
+    Outbox rows for the reminders due for one phone number at one minute:
+    a single SMS and a single call. The dedupe key makes re-firing a minute
+    (e.g. after a leader change) idempotent.
+    """
+    first = reminders[0]
+    scheduled_utc = scheduled_at.astimezone(timezone.utc).replace(tzinfo=None) if scheduled_at.tzinfo else scheduled_at
+    rows = []
+    for channel in channels:
+        if channel == "sms":
+            body = twilio_service.reminders_message(reminders, first["time"])
+        else:
+            body = twilio_service.twiml_say(twilio_service.reminders_speech(reminders, first["time"]))
+        rows.append({
+            "channel": channel,
+            "toPhone": str(first["user_phone"]),
+            "body": body,
+            "dedupeKey": f"reminder:{first['user_phone']}:{scheduled_utc:%Y%m%d%H%M}:{channel}",
+            "scheduledAt": scheduled_utc,
+        })
+    return rows
+
+
+def sms_notification(to_phone: str, message: str) -> dict:
+    """Outbox row for a one-off SMS such as a CRUD confirmation"""
+    return {"channel": "sms", "toPhone": str(to_phone), "body": message, "dedupeKey": None, "scheduledAt": utcnow()}
+
+
+def call_notification(to_phone: str, speech: str) -> dict:
+    """Outbox row for a one-off voice call"""
+    return {"channel": "call", "toPhone": str(to_phone), "body": twilio_service.twiml_say(speech), "dedupeKey": None, "scheduledAt": utcnow()}
+
+
+class ReminderDispatcher:
+    """
+    Queue of outgoing notifications drained by async workers on the app's event loop.
+
+    With the outbox enabled, notifications are rows in notification_outbox:
+    the scheduler and route handlers only insert them, and a poller claims
+    batches, sends them and records the Twilio SID (at-least-once delivery).
+    Otherwise scheduler threads `submit()` straight into the in-memory queue.
+    Each channel has its own rate limit; SMS and calls are sent in parallel.
+    """
+
+    CHANNELS = ("sms", "call")
+
+    def __init__(self, workers: int, sms_rate: float, call_rate: float, use_outbox: bool = True):
+        self.workers = workers
+        self.use_outbox = use_outbox
+        self.worker_id = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.limiters = {
+            "sms": RateLimiter(sms_rate, burst=max(int(sms_rate), 1)),
+            "call": RateLimiter(call_rate, burst=max(int(call_rate), 1)),
+        }
+        self.lateness = {channel: LatenessStats() for channel in self.CHANNELS}
+        self.loop = None
+        self.queue = None
+        self.wake_event = None
+        self.tasks = []
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.failed = 0
+        self.claimed = 0
+        self.lost_claims = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.wake_event = asyncio.Event()
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.use_outbox:
+            self.tasks.append(asyncio.create_task(self._poll_outbox()))
+        print(f"✅ Reminder dispatcher started with {self.workers} workers")
+
+    async def stop(self, timeout: float = 10.0):
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            # Claimed outbox rows are picked up again once their claim expires
+            print(f"⚠️ Dispatcher stopped with {self.queue.qsize()} notifications still queued")
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        await twilio_service.aclose()
+        print("⏹️ Reminder dispatcher stopped!")
+
+    def submit(self, reminders: list, scheduled_at: datetime, channels=CHANNELS) -> bool:
+        """
+        Queue the reminders due for one phone number at one minute; they are
+        sent as a single SMS and a single call. Safe to call from any thread.
+        reminders: [{"user_id", "user_phone", "medicine_name", "dosage", "time"}, ...]
+        """
+        if not self.running:
+            return False
+        notifications = reminder_notifications(reminders, scheduled_at, channels)
+        self.loop.call_soon_threadsafe(self._enqueue, notifications, len(reminders) - 1)
+        return True
+
+    def outbox_rows(self, notifications: list):
+        """The notifications to persist in the caller's transaction, or None without the outbox"""
+        return notifications if self.use_outbox else None
+
+    def dispatch(self, notifications: list):
+        """
+        Send notifications after the caller's transaction committed: wakes the
+        outbox drainer, or queues them in memory when the outbox is disabled.
+        Safe to call from any thread.
+        """
+        if not notifications or not self.running:
+            return
+        if self.use_outbox:
+            self.wake()
+        else:
+            self.loop.call_soon_threadsafe(self._enqueue, list(notifications))
+
+    def wake(self):
+        """Tell the outbox poller new rows are waiting. Safe to call from any thread."""
+        if self.running and self.use_outbox:
+            self.loop.call_soon_threadsafe(self.wake_event.set)
+
+    def _enqueue(self, notifications: list, coalesced: int = 0):
+        self.submitted += len(notifications)
+        self.coalesced += coalesced
+        for notification in notifications:
+            self.queue.put_nowait(notification)
+
+    def _claim_budget(self) -> int:
+        """
+        Rows to claim now: no more than the slowest rate limit can send, behind
+        what is already queued, within half the claim window. A claim that
+        outlives the queue would expire and the rows be handed out again.
+        """
+        budget = settings.OUTBOX_BATCH_SIZE
+        rates = [limiter.rate for limiter in self.limiters.values() if limiter.rate > 0]
+        if rates:
+            budget = min(budget, int(min(rates) * settings.OUTBOX_CLAIM_SECONDS / 2))
+        return budget - self.queue.qsize()
+
+    async def _poll_outbox(self):
+        while True:
+            try:
+                # Backpressure: only claim more once the workers have caught up
+                budget = self._claim_budget()
+                if budget > 0:
+                    rows = await repository.claimNotifications(
+                        f"{self.worker_id}:{uuid.uuid4().hex[:8]}",
+                        budget,
+                        settings.OUTBOX_CLAIM_SECONDS
+                    )
+                    if rows:
+                        self.claimed += len(rows)
+                        self._enqueue(rows)
+                    if len(rows) == budget:
+                        continue
+            except Exception as e:
+                print(f"⚠️ Outbox poll failed: {e}")
+
+            try:
+                await asyncio.wait_for(self.wake_event.wait(), settings.OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.wake_event.clear()
+
+    async def _worker(self):
+        while True:
+            notification = await self.queue.get()
+            try:
+                await self._deliver(notification)
+            except Exception as e:
+                print(f"❌ Error dispatching notification: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, notification: dict):
+        channel = notification["channel"]
+        await self.limiters[channel].acquire()
+        claim = notification.get("claimedBy")
+        if claim and not await repository.renewNotificationClaim(notification["id"], claim, settings.OUTBOX_CLAIM_SECONDS):
+            # Waited past the claim and another drainer owns the row now
+            self.lost_claims += 1
+            return {"success": False, "error": "claim expired"}
+        if notification.get("scheduledAt"):
+            lateness = max((utcnow() - notification["scheduledAt"]).total_seconds(), 0.0)
+            self.lateness[channel].record(lateness)
+            metrics.notification_lateness.observe(lateness, channel=channel)
+
+        if channel == "sms":
+            result = await twilio_service.send_sms_async(notification["toPhone"], notification["body"])
+        else:
+            result = await twilio_service.make_call_async(notification["toPhone"], notification["body"])
+
+        if result.get("success"):
+            self.delivered += 1
+            metrics.notifications_sent.inc(channel=channel, outcome="delivered")
+        else:
+            self.failed += 1
+            metrics.notifications_sent.inc(channel=channel, outcome="failed")
+            print(f"❌ {channel.upper()} to {notification['toPhone']} failed: {result.get('error')}")
+
+        if notification.get("id") is not None:
+            await repository.completeNotification(
+                notification["id"],
+                result.get("success", False),
+                sid=result.get("sid"),
+                error=result.get("error"),
+                maxAttempts=settings.OUTBOX_MAX_ATTEMPTS,
+                claimToken=claim
+            )
+        return result
+
+    def metrics(self) -> dict:
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "outbox": self.use_outbox,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "submitted": self.submitted,
+            "claimed": self.claimed,
+            "lost_claims": self.lost_claims,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "lateness": {channel: stats.summary() for channel, stats in self.lateness.items()},
+            "twilio": twilio_service.transport.status() if twilio_service.transport else None,
+        }
+
+
+dispatcher = ReminderDispatcher(
+    workers=settings.DISPATCH_WORKERS,
+    sms_rate=settings.SMS_RATE_PER_SECOND,
+    call_rate=settings.CALL_RATE_PER_SECOND,
+    use_outbox=settings.NOTIFICATION_OUTBOX
+)
@@ -0,0 +1,70 @@
+"""
+Local stand-in for the Twilio REST API (Messages and Calls only).
+
+    python fake_twilio.py --port 4010 --latency 0.2 --error-rate 0.1
+
+Then start the app with TWILIO_API_BASE=http://127.0.0.1:4010 to exercise the
+dispatcher, retries and circuit breaker without sending real SMS or calls.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from aiohttp import web
+
+
+def create_app(latency: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0) -> web.Application:
+    stats = {"messages": 0, "calls": 0, "errors": 0, "throttled": 0}
+
+    async def create_resource(request: web.Request, kind: str, prefix: str):
+        if latency:
+            await asyncio.sleep(latency)
+        roll = random.random()
+        if roll < throttle_rate:
+            stats["throttled"] += 1
+            return web.json_response(
+                {"code": 20429, "message": "Too Many Requests", "status": 429},
+                status=429, headers={"Retry-After": "1"}
+            )
+        if roll < throttle_rate + error_rate:
+            stats["errors"] += 1
+            return web.json_response({"code": 20500, "message": "Internal Server Error", "status": 500}, status=500)
+
+        form = await request.post()
+        if not form.get("To") or not form.get("From"):
+            return web.json_response({"code": 21604, "message": "A 'To' and 'From' are required", "status": 400}, status=400)
+
+        stats[kind] += 1
+        return web.json_response({
+            "sid": prefix + uuid.uuid4().hex,
+            "account_sid": request.match_info["account_sid"],
+            "to": form["To"],
+            "from": form["From"],
+            "status": "queued",
+        }, status=201)
+
+    async def messages(request):
+        return await create_resource(request, "messages", "SM")
+
+    async def calls(request):
+        return await create_resource(request, "calls", "CA")
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_post("/2010-04-01/Accounts/{account_sid}/Messages.json", messages)
+    app.router.add_post("/2010-04-01/Accounts/{account_sid}/Calls.json", calls)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Twilio REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    args = parser.parse_args()
+    web.run_app(create_app(args.latency, args.error_rate, args.throttle_rate), host=args.host, port=args.port)
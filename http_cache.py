@@ -0,0 +1,137 @@
+"""
+Conditional GET and compression for the JSON API.
+
+Successful GET responses under /api are buffered, tagged with a strong
+ETag of their body and revalidated on every use (`Cache-Control: private,
+no-cache`). A matching If-None-Match is answered with 304 and no body; other
+responses above a size threshold are compressed with brotli or gzip.
+"""
+import gzip
+import hashlib
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _accepted_encodings(headers: Headers) -> dict:
+    """Accept-Encoding as {coding: q}"""
+    accepted = {}
+    for part in headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _etag_matches(if_none_match: str, digest: str) -> bool:
+    """True if any tag is for this body, whichever content-coding it was sent with"""
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored for If-None-Match
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+class ConditionalJSONMiddleware:
+    """
+    Pure ASGI middleware (so responses are not re-wrapped per request).
+    Only uncompressed 200 application/json responses are handled;
+    anything else is passed through untouched.
+    """
+
+    def __init__(self, app, prefix: str = "/api", minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.prefix = prefix
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        start = None
+        chunks = []
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or not headers.get("content-type", "").startswith("application/json")
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            if message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await self._respond(start, b"".join(chunks), request_headers, send)
+                return
+            await send(message)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _respond(self, start, body: bytes, request_headers: Headers, send):
+        headers = MutableHeaders(raw=list(start["headers"]))
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        headers["etag"] = f'"{digest}"'
+        if "cache-control" not in headers:
+            # Per-user data: never stored by shared caches, always revalidated
+            headers["cache-control"] = "private, no-cache"
+        headers.add_vary_header("Accept-Encoding")
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, digest):
+            del headers["content-type"]
+            del headers["content-length"]
+            await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if len(body) >= self.minimum_size:
+            body = self._compress(body, _accepted_encodings(request_headers), headers)
+            if "content-encoding" in headers:
+                # Each coding is a different representation, so it gets its own strong tag
+                headers["etag"] = f'"{digest}-{headers["content-encoding"]}"'
+        headers["content-length"] = str(len(body))
+        await send({"type": "http.response.start", "status": 200, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+    def _compress(self, body: bytes, accepted: dict, headers: MutableHeaders) -> bytes:
+        if brotli and accepted.get("br", 0) > 0:
+            headers["content-encoding"] = "br"
+            return brotli.compress(body, quality=self.brotli_quality)
+        if accepted.get("gzip", 0) > 0:
+            headers["content-encoding"] = "gzip"
+            return gzip.compress(body, compresslevel=self.gzip_level)
+        return body
@@ -0,0 +1,74 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from models import database as db
+
+
+class LeaseElector:
+    """
+    Leader election over a shared DB lease row.
+
+    Every worker periodically calls `renew()`; the row's holder is the only
+    worker allowed to fire reminders until its lease expires. Leadership is
+    dropped locally a safety margin before the lease can be taken over.
+    """
+
+    def __init__(self, name: str, ttl: float, enabled: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.enabled = enabled
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lock = threading.Lock()
+        self.valid_until = 0.0
+        self.elections_won = 0
+
+    @property
+    def is_leader(self) -> bool:
+        if not self.enabled:
+            return True
+        with self.lock:
+            return time.monotonic() < self.valid_until
+
+    def renew(self) -> bool:
+        """Try to acquire or extend the lease; returns whether this worker leads"""
+        if not self.enabled:
+            return True
+        started = time.monotonic()
+        try:
+            acquired = db.acquireLease(self.name, self.worker_id, int(self.ttl))
+        except Exception as e:
+            print(f"⚠️ Lease renewal failed: {e}")
+            acquired = False
+
+        with self.lock:
+            was_leader = started < self.valid_until
+            # Measure from before the round trip and keep a margin for clock drift
+            self.valid_until = started + self.ttl * 0.8 if acquired else 0.0
+        if acquired and not was_leader:
+            self.elections_won += 1
+            print(f"👑 Worker {self.worker_id} is now the reminder scheduler leader")
+        elif was_leader and not acquired:
+            print(f"⚠️ Worker {self.worker_id} lost scheduler leadership")
+        return acquired
+
+    def release(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            held = time.monotonic() < self.valid_until
+            self.valid_until = 0.0
+        if held:
+            try:
+                db.releaseLease(self.name, self.worker_id)
+            except Exception as e:
+                print(f"⚠️ Lease release failed: {e}")
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "worker_id": self.worker_id,
+            "is_leader": self.is_leader,
+            "elections_won": self.elections_won,
+        }
@@ -1,30 +1,77 @@
 from fastapi import FastAPI,Request
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
 from routers import render, auth, reminders
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from scheduler import start_scheduler, shutdown_scheduler, load_existing_reminders
-from fastapi.responses import JSONResponse
+from scheduler import start_scheduler, shutdown_scheduler, load_existing_reminders, engine, hydration, elector
+from config import settings
+from fastapi.responses import JSONResponse, PlainTextResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from models import database as db, repository
+from controller import auth as auth_controller
+from dispatcher import dispatcher
+from models.migrate import migrate, require_current_schema, SchemaBehindError
+import metrics
+import assets
+import http_cache
+from http_cache import ConditionalJSONMiddleware
+import time
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting MedRed application...")
+    try:
+        db.pool.warm()
+    except Exception as e:
+        print(f"⚠️ Could not warm DB connection pool: {e}")
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        await asyncio.to_thread(migrate)
+    try:
+        # Queries select columns from every migration (e.g. timezone, confirmationSms)
+        await asyncio.to_thread(require_current_schema)
+    except SchemaBehindError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Could not check the schema version: {e}")
+    if settings.BUILD_ASSETS_ON_STARTUP:
+        await asyncio.to_thread(assets.build, keep=settings.ASSET_KEEP_BUILDS)
+    else:
+        assets.load_manifest()
+    await dispatcher.start()
     start_scheduler()
     
     # Load existing reminders
-    reminder_count = load_existing_reminders()
-    print(f"✅ Application started with {reminder_count} reminders scheduled")
+    hydration_task = None
+    if settings.HYDRATE_IN_BACKGROUND:
+        hydration_task = asyncio.create_task(asyncio.to_thread(load_existing_reminders))
+        print("✅ Application started, loading reminders in the background")
+    else:
+        reminder_count = await asyncio.to_thread(load_existing_reminders)
+        print(f"✅ Application started with {reminder_count} reminders scheduled")
     
     yield
     
+    if hydration_task and not hydration_task.done():
+        await hydration_task
+    
     # Shutdown
     shutdown_scheduler()
+    await dispatcher.stop()
+    repository.shutdown()
+    auth_controller.hashing_pool.shutdown()
+    db.pool.close()
     print("👋 Application shutdown complete")
 
-app = FastAPI(lifespan=lifespan)
+try:
+    import orjson  # noqa: F401  (ORJSONResponse needs it at render time)
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+# Routes with a response_model are serialized by pydantic-core and rendered by orjson
+app = FastAPI(lifespan=lifespan, default_response_class=DefaultResponse)
 
 # CORS Configuration
 origins = [
@@ -43,7 +90,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# ETag/304 and gzip/brotli for /api JSON
+app.add_middleware(ConditionalJSONMiddleware, minimum_size=settings.API_COMPRESSION_MIN_SIZE)
+if http_cache.brotli is None:
+    print("⚠️ brotli not installed (see requirements.txt): /api responses fall back to gzip")
+
+@app.middleware("http")
+async def request_timing(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so /delete/{reminderId} is one series
+        route = request.scope.get("route")
+        metrics.http_request_duration.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status_code
+        )
+
+app.mount("/static", assets.PrecompressedStaticFiles(directory="static"), name="static")
 
 # Include routers
 app.include_router(render.router)  
@@ -53,13 +123,54 @@ app.include_router(prefix="/api/reminders", router=reminders.router)
 # Health check endpoint
 @app.api_route("/health",methods=["GET","HEAD"])
 async def health_check():
+    ready = hydration["state"] == "ready"
     return {
-        "status": "ok",
-        "message": "MedRed API is running"
+        "status": "ok" if ready else "starting",
+        "message": "MedRed API is running",
+        "ready": ready,
+        "hydration": hydration,
+        "db_pool": db.pool.metrics(),
+        "cache": db.cache.metrics(),
+        "password_hashing": auth_controller.hashing_pool.metrics(),
+        "token_cache": auth_controller.token_cache.metrics(),
+        "dispatcher": dispatcher.metrics(),
+        "reminders": engine.stats(),
+        "scheduler_leader": elector.status()
     }
 
 
+# Gauges read from the components' own counters at scrape time
+metrics.registry.gauge("medred_ready", "1 once reminders are hydrated", lambda: int(hydration["state"] == "ready"))
+metrics.registry.gauge("medred_scheduler_leader", "1 if this worker fires reminders", lambda: int(elector.is_leader))
+metrics.registry.gauge("medred_scheduled_jobs", "Reminder jobs in the in-memory engine", lambda: len(engine))
+metrics.registry.gauge("medred_dispatcher_queue_depth", "Notifications waiting for a dispatcher worker",
+                       lambda: dispatcher.metrics()["queue_depth"])
+metrics.registry.gauge("medred_db_pool_connections", "Pooled database connections by state",
+                       lambda: {("in_use",): db.pool.metrics()["in_use"], ("idle",): db.pool.metrics()["idle"]}, ("state",))
+metrics.registry.gauge("medred_db_pool_waits_total", "Checkouts that had to wait for a connection",
+                       lambda: db.pool.metrics()["waits"], kind="counter")
+metrics.registry.gauge("medred_db_pool_timeouts_total", "Checkouts that timed out",
+                       lambda: db.pool.metrics()["timeouts"], kind="counter")
+metrics.registry.gauge("medred_cache_entries", "Entries in the read-through cache", lambda: db.cache.metrics()["entries"])
+metrics.registry.gauge("medred_cache_requests_total", "Read-through cache lookups by result",
+                       lambda: {("hit",): db.cache.hits, ("miss",): db.cache.misses}, ("result",), kind="counter")
+metrics.registry.gauge("medred_cache_evictions_total", "LRU evictions from the read-through cache",
+                       lambda: db.cache.local.evictions, kind="counter")
+metrics.registry.gauge("medred_token_cache_requests_total", "Verified-JWT cache lookups by result",
+                       lambda: {("hit",): auth_controller.token_cache.hits, ("miss",): auth_controller.token_cache.misses},
+                       ("result",), kind="counter")
+metrics.registry.gauge("medred_password_hash_queue_depth", "Password hashes waiting for a worker",
+                       lambda: auth_controller.hashing_pool.metrics()["queue_depth"])
+metrics.registry.gauge("medred_twilio_circuit_open", "1 while the Twilio circuit breaker sheds calls",
+                       lambda: int(dispatcher.metrics()["twilio"]["circuit_breaker"]["state"] == "open"))
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = assets.asset_url
 
 def wants_html(request: Request):
     return "text/html" in request.headers.get("accept", "")
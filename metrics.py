@@ -0,0 +1,192 @@
+"""
+Minimal Prometheus-style metrics (text exposition format 0.0.4), served on /metrics.
+
+Counters and histograms are updated on the hot path; gauges are collected
+at scrape time from the components' existing metrics() snapshots.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond cache hits up to slow Twilio calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # label values -> count
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.series = {}  # label values -> [bucket counts, sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, (counts, total, count) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """
+    Read at scrape time: `collect` returns a number, or a dict mapping label
+    value tuples to numbers. Use kind="counter" for monotonic totals that are
+    already counted elsewhere (e.g. cache hits).
+    """
+
+    def __init__(self, name: str, help: str, collect, labelnames=(), kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def render(self) -> list:
+        try:
+            values = self.collect()
+        except Exception:
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in sorted(values.items()):
+            if value is None:
+                continue
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, collect, labelnames=(), kind: str = "gauge") -> Gauge:
+        return self.register(Gauge(name, help, collect, labelnames, kind))
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ==================== HOT-PATH METRICS ====================
+
+http_request_duration = registry.histogram(
+    "medred_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+db_query_duration = registry.histogram(
+    "medred_db_query_duration_seconds", "Latency of models/database.py functions that hit the database",
+    ("function",)
+)
+db_query_errors = registry.counter(
+    "medred_db_query_errors_total", "models/database.py calls that raised or returned an error",
+    ("function",)
+)
+scheduler_tick_duration = registry.histogram(
+    "medred_scheduler_tick_duration_seconds", "Time to collect and hand off the reminders due in one tick"
+)
+reminders_fired = registry.counter(
+    "medred_reminders_fired_total", "Reminders handed to the dispatcher", ("path",)
+)
+notification_lateness = registry.histogram(
+    "medred_notification_lateness_seconds", "Delay between a reminder's scheduled minute and its send",
+    ("channel",), buckets=(0.5, 1, 2, 5, 10, 15, 30, 60, 120, 300, 600)
+)
+notifications_sent = registry.counter(
+    "medred_notifications_total", "Notifications attempted by the dispatcher", ("channel", "outcome")
+)
+twilio_request_duration = registry.histogram(
+    "medred_twilio_request_duration_seconds", "Twilio REST API request latency per attempt",
+    ("resource", "status")
+)
+twilio_errors = registry.counter(
+    "medred_twilio_errors_total", "Twilio failures by resource and error code (HTTP status, Twilio code or exception)",
+    ("resource", "code")
+)
+
+
+def render() -> str:
+    return registry.render()
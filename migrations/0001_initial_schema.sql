@@ -0,0 +1,34 @@
+-- Baseline schema (previously only documented in models/database.py).
+-- IF NOT EXISTS so existing deployments can adopt the migration history.
+
+CREATE TABLE IF NOT EXISTS USERS (
+  userId VARCHAR(50) PRIMARY KEY,
+  fname VARCHAR(50) NOT NULL,
+  lname VARCHAR(50) NOT NULL,
+  mobileNumber DECIMAL(10) UNIQUE,
+  email VARCHAR(50) UNIQUE NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  gender ENUM("male","female"),
+  birthDate DATE,
+  bloodGroup ENUM("A+","A-","B+","B-","AB+","AB-","O+","O-"),
+  emergencyContactNumber DECIMAL(10),
+  allergies VARCHAR(200),
+  medicalConditions VARCHAR(200)
+);
+
+CREATE TABLE IF NOT EXISTS ADDRESS (
+  userId VARCHAR(50) PRIMARY KEY,
+  streetAddress VARCHAR(100),
+  city VARCHAR(100),
+  state VARCHAR(100),
+  pinCode INT,
+  country VARCHAR(100)
+);
+
+CREATE TABLE IF NOT EXISTS remainders (
+  reminderId VARCHAR(50) PRIMARY KEY,
+  userId VARCHAR(50),
+  medicineName VARCHAR(100),
+  dosage VARCHAR(100),
+  time VARCHAR(100)
+);
@@ -0,0 +1,25 @@
+CREATE TABLE IF NOT EXISTS notification_outbox (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  channel ENUM("sms","call") NOT NULL,
+  toPhone VARCHAR(20) NOT NULL,
+  body TEXT NOT NULL,
+  dedupeKey VARCHAR(150) UNIQUE,
+  status ENUM("pending","sending","sent","failed") NOT NULL DEFAULT "pending",
+  attempts INT NOT NULL DEFAULT 0,
+  availableAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  scheduledAt DATETIME,
+  claimedBy VARCHAR(100),
+  claimedUntil DATETIME,
+  sid VARCHAR(64),
+  lastError VARCHAR(500),
+  createdAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  sentAt DATETIME,
+  INDEX idx_outbox_due (status, availableAt),
+  INDEX idx_outbox_claim (claimedBy)
+);
+
+CREATE TABLE IF NOT EXISTS scheduler_lease (
+  name VARCHAR(50) PRIMARY KEY,
+  holder VARCHAR(100) NOT NULL,
+  expiresAt DATETIME NOT NULL
+);
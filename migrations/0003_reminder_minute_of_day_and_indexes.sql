@@ -0,0 +1,15 @@
+-- Reminder times become a minute-of-day integer (08:30 -> 510) so due-reminder
+-- lookups are an indexed integer equality instead of a VARCHAR scan.
+-- `time` is kept for display and for older readers.
+
+ALTER TABLE remainders ADD COLUMN minuteOfDay SMALLINT NULL;
+
+UPDATE remainders
+SET minuteOfDay = HOUR(STR_TO_DATE(time, '%H:%i')) * 60 + MINUTE(STR_TO_DATE(time, '%H:%i'))
+WHERE minuteOfDay IS NULL AND time REGEXP '^[0-9]{1,2}:[0-9]{2}$';
+
+-- getReminders / getDueReminders (scheduler tick)
+CREATE INDEX idx_remainders_minute ON remainders (minuteOfDay);
+
+-- getUserReminders, dashboard join and the remainders JOIN USERS startup load
+CREATE INDEX idx_remainders_user_minute ON remainders (userId, minuteOfDay);
@@ -0,0 +1,6 @@
+-- Per-channel opt-out for the confirmation SMS / call sent when reminders are
+-- created, updated or deleted. Existing users keep receiving both.
+
+ALTER TABLE USERS ADD COLUMN confirmationSms BOOLEAN NOT NULL DEFAULT TRUE;
+
+ALTER TABLE USERS ADD COLUMN confirmationCall BOOLEAN NOT NULL DEFAULT TRUE;
@@ -0,0 +1,9 @@
+-- Per-user timezone (IANA name) for reminder times and country calling code for
+-- national phone numbers. Existing users keep the previous implicit IST / +91.
+
+ALTER TABLE USERS ADD COLUMN timezone VARCHAR(64) NOT NULL DEFAULT 'Asia/Kolkata';
+
+ALTER TABLE USERS ADD COLUMN countryCode VARCHAR(6) NOT NULL DEFAULT '+91';
+
+-- getReminderTimezones (database job store)
+CREATE INDEX idx_users_timezone ON USERS (timezone);
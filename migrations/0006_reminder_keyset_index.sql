@@ -0,0 +1,9 @@
+-- Paginated reminder listings seek on (userId, minuteOfDay, reminderId) and
+-- read rows in that order. Spelling out reminderId makes the index cover the
+-- keyset tie-breaker on both MySQL and TiDB (whose secondary indexes don't
+-- carry a non-clustered primary key). The new index's prefix serves every
+-- query the old one did.
+
+CREATE INDEX idx_remainders_user_minute_id ON remainders (userId, minuteOfDay, reminderId);
+
+DROP INDEX idx_remainders_user_minute ON remainders;
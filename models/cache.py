@@ -0,0 +1,177 @@
+import copy
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns (hit, value)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return False, None
+            self.entries.move_to_end(key)
+        # Callers get their own copy so mutating a result can't corrupt the cache
+        return True, copy.deepcopy(value)
+
+    def set(self, key, value, ttl: float):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SharedCacheStandIn:
+    """
+    Local stand-in for a shared cache server (e.g. Redis) with the same
+    get/set/delete contract: values are serialized on the way in and out, so
+    code written against it behaves the same against a networked backend.
+    """
+
+    def __init__(self):
+        self.store = {}  # key -> (expires_at, bytes)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.store.get(key)
+            if entry is None:
+                return False, None
+            expires_at, payload = entry
+            if expires_at < time.time():
+                del self.store[key]
+                return False, None
+        return True, pickle.loads(payload)
+
+    def set(self, key, value, ttl: float):
+        payload = pickle.dumps(value)
+        with self.lock:
+            self.store[key] = (time.time() + ttl, payload)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.store.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.store.clear()
+
+
+class ReadThroughCache:
+    """
+    Read-through cache used by models/database.py.
+    Reads check the local LRU first, then the optional shared backend, then
+    call the loader; writes invalidate keys in both tiers.
+
+    A load that an invalidate() overtakes is returned but not stored: each
+    key with a load in flight has a version that invalidate()/clear() bump,
+    so a value read before a write can't be cached after it.
+    """
+
+    def __init__(self, local: LocalCache, shared=None, ttl: float = 60.0, enabled: bool = True):
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.skipped_stores = 0
+        self.lock = threading.Lock()
+        self.pending = {}  # key -> [version, loads in flight]
+
+    def get_or_load(self, key: str, loader, cacheable=lambda value: value is not None):
+        if not self.enabled:
+            return loader()
+
+        hit, value = self.local.get(key)
+        if not hit and self.shared is not None:
+            hit, value = self.shared.get(key)
+            if hit:
+                self.local.set(key, value, self.ttl)
+        if hit:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        with self.lock:
+            entry = self.pending.setdefault(key, [0, 0])
+            entry[1] += 1
+            version = entry[0]
+        try:
+            value = loader()
+            # Under the lock, so an invalidate() can't slip between the check and the store
+            with self.lock:
+                if cacheable(value) and entry[0] == version:
+                    self.local.set(key, value, self.ttl)
+                    if self.shared is not None:
+                        self.shared.set(key, value, self.ttl)
+                elif cacheable(value):
+                    self.skipped_stores += 1
+        finally:
+            with self.lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self.pending[key]
+        return value
+
+    def invalidate(self, *keys):
+        with self.lock:
+            self.invalidations += len(keys)
+            for key in keys:
+                if key in self.pending:
+                    self.pending[key][0] += 1
+            self.local.delete(*keys)
+            if self.shared is not None:
+                self.shared.delete(*keys)
+
+    def clear(self):
+        with self.lock:
+            for entry in self.pending.values():
+                entry[0] += 1
+            self.local.clear()
+            if self.shared is not None:
+                self.shared.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": "local+shared" if self.shared is not None else "local",
+            "entries": len(self.local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.local.evictions,
+            "invalidations": self.invalidations,
+            "skipped_stores": self.skipped_stores,
+        }
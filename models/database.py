@@ -1,67 +1,179 @@
 from mysql import connector
 from controller import auth
 from config import settings
+from contextlib import contextmanager
+from models.pool import ConnectionPool
+from models.cache import LocalCache, SharedCacheStandIn, ReadThroughCache
+from reminder_engine import minute_of_day
+from functools import wraps
+import metrics
+from time import perf_counter
 import uuid
 
 def createConnection():
-    connection = None
     try:
         connection = connector.connect(
             host=settings.HOST_NAME,
             user=settings.USER_NAME,
             password=settings.USER_PASSWORD,
             database=settings.DB_NAME,
-            port = 4000,
+            port=settings.DB_PORT,
             ssl_disabled=False
         )
         print("Connection to MySQL DB successful")
+        return connection
     except connector.Error as e:
         print(f"The error '{e}' occurred")
-    return connection
+        raise
 
 
+pool = ConnectionPool(
+    createConnection,
+    min_size=settings.DB_POOL_MIN_SIZE,
+    max_size=settings.DB_POOL_MAX_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+    health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL
+)
+
+# Read-through cache for profile/reminder reads; the write functions below invalidate it
+cache = ReadThroughCache(
+    LocalCache(settings.CACHE_MAX_ENTRIES),
+    shared=SharedCacheStandIn() if settings.CACHE_BACKEND == "shared" else None,
+    ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED
+)
+
+def timedQuery(name=None):
+    """Record a database function's latency, and calls that raised or returned an error dict, in /metrics"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                metrics.db_query_errors.inc(function=label)
+                raise
+            finally:
+                metrics.db_query_duration.observe(perf_counter() - start, function=label)
+            if isinstance(result, dict) and ("error" in result or "error from database" in result):
+                metrics.db_query_errors.inc(function=label)
+            return result
+        return wrapper
+    return decorator
+
+def _invalidateUser(userId, profile=False):
+    keys = [f"dashboard:{userId}", f"reminders:{userId}"]
+    if profile:
+        keys.append(f"user:{userId}")
+    cache.invalidate(*keys)
+
+def _reminderOwner(cus, reminderId):
+    cus.execute("SELECT userId FROM remainders WHERE reminderId = %s", (reminderId,))
+    row = cus.fetchone()
+    return row["userId"] if row else None
+
+@contextmanager
+def getCursor():
+    """Check out a pooled connection and a buffered dict cursor; both are always returned"""
+    with pool.connection() as conn:
+        cus = conn.cursor(dictionary=True, buffered=True)
+        try:
+            yield conn, cus
+        finally:
+            cus.close()
+
+
+@timedQuery()
 def getUser(email):
-    conn = createConnection()
-    cus = conn.cursor(dictionary=True)
-    query = "SELECT email,password,userId,fname,lname,password FROM USERS WHERE email = %s"
-    cus.execute(query, (email,))
-    return cus.fetchone()
+    with getCursor() as (conn, cus):
+        query = "SELECT email,password,userId,fname,lname,password FROM USERS WHERE email = %s"
+        cus.execute(query, (email,))
+        return cus.fetchone()
 
-def getUserForDashboard(userId):
+@timedQuery()
+def updatePassword(userId, password):
+    """Store a new password hash (used when upgrading the hashing scheme)"""
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True, buffered=True)
+        with getCursor() as (conn, cus):
+            cus.execute("UPDATE USERS SET password = %s WHERE userId = %s", (password, userId))
+            conn.commit()
+            return {"msg": "Password updated successfully", "success": True}
+    except Exception as e:
+        print(f"Error updating password: {e}")
+        return {"error": str(e), "msg": "Failed to update password", "success": False}
 
-        cus.execute("SELECT * FROM USERS WHERE userId = %s", (userId,))
-        user = cus.fetchone()
-        if user:
-            user.pop("password", None)
+DASHBOARD_USER_COLUMNS = (
+    "userId", "fname", "lname", "email", "mobileNumber", "gender", "birthDate",
+    "bloodGroup", "emergencyContactNumber", "allergies", "medicalConditions"
+)
+DASHBOARD_ADDRESS_COLUMNS = ("streetAddress", "city", "state", "pinCode", "country")
+DASHBOARD_REMINDER_COLUMNS = ("reminderId", "medicineName", "dosage", "time")
 
-        cus.execute("SELECT * FROM ADDRESS WHERE userId = %s", (userId,))
-        address = cus.fetchone()
+def getUserForDashboard(userId):
+    return cache.get_or_load(
+        f"dashboard:{userId}",
+        lambda: _loadUserForDashboard(userId),
+        cacheable=lambda result: "error from database" not in result
+    )
 
-        cus.execute("SELECT * FROM remainders WHERE userId = %s", (userId,))
-        reminders = cus.fetchall()
+@timedQuery("getUserForDashboard")
+def _loadUserForDashboard(userId):
+    """
+    Profile, address and reminders in one round trip. Only the columns the
+    dashboard renders are selected (never the password hash); the user and
+    address columns repeat on each reminder row and are folded here.
+    """
+    try:
+        with getCursor() as (conn, cus):
+            query = """
+            SELECT u.userId, u.fname, u.lname, u.email, u.mobileNumber, u.gender, u.birthDate,
+                   u.bloodGroup, u.emergencyContactNumber, u.allergies, u.medicalConditions,
+                   a.userId AS addressUserId, a.streetAddress, a.city, a.state, a.pinCode, a.country,
+                   r.reminderId, r.medicineName, r.dosage, r.time
+            FROM USERS u
+            LEFT JOIN ADDRESS a ON a.userId = u.userId
+            LEFT JOIN remainders r ON r.userId = u.userId
+            WHERE u.userId = %s
+            ORDER BY r.minuteOfDay, r.reminderId
+            """
+            cus.execute(query, (userId,))
+            rows = cus.fetchall()
+
+        if not rows:
+            return {"user": None, "address": None, "reminders": []}
 
+        first = rows[0]
+        user = {key: first[key] for key in DASHBOARD_USER_COLUMNS}
+        address = None
+        if first["addressUserId"] is not None:
+            address = {key: first[key] for key in DASHBOARD_ADDRESS_COLUMNS}
+        reminders = [
+            {key: row[key] for key in DASHBOARD_REMINDER_COLUMNS}
+            for row in rows if row["reminderId"] is not None
+        ]
         return {"user": user, "address": address, "reminders": reminders}
 
     except Exception as e:
         return {"error from database": str(e)}
 
+@timedQuery()
 def createUser(fname, lname, email, password):
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        userId = str(uuid.uuid4())
-        query = "INSERT INTO USERS(userId, fname, lname, email, password) VALUES (%s, %s, %s, %s, %s)"
-        cus.execute(query, (userId, fname, lname, email, password))
-        conn.commit()
-        
-        # Return userId along with success message
-        return {"msg": "User created successfully", "userId": userId}
+        with getCursor() as (conn, cus):
+            userId = str(uuid.uuid4())
+            query = "INSERT INTO USERS(userId, fname, lname, email, password) VALUES (%s, %s, %s, %s, %s)"
+            cus.execute(query, (userId, fname, lname, email, password))
+            conn.commit()
+
+            # Return userId along with success message
+            return {"msg": "User created successfully", "userId": userId}
     except Exception as e:
         return {"error from database": str(e), "msg": "Failed to create user"}
 
+@timedQuery()
 def updateUser(
             userId,
             mobileNumber,
@@ -75,167 +187,524 @@ def updateUser(
             country,
             bloodGroup,
             medicalConditions=None,
-            allergies=None):
+            allergies=None,
+            timezone=None,
+            countryCode=None):
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = """
-        UPDATE USERS 
-        SET  medicalConditions = %s, bloodGroup = %s, allergies = %s, mobileNumber=%s,emergencyContactNumber=%s,birthDate=%s, gender = %s
-        WHERE userId = %s
-        """
-        cus.execute(query, (medicalConditions, bloodGroup, allergies, mobileNumber, emergencyContactNumber, birthDate, gender, userId))
-       
-        print("User table updated")
-        query2 = """
-        insert into ADDRESS (streetAddress, city, state, pinCode, country, userId)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        streetAddress = %s, city = %s, state = %s, pinCode = %s, country = %s
-        """
-        cus.execute(query2, (streetAddress, city, state, pinCode, country, userId, streetAddress, city, state, pinCode, country))
-        conn.commit()
-        print("Address table updated")
-        return {"msg": "User updated successfully"}
-    except Exception as e:
-        return {"error": str(e), "msg": "Failed to update user"}
+        with getCursor() as (conn, cus):
+            # timezone / countryCode are only changed when given
+            query = """
+            UPDATE USERS 
+            SET  medicalConditions = %s, bloodGroup = %s, allergies = %s, mobileNumber=%s,emergencyContactNumber=%s,birthDate=%s, gender = %s,
+                 timezone = COALESCE(%s, timezone), countryCode = COALESCE(%s, countryCode)
+            WHERE userId = %s
+            """
+            cus.execute(query, (medicalConditions, bloodGroup, allergies, mobileNumber, emergencyContactNumber, birthDate, gender, timezone, countryCode, userId))
 
-def createReminder(userId,medicineName,dosage,time) -> dict:
-    try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        reminderId = str(uuid.uuid4())
-        query = "INSERT INTO remainders (reminderId, userId, medicineName, dosage, time) VALUES (%s, %s, %s, %s, %s)"
-        cus.execute(query, (reminderId, userId, medicineName, dosage, time))
-        conn.commit()
-        return {"success": True , "msg": "Reminder created successfully"}
+            print("User table updated")
+            query2 = """
+            insert into ADDRESS (streetAddress, city, state, pinCode, country, userId)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+            streetAddress = %s, city = %s, state = %s, pinCode = %s, country = %s
+            """
+            cus.execute(query2, (streetAddress, city, state, pinCode, country, userId, streetAddress, city, state, pinCode, country))
+            conn.commit()
+            _invalidateUser(userId, profile=True)
+            print("Address table updated")
+            return {"msg": "User updated successfully"}
     except Exception as e:
-        return {"error": str(e), "msg": "Failed to create reminder"}
+        return {"error": str(e), "msg": "Failed to update user"}
 
+@timedQuery()
 def getReminders(time):
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "SELECT * FROM remainders WHERE time = %s"
-        cus.execute(query, (time,))
-        return cus.fetchall()
+        with getCursor() as (conn, cus):
+            query = "SELECT * FROM remainders WHERE minuteOfDay = %s"
+            cus.execute(query, (minute_of_day(time),))
+            return cus.fetchall()
     except Exception as e:
         return {"error": str(e), "msg": "Failed to get reminders"}
 
 def getUserReminders(userId):
+    return cache.get_or_load(
+        f"reminders:{userId}",
+        lambda: _loadUserReminders(userId),
+        cacheable=lambda result: isinstance(result, list)
+    )
+
+@timedQuery("getUserReminders")
+def _loadUserReminders(userId):
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "SELECT * FROM remainders WHERE userId = %s"
-        cus.execute(query, (userId,))
-        return cus.fetchall()
+        with getCursor() as (conn, cus):
+            query = "SELECT * FROM remainders WHERE userId = %s"
+            cus.execute(query, (userId,))
+            return cus.fetchall()
     except Exception as e:
         return {"error": str(e), "msg": "Failed to get user reminders"}
 
-def deleteReminder(reminderId):
+@timedQuery()
+def getUserRemindersPage(userId, limit, after=None, fromMinute=None, toMinute=None, medicine=None):
+    """
+    One keyset page of a user's reminders ordered by (minuteOfDay, reminderId),
+    read straight off idx_remainders_user_minute_id. `after` is the
+    (minuteOfDay, reminderId) of the previous page's last row; fromMinute and
+    toMinute bound the time of day (inclusive) and `medicine` matches a
+    substring of the name. Fetches one extra row to tell whether more follow.
+    Rows without a minuteOfDay (unparseable legacy times) are not listed.
+    """
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "DELETE FROM remainders WHERE reminderId = %s"
-        cus.execute(query, (reminderId,))
-        conn.commit()
-        return {"msg": "Reminder deleted successfully"}
+        conditions = ["userId = %s", "minuteOfDay IS NOT NULL"]
+        params = [userId]
+        if after is not None:
+            conditions.append("(minuteOfDay > %s OR (minuteOfDay = %s AND reminderId > %s))")
+            params.extend([after[0], after[0], after[1]])
+        if fromMinute is not None:
+            conditions.append("minuteOfDay >= %s")
+            params.append(fromMinute)
+        if toMinute is not None:
+            conditions.append("minuteOfDay <= %s")
+            params.append(toMinute)
+        if medicine:
+            escaped = medicine.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("medicineName LIKE %s")
+            params.append(f"%{escaped}%")
+        query = f"""
+        SELECT reminderId, userId, medicineName, dosage, time, minuteOfDay
+        FROM remainders
+        WHERE {" AND ".join(conditions)}
+        ORDER BY minuteOfDay, reminderId
+        LIMIT %s
+        """
+        params.append(limit + 1)
+        with getCursor() as (conn, cus):
+            cus.execute(query, tuple(params))
+            rows = cus.fetchall()
+        return {"reminders": rows[:limit], "hasMore": len(rows) > limit}
+    except Exception as e:
+        return {"error": str(e), "msg": "Failed to get user reminders"}
+
+@timedQuery()
+def deleteReminder(reminderId, notifications=None, userId=None):
+    """Delete a reminder; with userId, only if that user owns it (deleted is 0 otherwise)"""
+    try:
+        with getCursor() as (conn, cus):
+            if userId:
+                cus.execute("DELETE FROM remainders WHERE reminderId = %s AND userId = %s", (reminderId, userId))
+            else:
+                userId = _reminderOwner(cus, reminderId)
+                cus.execute("DELETE FROM remainders WHERE reminderId = %s", (reminderId,))
+            deleted = cus.rowcount
+            if deleted:
+                _insertNotifications(cus, notifications)
+            conn.commit()
+            _invalidateUser(userId)
+            return {"msg": "Reminder deleted successfully", "deleted": deleted}
     except Exception as e:
         return {"error": str(e), "msg": "Failed to delete reminder"}
 
 def getUserById(userId):
     """Get user details by ID"""
+    return cache.get_or_load(f"user:{userId}", lambda: _loadUserById(userId))
+
+@timedQuery("getUserById")
+def _loadUserById(userId):
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "SELECT userId, fname, lname, mobileNumber, email, bloodGroup, emergencyContactNumber, allergies, medicalConditions FROM USERS WHERE userId = %s"
-        cus.execute(query, (userId,))
-        result = cus.fetchone()
-        return result
+        with getCursor() as (conn, cus):
+            query = """
+            SELECT userId, fname, lname, mobileNumber, email, bloodGroup, emergencyContactNumber, allergies, medicalConditions,
+                   confirmationSms, confirmationCall, timezone, countryCode
+            FROM USERS WHERE userId = %s
+            """
+            cus.execute(query, (userId,))
+            result = cus.fetchone()
+            return result
     except Exception as e:
         print(f"Error getting user: {e}")
         return None
 
+@timedQuery()
+def updateNotificationPreferences(userId, confirmationSms, confirmationCall):
+    """Per-channel opt-out for reminder CRUD confirmations"""
+    try:
+        with getCursor() as (conn, cus):
+            query = "UPDATE USERS SET confirmationSms = %s, confirmationCall = %s WHERE userId = %s"
+            cus.execute(query, (confirmationSms, confirmationCall, userId))
+            conn.commit()
+            _invalidateUser(userId, profile=True)
+            return {"msg": "Preferences updated successfully", "success": True}
+    except Exception as e:
+        print(f"Error updating preferences: {e}")
+        return {"error": str(e), "msg": "Failed to update preferences", "success": False}
+
+@timedQuery()
 def getReminderById(reminderId):
     """Get reminder details by ID"""
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "SELECT reminderId, userId, medicineName, dosage, time FROM remainders WHERE reminderId = %s"
-        cus.execute(query, (reminderId,))
-        result = cus.fetchone()
-        return result
+        with getCursor() as (conn, cus):
+            query = "SELECT reminderId, userId, medicineName, dosage, time FROM remainders WHERE reminderId = %s"
+            cus.execute(query, (reminderId,))
+            result = cus.fetchone()
+            return result
     except Exception as e:
         print(f"Error getting reminder: {e}")
         return None
 
-def updateReminder(reminderId, medicineName, dosage, time):
-    """Update reminder"""
+@timedQuery()
+def getUserRemindersByIds(userId, reminderIds):
+    """The user's reminders among reminderIds, read from the database (never the cache)"""
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        query = "UPDATE remainders SET medicineName = %s, dosage = %s, time = %s WHERE reminderId = %s"
-        cus.execute(query, (medicineName, dosage, time, reminderId))
-        conn.commit()
-        return {"msg": "Reminder updated successfully", "success": True}
+        with getCursor() as (conn, cus):
+            query = (
+                "SELECT reminderId, userId, medicineName, dosage, time FROM remainders "
+                f"WHERE userId = %s AND reminderId IN ({', '.join(['%s'] * len(reminderIds))})"
+            )
+            cus.execute(query, (userId, *reminderIds))
+            return cus.fetchall()
+    except Exception as e:
+        return {"error": str(e), "msg": "Failed to get user reminders"}
+
+@timedQuery()
+def updateReminder(reminderId, medicineName, dosage, time, notifications=None, userId=None):
+    """Update a reminder; with userId, only if that user owns it (updated is 0 otherwise)"""
+    try:
+        with getCursor() as (conn, cus):
+            if userId:
+                # Ownership by locking the row: UPDATE's rowcount is 0 for an owned row whose values didn't change
+                cus.execute(
+                    "SELECT reminderId FROM remainders WHERE reminderId = %s AND userId = %s FOR UPDATE",
+                    (reminderId, userId)
+                )
+                updated = len(cus.fetchall())
+            else:
+                userId = _reminderOwner(cus, reminderId)
+                updated = 1 if userId else 0
+            if updated:
+                query = (
+                    "UPDATE remainders SET medicineName = %s, dosage = %s, time = %s, minuteOfDay = %s "
+                    "WHERE reminderId = %s AND userId = %s"
+                )
+                cus.execute(query, (medicineName, dosage, time, minute_of_day(time), reminderId, userId))
+                _insertNotifications(cus, notifications)
+            conn.commit()
+            if updated:
+                _invalidateUser(userId)
+            return {"msg": "Reminder updated successfully", "success": True, "updated": updated}
     except Exception as e:
-        conn.rollback()
         print(f"Error updating reminder: {e}")
         return {"error": str(e), "msg": "Failed to update reminder", "success": False}
 
+@timedQuery()
 def getAllActiveReminders():
     """Get all active reminders with user phone numbers (for loading on startup)"""
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
+        with getCursor() as (conn, cus):
+            query = """
+            SELECT r.reminderId, r.userId, r.medicineName, r.dosage, r.time, u.mobileNumber
+            FROM remainders r
+            JOIN USERS u ON r.userId = u.userId
+            WHERE u.mobileNumber IS NOT NULL AND u.mobileNumber != ''
+            """
+            cus.execute(query)
+            results = cus.fetchall()
+            return results
+    except Exception as e:
+        print(f"Error getting all reminders: {e}")
+        return []
+
+def iterActiveReminders(batchSize=1000):
+    """
+    Stream active reminders in batches (for loading on startup).
+    Keyset-paginated on reminderId; each batch is read through an unbuffered
+    (server-side) cursor and the connection is returned between batches.
+    """
+    query = """
+    SELECT r.reminderId, r.userId, r.medicineName, r.dosage, r.time, u.mobileNumber, u.timezone, u.countryCode
+    FROM remainders r
+    JOIN USERS u ON r.userId = u.userId
+    WHERE u.mobileNumber IS NOT NULL AND u.mobileNumber != '' AND r.reminderId > %s
+    ORDER BY r.reminderId
+    LIMIT %s
+    """
+    lastId = ""
+    while True:
+        with pool.connection() as conn:
+            cus = conn.cursor(dictionary=True)
+            try:
+                cus.execute(query, (lastId, batchSize))
+                batch = []
+                rows = cus.fetchmany(500)
+                while rows:
+                    batch.extend(rows)
+                    rows = cus.fetchmany(500)
+            finally:
+                cus.close()
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batchSize:
+            return
+        lastId = batch[-1]["reminderId"]
+
+@timedQuery()
+def getDueReminders(slots):
+    """
+    Active reminders due at any of `slots`, (timezone, minuteOfDay) pairs in the
+    users' local time, with user phone numbers (database job store)
+    """
+    if not slots:
+        return []
+    with getCursor() as (conn, cus):
+        # The minuteOfDay IN list is index-backed; the row comparison picks each zone's own minute
+        query = f"""
+        SELECT r.reminderId, r.userId, r.medicineName, r.dosage, r.time, u.mobileNumber, u.timezone, u.countryCode
+        FROM remainders r
+        JOIN USERS u ON r.userId = u.userId
+        WHERE r.minuteOfDay IN ({", ".join(["%s"] * len(slots))})
+          AND (u.timezone, r.minuteOfDay) IN ({", ".join(["(%s, %s)"] * len(slots))})
+          AND u.mobileNumber IS NOT NULL AND u.mobileNumber != ''
+        """
+        params = [minute for _, minute in slots]
+        for zone, minute in slots:
+            params.extend((zone, minute))
+        cus.execute(query, params)
+        return cus.fetchall()
+
+@timedQuery()
+def getUserDueReminders(userId):
+    """
+    One user's reminders as the database job store fires them: rows with a
+    minuteOfDay, only if the user has a mobile number (same filter as getDueReminders)
+    """
+    with getCursor() as (conn, cus):
         query = """
-        SELECT r.reminderId, r.userId, r.medicineName, r.dosage, r.time, u.mobileNumber
+        SELECT r.reminderId, r.userId, r.medicineName, r.dosage, r.time, r.minuteOfDay,
+               u.mobileNumber, u.timezone, u.countryCode
         FROM remainders r
         JOIN USERS u ON r.userId = u.userId
-        WHERE u.mobileNumber IS NOT NULL AND u.mobileNumber != ''
+        WHERE r.userId = %s AND r.minuteOfDay IS NOT NULL
+          AND u.mobileNumber IS NOT NULL AND u.mobileNumber != ''
         """
-        cus.execute(query)
-        results = cus.fetchall()
-        return results
-    except Exception as e:
-        print(f"Error getting all reminders: {e}")
-        return []
+        cus.execute(query, (userId,))
+        return cus.fetchall()
+
+@timedQuery()
+def getReminderTimezones():
+    """
+    Timezones of users who can receive reminders (database job store tick).
+    Read uncached: the leader must see a zone another worker just added, and
+    the DISTINCT is answered from idx_users_timezone once a minute.
+    """
+    with getCursor() as (conn, cus):
+        cus.execute("SELECT DISTINCT timezone FROM USERS WHERE mobileNumber IS NOT NULL AND mobileNumber != ''")
+        return [row["timezone"] for row in cus.fetchall()]
+
+@timedQuery()
+def acquireLease(name, holder, ttlSeconds) -> bool:
+    """Take or extend a named lease; succeeds if it is free, expired or already ours"""
+    with getCursor() as (conn, cus):
+        # Assignments run left to right: expiresAt only moves if holder is (now) us
+        query = """
+        INSERT INTO scheduler_lease (name, holder, expiresAt)
+        VALUES (%s, %s, NOW() + INTERVAL %s SECOND)
+        ON DUPLICATE KEY UPDATE
+        holder = IF(expiresAt < NOW() OR holder = VALUES(holder), VALUES(holder), holder),
+        expiresAt = IF(holder = VALUES(holder), VALUES(expiresAt), expiresAt)
+        """
+        cus.execute(query, (name, holder, ttlSeconds))
+        cus.execute("SELECT holder FROM scheduler_lease WHERE name = %s", (name,))
+        row = cus.fetchone()
+        conn.commit()
+        return bool(row) and row["holder"] == holder
+
+@timedQuery()
+def releaseLease(name, holder):
+    with getCursor() as (conn, cus):
+        cus.execute("DELETE FROM scheduler_lease WHERE name = %s AND holder = %s", (name, holder))
+        conn.commit()
+
+# ==================== NOTIFICATION OUTBOX ====================
+
+def _insertNotifications(cus, notifications, chunkSize=500):
+    """Add outbox rows on the caller's cursor so they commit with its transaction"""
+    if not notifications:
+        return
+    # Explicit multi-row VALUES: executemany() does not batch INSERT IGNORE statements
+    for start in range(0, len(notifications), chunkSize):
+        chunk = notifications[start:start + chunkSize]
+        query = (
+            "INSERT IGNORE INTO notification_outbox (channel, toPhone, body, dedupeKey, scheduledAt) VALUES "
+            + ", ".join(["(%s, %s, %s, %s, %s)"] * len(chunk))
+        )
+        params = []
+        for n in chunk:
+            params.extend((n["channel"], n["toPhone"], n["body"], n.get("dedupeKey"), n.get("scheduledAt")))
+        cus.execute(query, params)
+
+@timedQuery()
+def enqueueNotifications(notifications):
+    """Queue notifications for the outbox drainer; duplicates (same dedupeKey) are ignored"""
+    with getCursor() as (conn, cus):
+        _insertNotifications(cus, notifications)
+        conn.commit()
+        return len(notifications)
+
+@timedQuery()
+def claimNotifications(claimToken, batchSize, claimSeconds):
+    """
+    Claim up to batchSize due notifications. Rows whose previous claim expired
+    (a drainer died mid-send) are claimed again, giving at-least-once delivery.
+    """
+    with getCursor() as (conn, cus):
+        query = """
+        UPDATE notification_outbox
+        SET status = 'sending', claimedBy = %s, claimedUntil = NOW() + INTERVAL %s SECOND, attempts = attempts + 1
+        WHERE (status = 'pending' AND availableAt <= NOW())
+           OR (status = 'sending' AND claimedUntil < NOW())
+        ORDER BY id
+        LIMIT %s
+        """
+        cus.execute(query, (claimToken, claimSeconds, batchSize))
+        cus.execute(
+            "SELECT id, channel, toPhone, body, scheduledAt, attempts, claimedBy FROM notification_outbox WHERE claimedBy = %s AND status = 'sending'",
+            (claimToken,)
+        )
+        rows = cus.fetchall()
+        conn.commit()
+        return rows
+
+@timedQuery()
+def renewNotificationClaim(notificationId, claimToken, claimSeconds):
+    """
+    Re-check and extend a claim right before sending. False means the claim
+    expired and another drainer took the row over, so it must not be sent here.
+    """
+    with getCursor() as (conn, cus):
+        query = """
+        UPDATE notification_outbox
+        SET claimedUntil = NOW() + INTERVAL %s SECOND
+        WHERE id = %s AND claimedBy = %s AND status = 'sending'
+        """
+        cus.execute(query, (claimSeconds, notificationId, claimToken))
+        renewed = cus.rowcount == 1
+        conn.commit()
+        return renewed
+
+@timedQuery()
+def completeNotification(notificationId, success, sid=None, error=None, maxAttempts=5, claimToken=None):
+    """
+    Record a send result; failures are retried with exponential backoff until
+    maxAttempts. A failure only releases the row while `claimToken` still owns it.
+    """
+    with getCursor() as (conn, cus):
+        if success:
+            query = """
+            UPDATE notification_outbox
+            SET status = 'sent', sid = %s, sentAt = NOW(), lastError = NULL, claimedBy = NULL, claimedUntil = NULL
+            WHERE id = %s
+            """
+            cus.execute(query, (sid, notificationId))
+        else:
+            query = """
+            UPDATE notification_outbox
+            SET status = IF(attempts >= %s, 'failed', 'pending'),
+                availableAt = NOW() + INTERVAL LEAST(POW(2, attempts) * 10, 3600) SECOND,
+                lastError = %s, claimedBy = NULL, claimedUntil = NULL
+            WHERE id = %s AND (%s IS NULL OR claimedBy = %s)
+            """
+            cus.execute(query, (maxAttempts, (error or "")[:500], notificationId, claimToken, claimToken))
+        conn.commit()
 
 # Update createReminder to return reminderId
-def createReminder(userId, medicineName, dosage, time) -> dict :
+@timedQuery()
+def createReminder(userId, medicineName, dosage, time, notifications=None) -> dict :
     try:
-        conn = createConnection()
-        cus = conn.cursor(dictionary=True)
-        reminderId = str(uuid.uuid4())
-        query = "INSERT INTO remainders (reminderId, userId, medicineName, dosage, time) VALUES (%s, %s, %s, %s, %s)"
-        cus.execute(query, (reminderId, userId, medicineName, dosage, time))
-        conn.commit()
-        return {"msg": "Reminder created successfully", "reminderId": reminderId, "success": True}
+        with getCursor() as (conn, cus):
+            reminderId = str(uuid.uuid4())
+            query = "INSERT INTO remainders (reminderId, userId, medicineName, dosage, time, minuteOfDay) VALUES (%s, %s, %s, %s, %s, %s)"
+            cus.execute(query, (reminderId, userId, medicineName, dosage, time, minute_of_day(time)))
+            _insertNotifications(cus, notifications)
+            conn.commit()
+            _invalidateUser(userId)
+            return {"msg": "Reminder created successfully", "reminderId": reminderId, "success": True}
     except Exception as e:
-        conn.rollback()
         print(f"Error creating reminder 1: {e}")
         return {"error": str(e), "msg": "Failed to create reminder", "success": False}
 
-"""
-userId VARCHAR(50) PRIMARY KEY,
-  fname VARCHAR(50) NOT NULL,
-  lname VARCHAR(50) NOT NULL,
-  mobileNumber DECIMAL(10) UNIQUE,
-  email VARCHAR(50) UNIQUE NOT NULL,
-  gender ENUM("male","female"),
-  bloodGroup ENUM("A+","A-","B+","B-","AB+","AB-","O+","O-"),
-  emergencyContactNumber DECIMAL(10),
-  allergies VARCHAR(200),
-  medicalConditions VARCHAR(200),
-
-  streetAddress VARCHAR(100),
-  city VARCHAR(100),
-  state VARCHAR(100),
-  pinCode INT,
-  country VARCHAR(100),
-
-  userId VARCHAR(50),
-  medicineName VARCHAR(100),
-  dosage VARCHAR(100),
-  time VARCHAR(100)
-"""
\ No newline at end of file
+# Schema: see the versioned migrations in migrations/ (applied with `python -m models.migrate`)
+
+@timedQuery()
+def createReminders(userId, reminders, notifications=None) -> dict:
+    """
+    Insert several reminders with one multi-row INSERT in a single transaction.
+    reminders: [{"medicineName": ..., "dosage": ..., "time": "HH:MM"}, ...]
+    """
+    try:
+        with getCursor() as (conn, cus):
+            rows = [(str(uuid.uuid4()), r) for r in reminders]
+            query = (
+                "INSERT INTO remainders (reminderId, userId, medicineName, dosage, time, minuteOfDay) VALUES "
+                + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows))
+            )
+            params = []
+            for reminderId, r in rows:
+                params.extend((reminderId, userId, r["medicineName"], r["dosage"], r["time"], minute_of_day(r["time"])))
+            cus.execute(query, params)
+            _insertNotifications(cus, notifications)
+            conn.commit()
+            _invalidateUser(userId)
+            return {"msg": "Reminders created successfully", "reminderIds": [reminderId for reminderId, _ in rows], "success": True}
+    except Exception as e:
+        print(f"Error creating reminders: {e}")
+        return {"error": str(e), "msg": "Failed to create reminders", "success": False}
+
+@timedQuery()
+def updateReminders(userId, reminders, notifications=None) -> dict:
+    """
+    Update several of a user's reminders with one UPDATE in a single transaction.
+    reminders: [{"reminderId": ..., "medicineName": ..., "dosage": ..., "time": "HH:MM"}, ...]
+    Rows belonging to other users are left untouched.
+    """
+    try:
+        with getCursor() as (conn, cus):
+            assignments = []
+            params = []
+            for column, value in (
+                ("medicineName", lambda r: r["medicineName"]),
+                ("dosage", lambda r: r["dosage"]),
+                ("time", lambda r: r["time"]),
+                ("minuteOfDay", lambda r: minute_of_day(r["time"])),
+            ):
+                assignments.append(f"{column} = CASE reminderId " + "WHEN %s THEN %s " * len(reminders) + "END")
+                for r in reminders:
+                    params.extend((r["reminderId"], value(r)))
+            query = (
+                f"UPDATE remainders SET {', '.join(assignments)} "
+                f"WHERE userId = %s AND reminderId IN ({', '.join(['%s'] * len(reminders))})"
+            )
+            params.append(userId)
+            params.extend(r["reminderId"] for r in reminders)
+            cus.execute(query, params)
+            _insertNotifications(cus, notifications)
+            conn.commit()
+            _invalidateUser(userId)
+            return {"msg": "Reminders updated successfully", "success": True}
+    except Exception as e:
+        print(f"Error updating reminders: {e}")
+        return {"error": str(e), "msg": "Failed to update reminders", "success": False}
+
+@timedQuery()
+def deleteReminders(userId, reminderIds, notifications=None) -> dict:
+    """Delete several of a user's reminders with one DELETE in a single transaction"""
+    try:
+        with getCursor() as (conn, cus):
+            query = f"DELETE FROM remainders WHERE userId = %s AND reminderId IN ({', '.join(['%s'] * len(reminderIds))})"
+            cus.execute(query, (userId, *reminderIds))
+            deleted = cus.rowcount
+            _insertNotifications(cus, notifications)
+            conn.commit()
+            _invalidateUser(userId)
+            return {"msg": "Reminders deleted successfully", "deleted": deleted, "success": True}
+    except Exception as e:
+        print(f"Error deleting reminders: {e}")
+        return {"error": str(e), "msg": "Failed to delete reminders", "success": False}
@@ -0,0 +1,201 @@
+"""
+Versioned schema migrations.
+
+    python -m models.migrate            apply pending migrations
+    python -m models.migrate --status   list applied/pending versions
+
+Migrations are the numbered .sql files in migrations/; each is applied once
+and recorded in schema_migrations. MySQL commits DDL implicitly, so a file
+that failed halfway is retried from its first statement: ADD COLUMN /
+CREATE INDEX / DROP INDEX statements that already took effect are skipped,
+and data changes must be written to be re-runnable.
+
+tests/test_indexes.py checks the hot reminder queries against a live
+database with check_indexes().
+"""
+import argparse
+import os
+import sys
+from mysql import connector
+from models import database as db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+class SchemaBehindError(RuntimeError):
+    """Raised at startup when the database lacks migrations this code depends on"""
+
+
+# DDL errors meaning the statement already took effect in an earlier, partial run
+ALREADY_APPLIED_ERRORS = {
+    1060,  # ER_DUP_FIELDNAME: ADD COLUMN
+    1061,  # ER_DUP_KEYNAME: CREATE INDEX
+    1091,  # ER_CANT_DROP_FIELD_OR_KEY: DROP INDEX / DROP COLUMN
+}
+
+# Stands in for a userId that exists, so the optimizer plans a real lookup
+SAMPLE_USER = object()
+
+# Queries on the request/scheduler hot path that must stay index-backed
+INDEXED_QUERIES = {
+    "getReminders / getDueReminders": (
+        "SELECT reminderId FROM remainders WHERE minuteOfDay = %s", (480,)
+    ),
+    "getUserReminders": (
+        "SELECT reminderId FROM remainders WHERE userId = %s", (SAMPLE_USER,)
+    ),
+    "getUserRemindersPage": (
+        """
+        SELECT reminderId FROM remainders
+        WHERE userId = %s AND minuteOfDay IS NOT NULL
+          AND (minuteOfDay > %s OR (minuteOfDay = %s AND reminderId > %s))
+        ORDER BY minuteOfDay, reminderId LIMIT 101
+        """, (SAMPLE_USER, 480, 480, "")
+    ),
+    "getUserForDashboard": (
+        """
+        SELECT u.userId, a.city, r.reminderId FROM USERS u
+        LEFT JOIN ADDRESS a ON a.userId = u.userId
+        LEFT JOIN remainders r ON r.userId = u.userId
+        WHERE u.userId = %s
+        """, (SAMPLE_USER,)
+    ),
+}
+
+
+def _split_statements(sql: str) -> list:
+    statements = []
+    current = []
+    for line in sql.splitlines():
+        if line.strip().startswith("--"):
+            continue
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip().rstrip(";")
+            if statement:
+                statements.append(statement)
+            current = []
+    if "\n".join(current).strip():
+        statements.append("\n".join(current).strip())
+    return statements
+
+
+def available_migrations() -> list:
+    """(version, path) pairs sorted by version, e.g. ("0003", ".../0003_x.sql")"""
+    migrations = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith(".sql"):
+            migrations.append((name.split("_", 1)[0], os.path.join(MIGRATIONS_DIR, name)))
+    return migrations
+
+
+def applied_versions(cus) -> set:
+    cus.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+      version VARCHAR(20) PRIMARY KEY,
+      name VARCHAR(200) NOT NULL,
+      appliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cus.execute("SELECT version FROM schema_migrations")
+    return {row["version"] for row in cus.fetchall()}
+
+
+def migrate() -> list:
+    """Apply pending migrations in order; returns the versions applied"""
+    applied = []
+    with db.getCursor() as (conn, cus):
+        done = applied_versions(cus)
+        for version, path in available_migrations():
+            if version in done:
+                continue
+            name = os.path.basename(path)
+            print(f"⬆️ Applying migration {name}")
+            with open(path, encoding="utf-8") as f:
+                for statement in _split_statements(f.read()):
+                    try:
+                        cus.execute(statement)
+                    except connector.Error as e:
+                        if e.errno not in ALREADY_APPLIED_ERRORS:
+                            raise
+                        print(f"↪️ Skipping already applied statement in {name}: {e.msg}")
+            cus.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            applied.append(version)
+    if applied:
+        db.cache.clear()
+    print(f"✅ Schema up to date ({len(applied)} migrations applied)")
+    return applied
+
+
+def pending_migrations() -> list:
+    """Versions in migrations/ that schema_migrations doesn't record yet"""
+    with db.getCursor() as (conn, cus):
+        done = applied_versions(cus)
+        conn.commit()
+    return [version for version, _ in available_migrations() if version not in done]
+
+
+def require_current_schema():
+    """Fail fast if migrations/ has versions the database hasn't applied"""
+    pending = pending_migrations()
+    if pending:
+        raise SchemaBehindError(
+            f"Database schema is behind the code (pending migrations: {', '.join(pending)}); "
+            "run `python -m models.migrate` or set RUN_MIGRATIONS_ON_STARTUP"
+        )
+
+
+def _sample_user(cus) -> str:
+    """A userId with reminders if there is one, else any user"""
+    cus.execute("SELECT userId FROM remainders WHERE minuteOfDay IS NOT NULL LIMIT 1")
+    row = cus.fetchone()
+    if not row:
+        cus.execute("SELECT userId FROM USERS LIMIT 1")
+        row = cus.fetchone()
+    return row["userId"] if row else ""
+
+
+def check_indexes() -> dict:
+    """
+    EXPLAIN each hot query and report the index it uses per table.
+    Returns {query_name: [problems]}; an empty dict means every lookup is index-backed.
+    """
+    problems = {}
+    with db.getCursor() as (conn, cus):
+        user_id = _sample_user(cus)
+        for name, (query, params) in INDEXED_QUERIES.items():
+            params = tuple(user_id if param is SAMPLE_USER else param for param in params)
+            cus.execute("EXPLAIN " + query, params)
+            for row in cus.fetchall():
+                # MySQL reports `key`; TiDB reports an operator tree with access objects
+                key = row.get("key")
+                if "key" in row and row.get("table") is None:
+                    # "no matching row in const table" / "Impossible WHERE": no table is read
+                    continue
+                if "key" in row and not key:
+                    problems.setdefault(name, []).append(f"full scan of {row.get('table')}")
+                task = str(row.get("id", ""))
+                if "TableFullScan" in task:
+                    problems.setdefault(name, []).append(f"full scan: {row.get('access object') or task}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MedRed schema migrations")
+    parser.add_argument("--status", action="store_true", help="show applied and pending migrations")
+    args = parser.parse_args()
+
+    if args.status:
+        with db.getCursor() as (conn, cus):
+            done = applied_versions(cus)
+            conn.commit()
+        for version, path in available_migrations():
+            print(f"{'applied' if version in done else 'pending':8} {os.path.basename(path)}")
+        return 0
+
+    migrate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from fastapi import Form, Depends
 from controller.auth import getCurrentUserFromCookie
-from typing import Optional
+from typing import Optional, List
+from datetime import date
 
 class UserLogin(BaseModel):
     email: str
@@ -19,6 +20,91 @@ class Info(BaseModel):
     country: str = Form(...),
     bloodGroup: str = Form(...),
     medicalConditions: Optional[str] = Form(""),
-    allergies: Optional[str] = Form("") 
-    
+    allergies: Optional[str] = Form("")
 
+class NotificationPreferences(BaseModel):
+    # Confirmation messages sent when reminders are created, updated or deleted
+    confirmationSms: bool = True
+    confirmationCall: bool = True
+
+
+# ==================== RESPONSE MODELS ====================
+
+class DashboardUser(BaseModel):
+    # DECIMAL phone columns arrive as Decimal
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    userId: str
+    fname: str
+    lname: str
+    email: str
+    mobileNumber: Optional[str] = None
+    gender: Optional[str] = None
+    birthDate: Optional[date] = None
+    bloodGroup: Optional[str] = None
+    emergencyContactNumber: Optional[str] = None
+    allergies: Optional[str] = None
+    medicalConditions: Optional[str] = None
+
+class DashboardAddress(BaseModel):
+    streetAddress: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    pinCode: Optional[int] = None
+    country: Optional[str] = None
+
+class DashboardReminder(BaseModel):
+    reminderId: str
+    medicineName: Optional[str] = None
+    dosage: Optional[str] = None
+    time: Optional[str] = None
+
+class DashboardResponse(BaseModel):
+    user: Optional[DashboardUser] = None
+    address: Optional[DashboardAddress] = None
+    reminders: List[DashboardReminder] = []
+
+class MeResponse(BaseModel):
+    email: Optional[str] = None
+    fname: Optional[str] = None
+    lname: Optional[str] = None
+
+class UpdateUserResponse(BaseModel):
+    success: bool
+    message: str
+    data: Optional[dict] = None
+
+class Reminder(BaseModel):
+    # A remainders row
+    reminderId: str
+    userId: Optional[str] = None
+    medicineName: Optional[str] = None
+    dosage: Optional[str] = None
+    time: Optional[str] = None
+    minuteOfDay: Optional[int] = None
+
+class RemindersResponse(BaseModel):
+    reminders: List[Reminder] = []
+    success: bool = True
+    nextCursor: Optional[str] = None  # set by paginated listings; null on the last page
+
+class ReminderWriteResponse(BaseModel):
+    # Routes set only the fields that apply and use response_model_exclude_unset
+    success: bool
+    message: str
+    reminder_id: Optional[str] = None
+    reminder_ids: Optional[List[str]] = None
+    sms_scheduled: Optional[bool] = None
+    job_ids: Optional[List[str]] = None
+    jobs_removed: Optional[int] = None
+    result: Optional[dict] = None
+
+class ScheduledJob(BaseModel):
+    id: str
+    name: str
+    next_run_time: str
+
+class ScheduledJobsResponse(BaseModel):
+    success: bool = True
+    count: int
+    jobs: List[ScheduledJob] = []
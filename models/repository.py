@@ -0,0 +1,95 @@
+"""
+Async facade over models/database.py.
+
+The mysql.connector calls are blocking, so every operation runs on a bounded
+thread pool sized to the connection pool; route handlers can `await` them
+without stalling the event loop.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config import settings
+from models import database
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS or settings.DB_POOL_MAX_SIZE,
+    thread_name_prefix="db"
+)
+
+async def run(func, *args, **kwargs):
+    """Run a blocking database function on the DB executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+def shutdown():
+    executor.shutdown(wait=True)
+
+
+async def getUser(email):
+    return await run(database.getUser, email)
+
+async def updatePassword(userId, password):
+    return await run(database.updatePassword, userId, password)
+
+async def getUserForDashboard(userId):
+    return await run(database.getUserForDashboard, userId)
+
+async def createUser(fname, lname, email, password):
+    return await run(database.createUser, fname, lname, email, password)
+
+async def updateUser(**fields):
+    return await run(database.updateUser, **fields)
+
+async def createReminder(userId, medicineName, dosage, time, notifications=None) -> dict:
+    return await run(database.createReminder, userId, medicineName, dosage, time, notifications)
+
+async def createReminders(userId, reminders, notifications=None) -> dict:
+    return await run(database.createReminders, userId, reminders, notifications)
+
+async def updateReminders(userId, reminders, notifications=None) -> dict:
+    return await run(database.updateReminders, userId, reminders, notifications)
+
+async def deleteReminders(userId, reminderIds, notifications=None) -> dict:
+    return await run(database.deleteReminders, userId, reminderIds, notifications)
+
+async def getReminders(time):
+    return await run(database.getReminders, time)
+
+async def getUserReminders(userId):
+    return await run(database.getUserReminders, userId)
+
+async def getUserRemindersPage(userId, limit, after=None, fromMinute=None, toMinute=None, medicine=None):
+    return await run(database.getUserRemindersPage, userId, limit, after, fromMinute, toMinute, medicine)
+
+async def deleteReminder(reminderId, notifications=None, userId=None):
+    return await run(database.deleteReminder, reminderId, notifications, userId)
+
+async def getUserById(userId):
+    return await run(database.getUserById, userId)
+
+async def updateNotificationPreferences(userId, confirmationSms, confirmationCall):
+    return await run(database.updateNotificationPreferences, userId, confirmationSms, confirmationCall)
+
+async def getReminderById(reminderId):
+    return await run(database.getReminderById, reminderId)
+
+async def getUserRemindersByIds(userId, reminderIds):
+    return await run(database.getUserRemindersByIds, userId, reminderIds)
+
+async def updateReminder(reminderId, medicineName, dosage, time, notifications=None, userId=None):
+    return await run(database.updateReminder, reminderId, medicineName, dosage, time, notifications, userId)
+
+async def getAllActiveReminders():
+    return await run(database.getAllActiveReminders)
+
+async def enqueueNotifications(notifications):
+    return await run(database.enqueueNotifications, notifications)
+
+async def claimNotifications(claimToken, batchSize, claimSeconds):
+    return await run(database.claimNotifications, claimToken, batchSize, claimSeconds)
+
+async def renewNotificationClaim(notificationId, claimToken, claimSeconds):
+    return await run(database.renewNotificationClaim, notificationId, claimToken, claimSeconds)
+
+async def completeNotification(notificationId, success, sid=None, error=None, maxAttempts=5, claimToken=None):
+    return await run(database.completeNotification, notificationId, success, sid, error, maxAttempts, claimToken)
@@ -0,0 +1,226 @@
+import threading
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(time_str: str) -> int:
+    """"08:30" -> 510"""
+    hour, minute = map(int, time_str.split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid reminder time: {time_str}")
+    return hour * 60 + minute
+
+
+class ReminderEngine:
+    """
+    In-memory index of scheduled reminders grouped by slot: a (timezone,
+    minute-of-day) pair in the user's local wall-clock time.
+
+    Instead of one scheduler job per reminder, reminders sharing a zone and
+    HH:MM live in the same bucket and the per-minute tick fetches, for each
+    zone in use, the bucket for that zone's current local minute. Keeping
+    local time (not UTC) in the key means DST changes need no rebuild.
+    Adding or removing a reminder is an O(1) dict operation, and job ids are
+    indexed per reminder (to reschedule or cancel without guessing ids) and per
+    user (to list one user's jobs without walking every bucket).
+
+    A bulk load from a database snapshot (startup hydration) can run while
+    requests change reminders. Between track_changes() and
+    stop_tracking(), every reminder id written through the live methods is
+    recorded, and load_many() skips those ids so a stale snapshot row never
+    overwrites a newer change or revives a deleted reminder.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.buckets = {}       # (timezone, minute of day) -> {job_id: reminder}
+        self.jobs = {}          # job_id -> (timezone, minute of day)
+        self.by_reminder = {}   # reminder_id -> {job_id, ...}
+        self.by_user = {}       # user_id -> {job_id, ...}
+        self.zone_jobs = {}     # timezone -> number of jobs
+        self.touched = None     # reminder ids written since track_changes(), or None
+
+    def add(self, job_id: str, slot: tuple, reminder: dict):
+        """Add or replace a job in the bucket for `slot`"""
+        with self.lock:
+            self._touch(reminder.get("reminder_id"))
+            self._add(job_id, slot, reminder)
+
+    def add_many(self, items):
+        """Bulk add of (job_id, slot, reminder) tuples under a single lock"""
+        count = 0
+        with self.lock:
+            for job_id, slot, reminder in items:
+                self._touch(reminder.get("reminder_id"))
+                self._add(job_id, slot, reminder)
+                count += 1
+        return count
+
+    def track_changes(self):
+        """Start recording the reminder ids that live writes touch"""
+        with self.lock:
+            self.touched = set()
+
+    def stop_tracking(self):
+        with self.lock:
+            self.touched = None
+
+    def load_many(self, items) -> int:
+        """
+        add_many() for snapshot rows: reminders touched since track_changes()
+        are skipped, since the live write is newer. Returns the jobs added.
+        """
+        count = 0
+        with self.lock:
+            touched = self.touched or ()
+            for job_id, slot, reminder in items:
+                if reminder.get("reminder_id") in touched:
+                    continue
+                self._add(job_id, slot, reminder)
+                count += 1
+        return count
+
+    def replace(self, reminder_id: str, items) -> dict:
+        """
+        Atomically make `items` ((job_id, slot, reminder) tuples) the complete
+        job set of one reminder. Jobs whose slot is unchanged are kept in place
+        (only their details are refreshed); the rest are added or removed.
+        """
+        with self.lock:
+            return self._replace(reminder_id, items)
+
+    def replace_many(self, groups: dict) -> dict:
+        """replace() for {reminder_id: items} under a single lock; returns summed counts"""
+        totals = {"added": 0, "removed": 0, "kept": 0}
+        with self.lock:
+            for reminder_id, items in groups.items():
+                for key, job_ids in self._replace(reminder_id, items).items():
+                    totals[key] += len(job_ids)
+        return totals
+
+    def cancel(self, reminder_id: str) -> list:
+        """Remove every job of a reminder; returns the removed job ids"""
+        with self.lock:
+            self._touch(reminder_id)
+            job_ids = list(self.by_reminder.get(reminder_id, ()))
+            for job_id in job_ids:
+                self._remove(job_id)
+            return job_ids
+
+    def cancel_many(self, reminder_ids) -> int:
+        with self.lock:
+            return sum(len(self.cancel(reminder_id)) for reminder_id in reminder_ids)
+
+    def jobs_for(self, reminder_id: str) -> set:
+        with self.lock:
+            return set(self.by_reminder.get(reminder_id, ()))
+
+    def user_jobs(self, user_id: str) -> list:
+        """Snapshot of (job_id, slot, reminder) for one user's jobs"""
+        with self.lock:
+            return [
+                (job_id, self.jobs[job_id], self.buckets[self.jobs[job_id]][job_id])
+                for job_id in self.by_user.get(user_id, ())
+            ]
+
+    def remove(self, job_id: str) -> bool:
+        with self.lock:
+            slot = self.jobs.get(job_id)
+            if slot is not None:
+                self._touch(self.buckets[slot][job_id].get("reminder_id"))
+            return self._remove(job_id)
+
+    def remove_many(self, job_ids) -> int:
+        """Bulk remove under a single lock; returns how many jobs existed"""
+        with self.lock:
+            return sum(1 for job_id in job_ids if self._remove(job_id))
+
+    def _touch(self, reminder_id):
+        if self.touched is not None:
+            self.touched.add(reminder_id)
+
+    def _add(self, job_id: str, slot: tuple, reminder: dict):
+        self._remove(job_id)
+        self.buckets.setdefault(slot, {})[job_id] = reminder
+        self.jobs[job_id] = slot
+        self.zone_jobs[slot[0]] = self.zone_jobs.get(slot[0], 0) + 1
+        self.by_reminder.setdefault(reminder.get("reminder_id"), set()).add(job_id)
+        self.by_user.setdefault(reminder.get("user_id"), set()).add(job_id)
+
+    def _replace(self, reminder_id: str, items) -> dict:
+        self._touch(reminder_id)
+        wanted = {job_id: (slot, reminder) for job_id, slot, reminder in items}
+        removed = [job_id for job_id in self.by_reminder.get(reminder_id, ()) if job_id not in wanted]
+        for job_id in removed:
+            self._remove(job_id)
+        added, kept = [], []
+        for job_id, (slot, reminder) in wanted.items():
+            # A kept job changing owner is re-added so by_user follows it
+            if self.jobs.get(job_id) == slot and self.buckets[slot][job_id].get("user_id") == reminder.get("user_id"):
+                self.buckets[slot][job_id] = reminder
+                kept.append(job_id)
+            else:
+                self._add(job_id, slot, reminder)
+                added.append(job_id)
+        return {"added": added, "removed": removed, "kept": kept}
+
+    def _remove(self, job_id: str) -> bool:
+        slot = self.jobs.pop(job_id, None)
+        if slot is None:
+            return False
+        bucket = self.buckets[slot]
+        reminder = bucket.pop(job_id)
+        if not bucket:
+            del self.buckets[slot]
+        self.zone_jobs[slot[0]] -= 1
+        if not self.zone_jobs[slot[0]]:
+            del self.zone_jobs[slot[0]]
+        for index, key in ((self.by_reminder, reminder.get("reminder_id")), (self.by_user, reminder.get("user_id"))):
+            job_ids = index.get(key)
+            if job_ids is not None:
+                job_ids.discard(job_id)
+                if not job_ids:
+                    del index[key]
+        return True
+
+    def get(self, job_id: str):
+        """Return (slot, reminder) for a job, or None"""
+        with self.lock:
+            slot = self.jobs.get(job_id)
+            if slot is None:
+                return None
+            return slot, self.buckets[slot][job_id]
+
+    def due(self, slot: tuple) -> list:
+        """Snapshot of (job_id, reminder) pairs scheduled at `slot`"""
+        with self.lock:
+            return list(self.buckets.get(slot, {}).items())
+
+    def zones(self) -> list:
+        """Timezones that currently have at least one job"""
+        with self.lock:
+            return list(self.zone_jobs)
+
+    def all_jobs(self) -> list:
+        """Snapshot of (job_id, slot, reminder) for every scheduled job"""
+        with self.lock:
+            return [
+                (job_id, slot, reminder)
+                for slot, bucket in self.buckets.items()
+                for job_id, reminder in bucket.items()
+            ]
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+            self.jobs.clear()
+            self.by_reminder.clear()
+            self.by_user.clear()
+            self.zone_jobs.clear()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"jobs": len(self.jobs), "buckets": len(self.buckets), "reminders": len(self.by_reminder), "users": len(self.by_user), "zones": len(self.zone_jobs)}
@@ -1,60 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Response, Cookie, Form, Body
 from fastapi.responses import RedirectResponse
-from controller.auth import verifyPassword, createAccessToken, getCurrentUserFromCookie
-from models import database as db
+from controller.auth import verifyAndUpdatePassword, getCurrentUser, setAuthCookies, clearAuthCookies, verifyToken
+from models import repository as db
 from controller import auth
 from typing import Optional
+from models.models import DashboardResponse, NotificationPreferences, MeResponse, UpdateUserResponse
+from scheduler import schedule_reminders, user_phone
+import pytz
+import re
+from urllib.parse import urlsplit
 
 router = APIRouter(tags=["auth"])
 
 @router.post("/login")
 async def login(email: str = Form(...), password: str = Form(...)):
-    user = db.getUser(email)
+    user = await db.getUser(email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="user not found")
-    if not verifyPassword(password, user["password"]):
+    valid, new_hash = await verifyAndUpdatePassword(password, user["password"])
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="incorrect password")
-    del user["password"]  # Remove password before creating token
-    token = createAccessToken(data={"sub": user["userId"], "user": user}, expires_delta=None)
-
+    if new_hash:
+        await db.updatePassword(user["userId"], new_hash)
     response = RedirectResponse(url="/", status_code=302)
-    response.set_cookie(
-        key="token",
-        value=token,
-        httponly=True,
-        secure=True,  # ⚠️ Use False locally if needed
-        samesite="Strict"
-    )
-    return response
+    return setAuthCookies(response, user["userId"])
 
 
 @router.post("/register/")
-def register(username: str = Form(...), email: str = Form(...), password: str = Form(...)):
-    existing_user = db.getUser(email)
+async def register(username: str = Form(...), email: str = Form(...), password: str = Form(...)):
+    existing_user = await db.getUser(email)
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    try:
-        fname, lname = username.split(" ")
-        hashed_password = auth.getPasswordHash(password)
-        mess = db.createUser(fname, lname, email, hashed_password)
-        print(mess)
-        token = createAccessToken(data={"sub": mess["userId"], "user": {"email": email, "fname": fname, "lname": lname}}, expires_delta=None)
-        response = RedirectResponse(url="/info", status_code=302)
-        response.set_cookie(
-            key="token",
-            value=token,
-            httponly=True,
-            secure=False,  # ⚠️ Use False locally if needed
-            samesite="Strict"
-        )
-        return response
-    except Exception as e:
-        return {"error": str(e)}
+    # "First Last"; anything after the first space is the last name
+    fname, _, lname = username.strip().partition(" ")
+    lname = lname.strip()
+    if not fname or not lname:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Please enter your first and last name")
+    # HTTPExceptions (e.g. 503 from a saturated hashing pool) propagate with their status
+    hashed_password = await auth.getPasswordHashAsync(password)
+    mess = await db.createUser(fname, lname, email, hashed_password)
+    if "userId" not in mess:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=mess.get("msg", "Failed to create user"))
+    response = RedirectResponse(url="/info", status_code=302)
+    return setAuthCookies(response, mess["userId"])
 
     
-@router.put("/updateUser/")
+@router.put("/updateUser/", response_model=UpdateUserResponse)
 async def updateUser(
-    request: Request,
+    data: dict = Depends(getCurrentUser),
     mobileNumber: str = Form(...),
     emergencyContactNumber: str = Form(...),
     birthDate: str = Form(...),
@@ -66,28 +59,13 @@ async def updateUser(
     country: str = Form(...),
     bloodGroup: str = Form(...),
     medicalConditions: Optional[str] = Form(""),  # Optional with default
-    allergies: Optional[str] = Form("")  # Optional with default
+    allergies: Optional[str] = Form(""),  # Optional with default
+    timezone: Optional[str] = Form(None),  # IANA name, e.g. "Europe/London"; unchanged when omitted
+    countryCode: Optional[str] = Form(None)  # e.g. "+44"; unchanged when omitted
 ):
-    # Validate token first
-    data = getCurrentUserFromCookie(request.cookies.get("token"))
-    if not data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Not authenticated - No token provided"
-        )
-    
-    # try:
-    #     data = getCurrentUserFromCookie(token)
-    # except Exception as e:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_401_UNAUTHORIZED, 
-    #         detail=f"Invalid token: {str(e)}"
-    #     )
-    
-    user = data.get("user")
     sub = data.get("sub")
     
-    if not user or not sub:
+    if not sub:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Not authenticated - Invalid user data"
@@ -106,6 +84,18 @@ async def updateUser(
             detail="Emergency contact number must be exactly 10 digits"
         )
 
+    if timezone and timezone not in pytz.all_timezones_set:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {timezone}"
+        )
+
+    if countryCode and not re.fullmatch(r"\+\d{1,4}", countryCode):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Country code must look like +91"
+        )
+
     # Convert pinCode to int and validate
     try:
         pin_code_int = int(pinCode)
@@ -118,7 +108,7 @@ async def updateUser(
         )
 
     try:
-        result = db.updateUser(
+        result = await db.updateUser(
             userId=sub,
             mobileNumber=mobileNumber,
             gender=gender,
@@ -131,17 +121,23 @@ async def updateUser(
             city=city,
             state=state,
             pinCode=pin_code_int,  # Pass as int
-            country=country
+            country=country,
+            timezone=timezone or None,
+            countryCode=countryCode or None
         )
         
-        print(f"Update result: {result}")
-        
         if "error" in result:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
                 detail=result["error"]
             )
         
+        # Reminders follow the user's (possibly new) phone number and timezone
+        profile = await db.getUserById(sub)
+        reminders = await db.getUserReminders(sub)
+        if profile and profile.get("mobileNumber") and isinstance(reminders, list) and reminders:
+            schedule_reminders(sub, user_phone(profile), reminders, profile.get("timezone"))
+        
         # Return JSON response instead of redirect for AJAX
         return {
             "success": True,
@@ -152,29 +148,14 @@ async def updateUser(
     except HTTPException:
         raise  # Re-raise HTTP exceptions
     except Exception as e:
-        print(f"Error updating user: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
             detail=f"Failed to update user information: {str(e)}"
         )
 
 
-@router.get("/info")
-async def getUserInfo(token: str = Cookie(None)):
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Not authenticated - No token provided"
-        )
-    
-    try:
-        data = getCurrentUserFromCookie(token)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail=f"Invalid token: {str(e)}"
-        )
-    
+@router.get("/info", response_model=DashboardResponse)
+async def getUserInfo(data: dict = Depends(getCurrentUser)):
     userId = data.get("sub")    
     if not userId:
         raise HTTPException(
@@ -182,33 +163,25 @@ async def getUserInfo(token: str = Cookie(None)):
             detail="Not authenticated - Invalid user data"
         )
     try:
-        user_info = db.getUserForDashboard(userId)
+        user_info = await db.getUserForDashboard(userId)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
             detail=f"Error retrieving user info: {str(e)}"
         )
+    if "error from database" in user_info:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail=f"Error retrieving user info: {user_info['error from database']}"
+        )
     # user_info = db.getUserForDashboard(userId)
     return user_info
 
 
-@router.get("/me")
-async def get_me(token: str = Cookie(None)):
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Not authenticated - No token provided"
-        )
-    
-    try:
-        data = getCurrentUserFromCookie(token)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail=f"Invalid token: {str(e)}"
-        )
-    
-    user = data.get("user")
+@router.get("/me", response_model=MeResponse)
+async def get_me(data: dict = Depends(getCurrentUser)):
+    # Profile fields are no longer carried in the token; this is a cached lookup
+    user = await db.getUserById(data["sub"])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
@@ -221,9 +194,68 @@ async def get_me(token: str = Cookie(None)):
         "lname": user.get("lname"),
     }
 
+@router.get("/preferences", response_model=NotificationPreferences)
+async def get_preferences(data: dict = Depends(getCurrentUser)):
+    user = await db.getUserById(data["sub"])
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return NotificationPreferences(
+        confirmationSms=bool(user.get("confirmationSms", True)),
+        confirmationCall=bool(user.get("confirmationCall", True))
+    )
+
+
+@router.put("/preferences", response_model=NotificationPreferences)
+async def update_preferences(preferences: NotificationPreferences, data: dict = Depends(getCurrentUser)):
+    result = await db.updateNotificationPreferences(
+        data["sub"], preferences.confirmationSms, preferences.confirmationCall
+    )
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=result["msg"])
+    return preferences
+
+
+async def _refreshedUser(refresh_token: Optional[str]):
+    if not refresh_token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated - No refresh token")
+    userId = verifyToken(refresh_token, typ="refresh")["sub"]
+    # Deleted accounts can't mint new access tokens
+    if not await db.getUserById(userId):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated - Invalid user data")
+    return userId
+
+
+@router.post("/refresh")
+async def refresh(refresh_token: Optional[str] = Cookie(None)):
+    """Issue a new access cookie from the refresh cookie (used by static/auth.js on 401)"""
+    userId = await _refreshedUser(refresh_token)
+    return setAuthCookies(Response(status_code=status.HTTP_204_NO_CONTENT), userId, refresh=False)
+
+
+def _localPath(next: str) -> str:
+    """`next` if it is a path on this site, else "/" (guards the post-login redirect)"""
+    # Browsers read "/\host" as "//host" and drop tabs/newlines, so neither is allowed anywhere
+    if not next.startswith("/") or "\\" in next or any(ord(ch) < 32 or ord(ch) == 127 for ch in next):
+        return "/"
+    parts = urlsplit(next)
+    if parts.scheme or parts.netloc or next.startswith("//"):
+        return "/"
+    return next
+
+
+@router.get("/refresh")
+async def refreshAndRedirect(next: str = "/", refresh_token: Optional[str] = Cookie(None)):
+    """Page variant: renew the access cookie and go back to `next`, or to the login page"""
+    next = _localPath(next)
+    try:
+        userId = await _refreshedUser(refresh_token)
+    except HTTPException:
+        return clearAuthCookies(RedirectResponse(url="/login", status_code=302))
+    return setAuthCookies(RedirectResponse(url=next, status_code=302), userId, refresh=False)
+
+
 @router.get("/logout")
 async def logout():
     response = RedirectResponse(url="/", status_code=302)
-    response.delete_cookie(key="token")
-    return response
+    return clearAuthCookies(response)
 
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Cookie, HTTPException
-from controller.auth import getCurrentUserFromCookie
-from models import database as db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from controller.auth import getCurrentUser
+from models import repository as db
 import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+import base64
+import json
 from scheduler import (
     schedule_multiple_times_reminder,
-    remove_reminder,
-    list_all_jobs
+    schedule_reminders,
+    reschedule_reminder,
+    cancel_reminder,
+    remove_reminders,
+    list_user_jobs,
+    user_phone
 )
+from reminder_engine import minute_of_day
 from twilio_service import twilio_service
+from dispatcher import dispatcher, sms_notification, call_notification
+from models.models import RemindersResponse, ReminderWriteResponse, ScheduledJobsResponse
 
 router = APIRouter(tags=["reminders"])
 
@@ -23,63 +32,137 @@ class MultipleReminderRequest(BaseModel):
     dosage: str
     times: List[str]
 
+class ReminderUpdateItem(BaseModel):
+    reminderId: str
+    medicineName: str
+    dosage: str
+    time: str
+
+class BulkUpdateRequest(BaseModel):
+    reminders: List[ReminderUpdateItem]
+
+class BulkDeleteRequest(BaseModel):
+    reminderIds: List[str]
+
 class TestSMSRequest(BaseModel):
     phone: str
     message: str
 
+def confirmations(user_details, message: str, speech: str = None) -> list:
+    """
+    CRUD confirmation notifications for the channels the user hasn't opted out of.
+    They are queued with the write and sent by the dispatcher's workers, never inline.
+    """
+    if not user_details or not user_details.get("mobileNumber"):
+        return []
+    phone = user_phone(user_details)
+    notifications = []
+    if user_details.get("confirmationSms", True):
+        notifications.append(sms_notification(phone, message))
+    if speech and user_details.get("confirmationCall", True):
+        notifications.append(call_notification(phone, speech))
+    return notifications
+
 # ==================== GET REMINDERS ====================
 
-@router.get("/")
+@router.get("/", response_model=RemindersResponse)
 async def get_reminders():
     """Get reminders for current time"""
     time = datetime.datetime.now().strftime("%H:%M")
-    reminder = db.getReminders(time)
-    return {"reminders": reminder}
-
-@router.get("/user")
-async def get_user_reminders(token: str = Cookie(None)):
-    """Get all reminders for logged-in user"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
+    reminder = await db.getReminders(time)
+    if not isinstance(reminder, list):
+        raise HTTPException(status_code=500, detail=reminder.get("msg", "Failed to get reminders"))
+    return {"reminders": reminder, "success": True}
+
+MAX_PAGE_SIZE = 500
+
+def _encodeCursor(row: dict) -> str:
+    """Opaque cursor for the position after `row`: its (minuteOfDay, reminderId) keyset"""
+    raw = json.dumps([row["minuteOfDay"], row["reminderId"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decodeCursor(cursor: str) -> tuple:
     try:
-        user = getCurrentUserFromCookie(token)
-        reminders = db.getUserReminders(user["sub"])
-        return {"reminders": reminders, "success": True}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        minute, reminder_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(minute, int) or not isinstance(reminder_id, str):
+            raise ValueError(cursor)
+        return minute, reminder_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _minuteParam(name: str, value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return minute_of_day(value)
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+
+@router.get("/user", response_model=RemindersResponse)
+async def get_user_reminders(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fromTime: Optional[str] = Query(None, description="HH:MM, inclusive"),
+    toTime: Optional[str] = Query(None, description="HH:MM, inclusive"),
+    medicine: Optional[str] = Query(None, max_length=100, description="substring of the medicine name"),
+    user: dict = Depends(getCurrentUser)
+):
+    """
+    The logged-in user's reminders ordered by time of day, one keyset page at
+    a time: pass the response's nextCursor back as `cursor` for the next page.
+    """
+    after = _decodeCursor(cursor) if cursor else None
+    page = await db.getUserRemindersPage(
+        user["sub"], limit, after=after,
+        fromMinute=_minuteParam("fromTime", fromTime),
+        toMinute=_minuteParam("toTime", toTime),
+        medicine=medicine
+    )
+    if "error" in page:
+        raise HTTPException(status_code=500, detail=page.get("msg", "Failed to get user reminders"))
+    reminders = page["reminders"]
+    return {
+        "reminders": reminders,
+        "success": True,
+        "nextCursor": _encodeCursor(reminders[-1]) if page["hasMore"] else None
+    }
 
 # ==================== ADD REMINDER WITH SMS ====================
 
-@router.post("/add")
-async def add_reminder(reminder: ReminderRequest, token: str = Cookie(None)):
+@router.post("/add", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
+async def add_reminder(reminder: ReminderRequest, user: dict = Depends(getCurrentUser)):
     """Add a reminder with SMS notification"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
+    _checkTimes([reminder.time])
     try:
-        user = getCurrentUserFromCookie(token)
         user_id = user["sub"]
         
         # Get user details
-        user_details = db.getUserById(user_id)
+        user_details = await db.getUserById(user_id)
         if not user_details:
             raise HTTPException(status_code=404, detail="User not found")
         
         mobile_number = user_details.get("mobileNumber")
         
+        # Confirmation SMS is queued in the same transaction as the reminder
+        notifications = confirmations(
+            user_details,
+            f"✅ Reminder created!\n\nMedicine: {reminder.medicineName}\nDosage: {reminder.dosage}\nTime: {reminder.time}\n\nYou'll receive SMS reminders."
+        )
+        
         # Save reminder to database
-        result = db.createReminder(
+        result = await db.createReminder(
             user_id,
             reminder.medicineName,
             reminder.dosage,
-            reminder.time
+            reminder.time,
+            notifications=dispatcher.outbox_rows(notifications)
         )
         print(f"Create reminder result: {result}")
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("msg", "Failed to create reminder"))
         
         reminder_id = result["reminderId"]
+        dispatcher.dispatch(notifications)
         
         # Schedule SMS if phone number exists
         job_ids = []
@@ -90,18 +173,13 @@ async def add_reminder(reminder: ReminderRequest, token: str = Cookie(None)):
                 job_ids = schedule_multiple_times_reminder(
                     reminder_id=reminder_id,
                     user_id=user_id,
-                    user_phone=str(mobile_number),
+                    user_phone=user_phone(user_details),
                     medicine_name=reminder.medicineName,
                     dosage=reminder.dosage,
-                    times_list=[reminder.time]
+                    times_list=[reminder.time],
+                    timezone=user_details.get("timezone")
                 )
                 sms_scheduled = True
-                
-                # Send confirmation SMS
-                twilio_service.send_sms(
-                    to_phone=str(mobile_number),
-                    message=f"✅ Reminder created!\n\nMedicine: {reminder.medicineName}\nDosage: {reminder.dosage}\nTime: {reminder.time}\n\nYou'll receive SMS reminders."
-                )
             except Exception as sms_error:
                 print(f"⚠️ SMS scheduling failed: {sms_error}")
         
@@ -119,111 +197,237 @@ async def add_reminder(reminder: ReminderRequest, token: str = Cookie(None)):
         print(f"Error adding reminder: {e} ")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== BULK REMINDERS ====================
+
+MAX_BULK_REMINDERS = 100
+
+def _checkBulk(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="No reminders given")
+    if len(items) > MAX_BULK_REMINDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_REMINDERS} reminders per request")
+
+def _checkTimes(times: list):
+    for time in times:
+        try:
+            minute_of_day(time)
+        except (ValueError, AttributeError):
+            raise HTTPException(status_code=400, detail=f"Invalid time: {time}")
+
+async def _ownedReminders(user_id: str, reminder_ids: list) -> dict:
+    """The user's reminders among `reminder_ids`, read uncached so a stale list can't pass; 404 if any is missing"""
+    reminders = await db.getUserRemindersByIds(user_id, reminder_ids)
+    if not isinstance(reminders, list):
+        raise HTTPException(status_code=500, detail=reminders.get("msg", "Failed to get user reminders"))
+    owned = {r["reminderId"]: r for r in reminders}
+    missing = [reminder_id for reminder_id in reminder_ids if reminder_id not in owned]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Reminders not found: {', '.join(missing)}")
+    return owned
+
+@router.post("/add-multiple", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
+async def add_multiple_reminders(reminder: MultipleReminderRequest, user: dict = Depends(getCurrentUser)):
+    """Add one medicine at several times a day: one INSERT, one scheduler call, one confirmation SMS"""
+    times = list(dict.fromkeys(reminder.times))
+    _checkBulk(times)
+    _checkTimes(times)
+    user_id = user["sub"]
+
+    user_details = await db.getUserById(user_id)
+    if not user_details:
+        raise HTTPException(status_code=404, detail="User not found")
+    mobile_number = user_details.get("mobileNumber")
+
+    notifications = confirmations(
+        user_details,
+        f"✅ Reminders created!\n\nMedicine: {reminder.medicineName}\nDosage: {reminder.dosage}\nTimes: {', '.join(times)}\n\nYou'll receive SMS reminders."
+    )
+
+    rows = [{"medicineName": reminder.medicineName, "dosage": reminder.dosage, "time": time} for time in times]
+    result = await db.createReminders(user_id, rows, notifications=dispatcher.outbox_rows(notifications))
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("msg", "Failed to create reminders"))
+    dispatcher.dispatch(notifications)
+
+    job_ids = []
+    sms_scheduled = False
+    if mobile_number:
+        for row, reminder_id in zip(rows, result["reminderIds"]):
+            row["reminderId"] = reminder_id
+        try:
+            job_ids = schedule_reminders(user_id, user_phone(user_details), rows, user_details.get("timezone"))
+            sms_scheduled = True
+        except Exception as sms_error:
+            print(f"⚠️ SMS scheduling failed: {sms_error}")
+
+    return {
+        "success": True,
+        "message": f"{len(rows)} reminders added successfully",
+        "reminder_ids": result["reminderIds"],
+        "sms_scheduled": sms_scheduled,
+        "job_ids": job_ids
+    }
+
+@router.put("/update-multiple", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
+async def update_multiple_reminders(request: BulkUpdateRequest, user: dict = Depends(getCurrentUser)):
+    """Update several reminders: one UPDATE, one scheduler call, one confirmation SMS"""
+    items = list({item.reminderId: item for item in request.reminders}.values())
+    _checkBulk(items)
+    _checkTimes([item.time for item in items])
+    user_id = user["sub"]
+    await _ownedReminders(user_id, [item.reminderId for item in items])
+
+    user_details = await db.getUserById(user_id)
+    mobile_number = user_details.get("mobileNumber") if user_details else None
+
+    lines = "\n".join(f"• {item.medicineName} - {item.dosage} at {item.time}" for item in items)
+    notifications = confirmations(user_details, f"✏️ Reminders updated!\n\n{lines}")
+
+    rows = [item.model_dump() for item in items]
+    result = await db.updateReminders(user_id, rows, notifications=dispatcher.outbox_rows(notifications))
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("msg", "Failed to update reminders"))
+    dispatcher.dispatch(notifications)
+
+    # Each reminder's job set is replaced, diffing old and new times
+    job_ids = []
+    if mobile_number:
+        try:
+            job_ids = schedule_reminders(user_id, user_phone(user_details), rows, user_details.get("timezone"))
+        except Exception as sms_error:
+            print(f"⚠️ SMS rescheduling failed: {sms_error}")
+
+    return {
+        "success": True,
+        "message": f"{len(rows)} reminders updated successfully",
+        "job_ids": job_ids
+    }
+
+@router.delete("/delete-multiple", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
+async def delete_multiple_reminders(request: BulkDeleteRequest, user: dict = Depends(getCurrentUser)):
+    """Delete several reminders: one DELETE, one scheduler call, one confirmation SMS"""
+    reminder_ids = list(dict.fromkeys(request.reminderIds))
+    _checkBulk(reminder_ids)
+    user_id = user["sub"]
+    owned = await _ownedReminders(user_id, reminder_ids)
+
+    user_details = await db.getUserById(user_id)
+    medicines = ", ".join(dict.fromkeys(r["medicineName"] for r in owned.values()))
+    notifications = confirmations(
+        user_details,
+        f"❌ Reminders deleted\n\nMedicines: {medicines}\n\nSMS notifications cancelled."
+    )
+
+    result = await db.deleteReminders(user_id, reminder_ids, notifications=dispatcher.outbox_rows(notifications))
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("msg", "Failed to delete reminders"))
+    dispatcher.dispatch(notifications)
+    jobs_removed = remove_reminders(reminder_ids)
+
+    return {
+        "success": True,
+        "message": f"{result['deleted']} reminders deleted successfully",
+        "jobs_removed": jobs_removed
+    }
+
 # ==================== DELETE REMINDER ====================
 
-@router.delete("/delete/{reminderId}")
-async def delete_reminder(reminderId: str, token: str = Cookie(None)):
+@router.delete("/delete/{reminderId}", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
+async def delete_reminder(reminderId: str, user: dict = Depends(getCurrentUser)):
     """Delete reminder and cancel scheduled SMS"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    try:
-        user = getCurrentUserFromCookie(token)
-        
-        # Get reminder details
-        reminder_details = db.getReminderById(reminderId)
-        
-        # Remove scheduled jobs (try multiple formats)
-        jobs_removed = 0
-        for i in range(10):
-            if remove_reminder(f"reminder_{reminderId}_{i}"):
-                jobs_removed += 1
-        
-        # Delete from database
-        result = db.deleteReminder(reminderId)
-        
-        # Send confirmation SMS
-        user_details = db.getUserById(user["sub"])
-        if user_details and user_details.get("mobileNumber"):
-            try:
-                twilio_service.send_sms(
-                    to_phone=str(user_details["mobileNumber"]),
-                    message=f"❌ Reminder deleted\n\nMedicine: {reminder_details.get('medicineName', 'N/A') if reminder_details else 'N/A'}\n\nSMS notifications cancelled."
-                )
-            except Exception as sms_error:
-                print(f"⚠️ Confirmation SMS failed: {sms_error}")
-        
-        return {
-            "success": True,
-            "message": "Reminder deleted successfully",
-            "jobs_removed": jobs_removed,
-            "result": result
-        }
-        
-    except Exception as e:
-        print(f"Error deleting reminder: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    user_id = user["sub"]
+    reminder_details = await db.getReminderById(reminderId)
+    if not reminder_details or reminder_details.get("userId") != user_id:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+
+    # Confirmation SMS is queued in the same transaction as the delete
+    user_details = await db.getUserById(user_id)
+    notifications = confirmations(
+        user_details,
+        f"❌ Reminder deleted\n\nMedicine: {reminder_details.get('medicineName') or 'N/A'}\n\nSMS notifications cancelled."
+    )
+
+    # Scoped to the caller, so only their own row can be deleted
+    result = await db.deleteReminder(
+        reminderId,
+        notifications=dispatcher.outbox_rows(notifications),
+        userId=user_id
+    )
+    if "error" in result:
+        # The row is still there, so its jobs must keep firing
+        raise HTTPException(status_code=500, detail=result.get("msg", "Failed to delete reminder"))
+    if not result["deleted"]:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    dispatcher.dispatch(notifications)
+
+    # Remove exactly this reminder's scheduled jobs
+    jobs_removed = cancel_reminder(reminderId)
+
+    return {
+        "success": True,
+        "message": "Reminder deleted successfully",
+        "jobs_removed": jobs_removed,
+        "result": result
+    }
 
 # ==================== UPDATE REMINDER ====================
 
-@router.put("/update/{reminderId}")
+@router.put("/update/{reminderId}", response_model=ReminderWriteResponse, response_model_exclude_unset=True)
 async def update_reminder(
     reminderId: str,
     reminder: ReminderRequest,
-    token: str = Cookie(None)
+    user: dict = Depends(getCurrentUser)
 ):
     """Update reminder and reschedule SMS"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
+    _checkTimes([reminder.time])
     try:
-        user = getCurrentUserFromCookie(token)
         user_id = user["sub"]
         
         # Get user details
-        user_details = db.getUserById(user_id)
+        user_details = await db.getUserById(user_id)
         
-        # Remove old scheduled jobs
-        for i in range(10):
-            remove_reminder(f"reminder_{reminderId}_{i}")
+        # Confirmation SMS and call are queued in the same transaction as the update
+        notifications = confirmations(
+            user_details,
+            f"✏️ Reminder updated!\n\nMedicine: {reminder.medicineName}\nDosage: {reminder.dosage}\nNew time: {reminder.time}",
+            speech=twilio_service.reminders_speech(
+                [{"medicine_name": reminder.medicineName, "dosage": reminder.dosage}], reminder.time
+            )
+        )
         
         # Update in database
-        result = db.updateReminder(
+        result = await db.updateReminder(
             reminderId,
             reminder.medicineName,
             reminder.dosage,
-            reminder.time
+            reminder.time,
+            notifications=dispatcher.outbox_rows(notifications),
+            userId=user_id
         )
         
         if not result.get("success"):
             raise HTTPException(status_code=500, detail=result.get("msg"))
+        if not result["updated"]:
+            # Not this caller's reminder (or no such id): nothing changed, so nothing is scheduled
+            raise HTTPException(status_code=404, detail="Reminder not found")
+        dispatcher.dispatch(notifications)
         
-        # Reschedule with new time
+        # Reschedule with new time; an unchanged time keeps its job
         if user_details and user_details.get("mobileNumber"):
             try:
-                schedule_multiple_times_reminder(
+                reschedule_reminder(
                     reminder_id=reminderId,
                     user_id=user_id,
-                    user_phone=str(user_details["mobileNumber"]),
+                    user_phone=user_phone(user_details),
                     medicine_name=reminder.medicineName,
                     dosage=reminder.dosage,
-                    times_list=[reminder.time]
+                    times_list=[reminder.time],
+                    timezone=user_details.get("timezone")
                 )
-                
-                # Send confirmation SMS
-                twilio_service.send_sms(
-                    to_phone=str(user_details["mobileNumber"]),
-                    message=f"✏️ Reminder updated!\n\nMedicine: {reminder.medicineName}\nDosage: {reminder.dosage}\nNew time: {reminder.time}"
-                )
-
-                twilio_service.send_medicine_reminder_call(
-                    to_phone=str(user_details["mobileNumber"]),
-                    medicine_name=reminder.medicineName,
-                    dosage=reminder.dosage,
-                    time=reminder.time
-            )
             except Exception as sms_error:
                 print(f"⚠️ SMS rescheduling failed: {sms_error}")
+        else:
+            cancel_reminder(reminderId)
         
         return {
             "success": True,
@@ -231,6 +435,8 @@ async def update_reminder(
             "result": result
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error updating reminder: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -238,31 +444,23 @@ async def update_reminder(
 # ==================== TEST ENDPOINTS ====================
 
 @router.post("/test-sms")
-async def test_sms(data: TestSMSRequest, token: str = Cookie(None)):
+async def test_sms(data: TestSMSRequest, user: dict = Depends(getCurrentUser)):
     """Test SMS sending"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    result = twilio_service.send_sms(data.phone, data.message)
+    result = await twilio_service.send_sms_async(data.phone, data.message)
     return result
 
 @router.post("/test-reminder-sms")
-async def test_reminder_sms(token: str = Cookie(None)):
+async def test_reminder_sms(user: dict = Depends(getCurrentUser)):
     """Send test reminder SMS to logged-in user"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
     try:
-        user = getCurrentUserFromCookie(token)
-        user_details = db.getUserById(user["sub"])
+        user_details = await db.getUserById(user["sub"])
         
         if not user_details or not user_details.get("mobileNumber"):
             raise HTTPException(status_code=400, detail="Phone number not found")
         
-        result = twilio_service.send_medicine_reminder(
-            to_phone=str(user_details["mobileNumber"]),
-            medicine_name="Test Medicine",
-            dosage="100mg",
+        result = await twilio_service.send_medicine_reminders_async(
+            to_phone=user_phone(user_details),
+            reminders=[{"medicine_name": "Test Medicine", "dosage": "100mg"}],
             time=datetime.datetime.now().strftime("%H:%M")
         )
         
@@ -275,13 +473,14 @@ async def test_reminder_sms(token: str = Cookie(None)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/scheduled")
-async def get_scheduled_jobs(token: str = Cookie(None)):
-    """Get all scheduled SMS jobs"""
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    jobs = list_all_jobs()
+@router.get("/scheduled", response_model=ScheduledJobsResponse)
+async def get_scheduled_jobs(user: dict = Depends(getCurrentUser)):
+    """The logged-in user's scheduled SMS jobs, soonest first"""
+    try:
+        jobs = await db.run(list_user_jobs, user["sub"])
+    except Exception as e:
+        print(f"Error listing scheduled jobs: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list scheduled jobs")
     return {
         "success": True,
         "count": len(jobs),
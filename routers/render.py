@@ -1,20 +1,31 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Depends
+from fastapi.responses import RedirectResponse
+from urllib.parse import quote
 from controller import auth
 from fastapi.templating import Jinja2Templates
+from typing import Optional
+from models import repository as db
+from models.models import DashboardResponse
+import assets
 
 template = Jinja2Templates(directory="templates")
+template.env.globals["asset_url"] = assets.asset_url
 router = APIRouter(tags=["render"])
 
+def refreshSession(request: Request):
+    # An expired access cookie is renewed from the refresh cookie, which is only sent to /api/refresh
+    return RedirectResponse(url=f"/api/refresh?next={quote(request.url.path)}", status_code=302)
+
+def loginRequired(request: Request):
+    if request.cookies.get("token"):
+        return refreshSession(request)
+    return template.TemplateResponse("login.html", {"request": request, "error": "Please log in to access this page."})
+
 @router.get("/")
-async def home(request: Request):
+async def home(request: Request, user: Optional[dict] = Depends(auth.getOptionalUser)):
     # Check if user is authenticated
-    user = None
-    try:
-        user = auth.getCurrentUserFromCookie(request.cookies.get("token"))
-        return template.TemplateResponse("index.html", {"request": request, "user": user["user"]})
-    except Exception as e:
-        print(e)
-        user = None
+    if not user and request.cookies.get("token"):
+        return refreshSession(request)
     return template.TemplateResponse("index.html", {"request": request, "user": user})
 
 @router.get("/login")
@@ -26,32 +37,35 @@ async def register(request: Request):
     return template.TemplateResponse("register.html", {"request": request})
 
 @router.get("/info")
-async def info(request: Request):
-    try:
-        user = auth.getCurrentUserFromCookie(request.cookies.get("token"))
-    except Exception as e:
-        print(e)
-        return template.TemplateResponse("login.html", {"request": request, "error": "Please log in to access this page."})
+async def info(request: Request, user: Optional[dict] = Depends(auth.getOptionalUser)):
+    if not user:
+        return loginRequired(request)
     return template.TemplateResponse("user_form.html", {"request": request, "user": user})
 
-@router.get("/Dashboard")
-async def dashboard(request: Request):
-    try:
-        user = auth.getCurrentUserFromCookie(request.cookies.get("token"))
-        
-    except Exception as e:
-        print(e)
-        return template.TemplateResponse("login.html", {"request": request, "error": "Please log in to access this page."})
-    return template.TemplateResponse("dashboard.html", {"request": request, "user": user})
-
-@router.get("/Reminders")
-async def reminders(request: Request):
+async def initialData(userId: str) -> Optional[dict]:
+    """
+    Same payload as GET /api/info, embedded in the page so it renders without
+    extra API round trips. None makes the page fall back to fetching it.
+    """
     try:
-        user = auth.getCurrentUserFromCookie(request.cookies.get("token"))
+        info = await db.getUserForDashboard(userId)
     except Exception as e:
-        print(e)
-        return template.TemplateResponse("login.html", {"request": request, "error": "Please log in to access this page."})
-    return template.TemplateResponse("reminder.html", {"request": request, "user": user})
-
+        print(f"⚠️ Could not load initial page data: {e}")
+        return None
+    if "error from database" in info or not info.get("user"):
+        return None
+    return DashboardResponse.model_validate(info).model_dump(mode="json")
 
+@router.get("/Dashboard")
+async def dashboard(request: Request, user: Optional[dict] = Depends(auth.getOptionalUser)):
+    if not user:
+        return loginRequired(request)
+    initial = await initialData(user["sub"])
+    return template.TemplateResponse("dashboard.html", {"request": request, "user": user, "initial": initial})
 
+@router.get("/Reminders")
+async def reminders(request: Request, user: Optional[dict] = Depends(auth.getOptionalUser)):
+    if not user:
+        return loginRequired(request)
+    initial = await initialData(user["sub"])
+    return template.TemplateResponse("reminder.html", {"request": request, "user": user, "initial": initial})
@@ -1,15 +1,78 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
 from twilio_service import twilio_service
+from dispatcher import dispatcher, reminder_notifications
+from reminder_engine import ReminderEngine, minute_of_day
+from leader import LeaseElector
 from models import database as db
+from config import settings
+import metrics
 
-# Initialize scheduler
-scheduler = BackgroundScheduler(timezone=pytz.timezone('Asia/Kolkata'))
+# Initialize scheduler; the tick runs on UTC and each reminder fires at its user's local time
+scheduler = BackgroundScheduler(timezone=pytz.utc)
+
+# Reminders are indexed by (timezone, local minute-of-day); a single per-minute tick job fires each bucket
+engine = ReminderEngine()
+TICK_JOB_ID = "reminder_tick"
+LEASE_JOB_ID = "scheduler_lease"
+MAX_CATCH_UP_MINUTES = 15
+
+_tick_lock = threading.Lock()
+_last_fired_minute = None  # last UTC minute processed
+_last_local_minute = {}    # timezone -> (UTC minute, local wall-clock minute) of its last tick
+
+
+@lru_cache(maxsize=1024)
+def get_zone(name: str):
+    """pytz zone for a stored timezone name; unknown names fall back to DEFAULT_TIMEZONE"""
+    try:
+        return pytz.timezone(name or settings.DEFAULT_TIMEZONE)
+    except pytz.UnknownTimeZoneError:
+        return pytz.timezone(settings.DEFAULT_TIMEZONE)
+
+
+def zone_name(name: str) -> str:
+    return get_zone(name).zone
+
+
+def user_phone(user: dict) -> str:
+    """E.164 number for a USERS row (mobileNumber plus the user's countryCode)"""
+    return twilio_service.format_phone(user["mobileNumber"], user.get("countryCode"))
+
+# With several uvicorn workers only the lease holder fires reminders
+elector = LeaseElector("reminders", settings.SCHEDULER_LEASE_TTL, enabled=settings.SCHEDULER_LEADER_ELECTION)
 
 def start_scheduler():
     """Start the scheduler"""
     if not scheduler.running:
+        scheduler.add_job(
+            func=_tick,
+            trigger=CronTrigger(second=0),
+            id=TICK_JOB_ID,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=30,
+            name="Reminder minute tick"
+        )
+        if elector.enabled:
+            if settings.SCHEDULER_JOB_STORE != "database":
+                print("⚠️ Leader election without SCHEDULER_JOB_STORE=database: reminders created on other workers won't fire")
+            elector.renew()
+            scheduler.add_job(
+                func=elector.renew,
+                trigger="interval",
+                seconds=max(settings.SCHEDULER_LEASE_TTL // 3, 1),
+                id=LEASE_JOB_ID,
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+                name="Scheduler lease renewal"
+            )
         scheduler.start()
         print("✅ Scheduler started successfully!")
 
@@ -17,6 +80,7 @@ def shutdown_scheduler():
     """Shutdown the scheduler"""
     if scheduler.running:
         scheduler.shutdown()
+        elector.release()
         print("⏹️ Scheduler stopped!")
 
 def send_reminder_notification(user_id: str, user_phone: str, medicine_name: str, 
@@ -55,75 +119,330 @@ def send_reminder_notification(user_id: str, user_phone: str, medicine_name: str
         return {"success": False, "error": str(e)}
 
 
+def _active_zones() -> list:
+    """Timezones that have reminders, from the configured job store"""
+    if settings.SCHEDULER_JOB_STORE == "database":
+        return db.getReminderTimezones()
+    return engine.zones()
+
+
+def _due_reminders(slots: list) -> list:
+    """(job_id, reminder) pairs due at any (timezone, local minute) slot, from the configured job store"""
+    if settings.SCHEDULER_JOB_STORE == "database":
+        return [
+            (reminder_job_id(row["reminderId"], minute_of_day(row["time"])), _job_entry(
+                row["reminderId"], row["userId"], user_phone(row),
+                row["medicineName"], row["dosage"], row["time"], row["timezone"]
+            ))
+            for row in db.getDueReminders(slots)
+        ]
+    return [pair for slot in slots for pair in engine.due(slot)]
+
+
+def _local_minutes(zone: str, tick: datetime) -> list:
+    """
+    Local wall-clock minutes of `zone` that are due at UTC minute `tick`
+    (call under _tick_lock). Normally exactly one. Across a DST spring-forward
+    the skipped local hour is included, so those reminders fire at the jump;
+    across a fall-back the repeated hour yields nothing, so they fire once.
+    """
+    local = tick.astimezone(get_zone(zone)).replace(tzinfo=None)
+    previous = _last_local_minute.get(zone)
+    if previous is None or previous[0] != tick - timedelta(minutes=1):
+        # Zone just became active, or the ticks before this one were skipped
+        minutes = [local]
+        latest = local
+    else:
+        minutes = []
+        minute = previous[1] + timedelta(minutes=1)
+        while minute <= local:
+            minutes.append(minute)
+            minute += timedelta(minutes=1)
+        latest = max(local, previous[1])
+    _last_local_minute[zone] = (tick, latest)
+    return minutes
+
+
+def _tick():
+    with metrics.scheduler_tick_duration.time():
+        fire_due_reminders()
+
+
+def fire_due_reminders(now: datetime = None):
+    """
+    Per-minute tick: for each timezone in use, hand every reminder in the
+    bucket for that zone's current local minute to the dispatcher.
+    Minutes skipped because the tick ran late are caught up. The cursor only
+    moves past a minute once its reminders have been handed off, so a minute
+    whose lookup failed is retried on the next tick.
+    """
+    global _last_fired_minute
+    now = (now or datetime.now(pytz.utc)).astimezone(pytz.utc)
+    current = now.replace(second=0, microsecond=0)
+
+    # Held for the whole tick: a concurrent tick must not fire a minute that isn't recorded yet
+    with _tick_lock:
+        if _last_fired_minute is None or current - _last_fired_minute > timedelta(minutes=MAX_CATCH_UP_MINUTES):
+            minutes = [current]
+        else:
+            minutes = []
+            minute = _last_fired_minute + timedelta(minutes=1)
+            while minute <= current:
+                minutes.append(minute)
+                minute += timedelta(minutes=1)
+
+        # Followers keep advancing their clock so a takeover doesn't replay old minutes
+        if not elector.is_leader:
+            _last_fired_minute = max(current, _last_fired_minute or current)
+            _last_local_minute.clear()
+            return 0
+
+        # The first tick's minute is retried like any other if it fails
+        _last_fired_minute = _last_fired_minute or minutes[0] - timedelta(minutes=1)
+        fired = 0
+        try:
+            zones = _active_zones()
+            for scheduled_at in minutes:
+                local_state = dict(_last_local_minute)
+                slots = [
+                    (zone, local.hour * 60 + local.minute)
+                    for zone in zones
+                    for local in _local_minutes(zone, scheduled_at)
+                ]
+                try:
+                    due = _due_reminders(slots)
+                except Exception:
+                    # Rewind the zones' wall clocks too, so the retry computes the same slots
+                    _last_local_minute.clear()
+                    _last_local_minute.update(local_state)
+                    raise
+                fired += _hand_off(due, scheduled_at)
+                _last_fired_minute = scheduled_at
+        except Exception as e:
+            retry = _last_fired_minute + timedelta(minutes=1)
+            print(f"⚠️ Reminder tick failed, retrying from {retry.strftime('%H:%M')} UTC next tick: {e}")
+
+    if fired:
+        print(f"⏰ Fired {fired} reminders for {current.strftime('%H:%M')} UTC")
+    return fired
+
+
+def _hand_off(due: list, scheduled_at: datetime) -> int:
+    """Send one minute's due (job_id, reminder) pairs to the outbox or dispatcher; returns the count"""
+    # Coalesce: everything due for one number in this minute goes out as one SMS and one call
+    by_phone = {}
+    for job_id, reminder in due:
+        by_phone.setdefault(reminder["user_phone"], []).append(reminder)
+
+    if settings.NOTIFICATION_OUTBOX and by_phone:
+        # Durable path: one multi-row insert for the whole bucket, then wake the drainer
+        try:
+            db.enqueueNotifications([
+                row for reminders in by_phone.values()
+                for row in reminder_notifications(reminders, scheduled_at)
+            ])
+            dispatcher.wake()
+            count = sum(len(reminders) for reminders in by_phone.values())
+            metrics.reminders_fired.inc(count, path="outbox")
+            return count
+        except Exception as e:
+            print(f"⚠️ Outbox enqueue failed, sending directly: {e}")
+
+    fired = 0
+    for phone, reminders in by_phone.items():
+        if dispatcher.submit(reminders, scheduled_at):
+            metrics.reminders_fired.inc(len(reminders), path="dispatcher")
+        else:
+            metrics.reminders_fired.inc(len(reminders), path="inline")
+            for reminder in reminders:
+                send_reminder_notification(
+                    reminder["user_id"], reminder["user_phone"],
+                    reminder["medicine_name"], reminder["dosage"], reminder["time"]
+                )
+        fired += len(reminders)
+    return fired
+
+
+def _job_entry(reminder_id, user_id, user_phone, medicine_name, dosage, time_str, timezone=None) -> dict:
+    return {
+        "reminder_id": reminder_id,
+        "user_id": user_id,
+        "user_phone": str(user_phone),
+        "medicine_name": medicine_name,
+        "dosage": dosage,
+        "time": time_str,
+        "timezone": zone_name(timezone)
+    }
+
+
+def reminder_job_id(reminder_id: str, minute: int) -> str:
+    """Job ids name the slot, e.g. reminder_<id>_0830, so unchanged times keep their job"""
+    return f"reminder_{reminder_id}_{minute // 60:02d}{minute % 60:02d}"
+
+
+def _reminder_jobs(reminder_id, user_id, user_phone, medicine_name, dosage, times_list, timezone=None) -> list:
+    """(job_id, (timezone, minute), entry) items; times are the user's local wall-clock times"""
+    zone = zone_name(timezone)
+    items = []
+    for time_str in times_list:
+        minute = minute_of_day(time_str)
+        items.append((
+            reminder_job_id(reminder_id, minute),
+            (zone, minute),
+            _job_entry(reminder_id, user_id, user_phone, medicine_name, dosage, time_str, zone)
+        ))
+    return items
+
+
 def schedule_multiple_times_reminder(reminder_id: str, user_id: str, user_phone: str,
-                                     medicine_name: str, dosage: str, times_list: list):
+                                     medicine_name: str, dosage: str, times_list: list, timezone: str = None):
     """
     Schedule a reminder at multiple times per day
     times_list: ["08:00", "14:00", "20:00"]
     """
     job_ids = []
     
-    for i, time_str in enumerate(times_list):
+    for time_str in times_list:
         try:
-            hour, minute = map(int, time_str.split(':'))
-            job_id = f"reminder_{reminder_id}_{i}"
-            
-            scheduler.add_job(
-                func=send_reminder_notification,
-                trigger=CronTrigger(hour=hour, minute=minute),
-                args=[user_id, user_phone, medicine_name, dosage, time_str],
-                id=job_id,
-                replace_existing=True,
-                name=f"{medicine_name} at {time_str}"
-            )
-            
-            job_ids.append(job_id)
-            print(f"✅ Scheduled reminder {job_id} at {time_str}")
+            items = _reminder_jobs(reminder_id, user_id, user_phone, medicine_name, dosage, [time_str], timezone)
+            engine.add_many(items)
+            job_ids.append(items[0][0])
+            print(f"✅ Scheduled reminder {items[0][0]} at {time_str}")
         except Exception as e:
-            print(f"❌ Error scheduling reminder {job_id}: {e}")
+            print(f"❌ Error scheduling reminder {reminder_id} at {time_str}: {e}")
     
     return job_ids
 
+def reschedule_reminder(reminder_id: str, user_id: str, user_phone: str,
+                        medicine_name: str, dosage: str, times_list: list, timezone: str = None) -> dict:
+    """
+    Atomically make `times_list` the reminder's schedule. Old and new times are
+    diffed: unchanged slots stay registered, only dropped/new ones are touched.
+    Returns {"added": [...], "removed": [...], "kept": [...]} job ids.
+    """
+    result = engine.replace(
+        reminder_id, _reminder_jobs(reminder_id, user_id, user_phone, medicine_name, dosage, times_list, timezone)
+    )
+    print(f"🔁 Rescheduled reminder {reminder_id}: "
+          f"{len(result['added'])} added, {len(result['removed'])} removed, {len(result['kept'])} kept")
+    return result
+
+def cancel_reminder(reminder_id: str) -> int:
+    """Remove every scheduled job of a reminder; returns how many were removed"""
+    removed = engine.cancel(reminder_id)
+    if removed:
+        print(f"❌ Cancelled reminder {reminder_id} ({len(removed)} jobs)")
+    return len(removed)
+
+def schedule_reminders(user_id: str, user_phone: str, reminders: list, timezone: str = None) -> list:
+    """
+    Reschedule a batch of one user's reminders in a single engine call
+    reminders: [{"reminderId": ..., "medicineName": ..., "dosage": ..., "time": "HH:MM"}, ...]
+    """
+    groups = {
+        r["reminderId"]: _reminder_jobs(r["reminderId"], user_id, user_phone, r["medicineName"], r["dosage"], [r["time"]], timezone)
+        for r in reminders
+    }
+    engine.replace_many(groups)
+    print(f"✅ Scheduled {len(groups)} reminders for user {user_id}")
+    return [job_id for items in groups.values() for job_id, _, _ in items]
+
+def remove_reminders(reminder_ids: list) -> int:
+    """Cancel several reminders in a single engine call"""
+    removed = engine.cancel_many(reminder_ids)
+    if removed:
+        print(f"❌ Removed {removed} reminder jobs")
+    return removed
+
 def remove_reminder(job_id: str):
     """Remove a scheduled job"""
-    try:
-        scheduler.remove_job(job_id)
+    if engine.remove(job_id):
         print(f"❌ Removed reminder {job_id}")
         return True
-    except Exception as e:
-        print(f"⚠️ Error removing job {job_id}: {e}")
-        return False
+    return False
+
+def _next_run_time(slot: tuple, now: datetime) -> datetime:
+    zone, minute = slot
+    tz = get_zone(zone)
+    local = now.astimezone(tz).replace(tzinfo=None)
+    run_time = local.replace(hour=minute // 60, minute=minute % 60, second=0, microsecond=0)
+    if run_time <= local:
+        run_time += timedelta(days=1)
+    return tz.localize(run_time)
+
+def _job_listing(job_id: str, slot: tuple, reminder: dict, now: datetime) -> dict:
+    return {
+        "id": job_id,
+        "name": f"{reminder['medicine_name']} at {reminder['time']}",
+        "next_run_time": _next_run_time(slot, now).strftime("%Y-%m-%d %H:%M:%S %Z")
+    }
 
 def list_all_jobs():
-    """Get all scheduled jobs"""
-    jobs = scheduler.get_jobs()
-    return [
-        {
-            "id": job.id,
-            "name": job.name,
-            "next_run_time": job.next_run_time.strftime("%Y-%m-%d %H:%M:%S") if job.next_run_time else None
-        }
-        for job in jobs
-    ]
-
-def load_existing_reminders():
-    """Load all existing reminders from database on startup"""
+    """Get all scheduled jobs (every user; for operators, not the API)"""
+    now = datetime.now(pytz.utc)
+    return [_job_listing(job_id, slot, reminder, now) for job_id, slot, reminder in engine.all_jobs()]
+
+def _user_jobs(user_id: str) -> list:
+    """(job_id, slot, reminder) for one user's jobs, from the configured job store"""
+    if settings.SCHEDULER_JOB_STORE == "database":
+        # The engine isn't hydrated in this mode, so every worker answers from the same rows the tick reads
+        return [
+            (reminder_job_id(row["reminderId"], row["minuteOfDay"]), (zone_name(row["timezone"]), row["minuteOfDay"]), _job_entry(
+                row["reminderId"], row["userId"], user_phone(row),
+                row["medicineName"], row["dosage"], row["time"], row["timezone"]
+            ))
+            for row in db.getUserDueReminders(user_id)
+        ]
+    return engine.user_jobs(user_id)
+
+def list_user_jobs(user_id: str) -> list:
+    """One user's scheduled jobs, soonest first (blocking: reads the database with the database job store)"""
+    now = datetime.now(pytz.utc)
+    jobs = sorted(
+        ((_next_run_time(slot, now), job_id, slot, reminder) for job_id, slot, reminder in _user_jobs(user_id)),
+        key=lambda item: (item[0], item[1])
+    )
+    return [_job_listing(job_id, slot, reminder, now) for _, job_id, slot, reminder in jobs]
+
+# Startup hydration progress, exposed on /health as the readiness signal
+hydration = {"state": "pending", "loaded": 0, "skipped": 0, "error": None}
+
+def load_existing_reminders(batch_size: int = None):
+    """
+    Load all existing reminders from database on startup.
+    Rows are streamed in keyset-paginated batches and registered in bulk.
+    """
+    batch_size = batch_size or settings.HYDRATION_BATCH_SIZE
+    if settings.SCHEDULER_JOB_STORE == "database":
+        # Due reminders are read from the database on every tick; nothing to rebuild
+        hydration.update(state="ready", loaded=0, skipped=0, error=None)
+        return 0
+    hydration.update(state="running", loaded=0, skipped=0, error=None)
+    print("📋 Loading existing reminders...")
+
+    # Requests may create, reschedule or delete reminders while this runs; their writes win
+    engine.track_changes()
     try:
-        reminders = db.getAllActiveReminders()
-        print(f"📋 Loading {len(reminders)} existing reminders...")
-        
-        for reminder in reminders:
-            schedule_multiple_times_reminder(
-                reminder_id=reminder["reminderId"],
-                user_id=reminder["userId"],
-                user_phone=reminder["mobileNumber"],
-                medicine_name=reminder["medicineName"],
-                dosage=reminder["dosage"],
-                times_list=[reminder["time"]]
-            )
-        
-        print(f"✅ Successfully loaded {len(reminders)} reminders!")
-        return len(reminders)
+        for batch in db.iterActiveReminders(batch_size):
+            items = []
+            for reminder in batch:
+                try:
+                    items.extend(_reminder_jobs(
+                        reminder["reminderId"], reminder["userId"], user_phone(reminder),
+                        reminder["medicineName"], reminder["dosage"], [reminder["time"]], reminder["timezone"]
+                    ))
+                except (ValueError, AttributeError):
+                    hydration["skipped"] += 1
+            hydration["loaded"] += engine.load_many(items)
+
+        hydration["state"] = "ready"
+        print(f"✅ Successfully loaded {hydration['loaded']} reminders!")
+        if hydration["skipped"]:
+            print(f"⚠️ Skipped {hydration['skipped']} reminders with an invalid time")
+        return hydration["loaded"]
     except Exception as e:
+        hydration.update(state="failed", error=str(e))
         print(f"⚠️ Error loading existing reminders: {e}")
-        return 0
\ No newline at end of file
+        return hydration["loaded"]
+    finally:
+        engine.stop_tracking()
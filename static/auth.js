@@ -0,0 +1,48 @@
+// Access tokens are short-lived: on a 401 from the API, renew the access
+// cookie from the refresh cookie once and retry the original request.
+(function () {
+  const originalFetch = window.fetch.bind(window);
+  let refreshing = null;
+
+  function refreshSession() {
+    if (!refreshing) {
+      refreshing = originalFetch("/api/refresh", { method: "POST", credentials: "include" })
+        .then((response) => response.ok)
+        .catch(() => false)
+        .finally(() => {
+          refreshing = null;
+        });
+    }
+    return refreshing;
+  }
+
+  window.fetch = async function (input, init) {
+    const url = typeof input === "string" ? input : input.url;
+    const response = await originalFetch(input, init);
+    const path = new URL(url, window.location.origin).pathname;
+    if (
+      response.status !== 401 ||
+      !path.startsWith("/api/") ||
+      path.startsWith("/api/refresh") ||
+      path.startsWith("/api/login")
+    ) {
+      return response;
+    }
+    if (!(await refreshSession())) {
+      return response;
+    }
+    return originalFetch(input, init);
+  };
+})();
+
+// Pages rendered by the server embed their initial API payload as
+// <script type="application/json" id="initialData">; null means fetch it.
+window.initialData = function () {
+  const el = document.getElementById("initialData");
+  if (!el) return null;
+  try {
+    return JSON.parse(el.textContent);
+  } catch {
+    return null;
+  }
+};
@@ -86,7 +86,29 @@ function initializeApp() {
   saveBtn.addEventListener("click", saveChanges);
 
   initDNA();
-  fetchUserData();
+
+  // Rendered with the page; /api/info is only fetched when it wasn't embedded
+  const initial = window.initialData();
+  if (initial) {
+    applyUserData(initial);
+    refreshDashboard();
+  } else {
+    fetchUserData();
+  }
+}
+
+function applyUserData(data) {
+  userData = data.user;
+  addressData = data.address || {};
+  if (data.reminders) {
+    reminders = data.reminders.map((r) => ({
+      id: r.reminderId,
+      time: r.time,
+      medicineName: r.medicineName,
+      dosage: r.dosage,
+      done: false,
+    }));
+  }
 }
 
 function fetchUserData() {
@@ -101,9 +123,7 @@ function fetchUserData() {
         refreshDashboard();
       } else {
         console.log("User info fetched successfully:", data);
-        userData = data.user;
-        reminders = data.reminders || reminders;
-        addressData = data.address;
+        applyUserData(data);
         refreshDashboard();
       }
     })
@@ -121,7 +141,9 @@ function refreshDashboard() {
 }
 
 function populateUI() {
-  const initials = (user.fname.charAt(0) + user.lname.charAt(0)).toUpperCase();
+  const initials = (
+    user.fname.charAt(0) + user.lname.charAt(0)
+  ).toUpperCase();
   document.getElementById("navUserAvatar").textContent = initials;
   document.getElementById("welcomeName").textContent = user.fname;
 
@@ -161,7 +183,10 @@ function setEdit(on) {
 
   if (on) {
     clearAllErrors();
-    setTimeout(() => document.querySelector(".editor .input")?.focus(), 50);
+    setTimeout(
+      () => document.querySelector(".editor .input")?.focus(),
+      50
+    );
   }
 }
 
@@ -186,7 +211,10 @@ function validateForm() {
     showError("fullName_input", "Name must be at least 2 characters");
     isValid = false;
   } else if (!/^[a-zA-Z\s]+$/.test(fullName)) {
-    showError("fullName_input", "Name can only contain letters and spaces");
+    showError(
+      "fullName_input",
+      "Name can only contain letters and spaces"
+    );
     isValid = false;
   }
 
@@ -227,7 +255,16 @@ function validateForm() {
 
   const bloodGroup = val("bloodGroup_input").trim();
   if (bloodGroup && bloodGroup !== "N/A") {
-    const validBloodGroups = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"];
+    const validBloodGroups = [
+      "A+",
+      "A-",
+      "B+",
+      "B-",
+      "AB+",
+      "AB-",
+      "O+",
+      "O-",
+    ];
     if (!validBloodGroups.includes(bloodGroup.toUpperCase())) {
       showError(
         "bloodGroup_input",
@@ -242,7 +279,10 @@ function validateForm() {
     showError("streetAddress_input", "Street address is required");
     isValid = false;
   } else if (street.length < 5) {
-    showError("streetAddress_input", "Address must be at least 5 characters");
+    showError(
+      "streetAddress_input",
+      "Address must be at least 5 characters"
+    );
     isValid = false;
   }
 
@@ -332,8 +372,10 @@ function saveChanges() {
   user.birthDate = val("birthDate_input");
   user.bloodGroup = val("bloodGroup_input").trim().toUpperCase();
   user.allergies = val("allergies_input").trim() || "None";
-  user.medicalConditions = val("medicalConditions_input").trim() || "None";
-  user.emergencyContactNumber = val("emergencyContact_input").trim() || "N/A";
+  user.medicalConditions =
+    val("medicalConditions_input").trim() || "None";
+  user.emergencyContactNumber =
+    val("emergencyContact_input").trim() || "N/A";
 
   addr.streetAddress = val("streetAddress_input").trim();
   addr.city = val("city_input").trim();
@@ -398,25 +440,25 @@ function loadReminders() {
   list.innerHTML = reminders
     .map(
       (r) => `
-            <div class="rem" data-id="${r.id}">
-              <div class="time">
-                <div class="big">${r.time}</div>
-                <div class="small">Time</div>
-              </div>
-              <div class="med">
-                <div class="name">${escape(r.medicineName)}</div>
-                <div class="dose">Dosage: ${escape(r.dosage)}</div>
-              </div>
-              <div class="chips">
-                <button class="chip ${
-                  r.done ? "done" : ""
-                }" data-action="done">${
+      <div class="rem" data-id="${r.id}">
+        <div class="time">
+          <div class="big">${r.time}</div>
+          <div class="small">Time</div>
+        </div>
+        <div class="med">
+          <div class="name">${escape(r.medicineName)}</div>
+          <div class="dose">Dosage: ${escape(r.dosage)}</div>
+        </div>
+        <div class="chips">
+          <button class="chip ${
+            r.done ? "done" : ""
+          }" data-action="done">${
         r.done ? "✓ Done" : "Mark Done"
       }</button>
-                <button class="chip" data-action="snooze">Snooze +10m</button>
-              </div>
-            </div>
-          `
+          <button class="chip" data-action="snooze">Snooze +10m</button>
+        </div>
+      </div>
+    `
     )
     .join("");
 
@@ -551,9 +593,13 @@ function escape(s) {
   return s.replace(
     /[&<>"']/g,
     (c) =>
-      ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" }[
-        c
-      ])
+      ({
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&#39;",
+      }[c])
   );
 }
 
@@ -575,7 +621,8 @@ n.prototype = {
   update: function () {
     return (
       (this.phase += this.frequency),
-      (window.canvasE = this.offset + Math.sin(this.phase) * this.amplitude)
+      (window.canvasE =
+        this.offset + Math.sin(this.phase) * this.amplitude)
     );
   },
   value: function () {
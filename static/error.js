@@ -0,0 +1,54 @@
+// Optional dynamic message
+const params = new URLSearchParams(window.location.search);
+const msg = params.get("msg");
+const errorMsg = document.getElementById("errorMsg");
+const errorCode = document.getElementById("errorCode");
+
+if (msg) {
+  const m = msg.toLowerCase();
+  if (m === "network") {
+    errorMsg.textContent = "Network error — please check your internet connection.";
+    errorCode.textContent = "Error Code: NETWORK_FAILURE";
+  } else if (m === "server") {
+    errorMsg.textContent = "Server is temporarily unavailable. Try again later.";
+    errorCode.textContent = "Error Code: SERVER_ERROR";
+  } else {
+    errorCode.textContent = `Error Code: ${msg.toUpperCase()}`;
+  }
+}
+
+// Background animation
+const canvas = document.getElementById("canvas");
+const ctx = canvas.getContext("2d");
+resizeCanvas();
+window.addEventListener("resize", resizeCanvas);
+
+function resizeCanvas() {
+  canvas.width = window.innerWidth;
+  canvas.height = window.innerHeight;
+}
+
+let dots = Array.from({ length: 80 }, () => ({
+  x: Math.random() * canvas.width,
+  y: Math.random() * canvas.height,
+  vx: (Math.random() - 0.5) * 0.6,
+  vy: (Math.random() - 0.5) * 0.6,
+  r: Math.random() * 2 + 1
+}));
+
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.strokeStyle = "rgba(239,68,68,0.15)";
+  ctx.fillStyle = "rgba(239,68,68,0.35)";
+  dots.forEach(d => {
+    d.x += d.vx;
+    d.y += d.vy;
+    if (d.x < 0 || d.x > canvas.width) d.vx *= -1;
+    if (d.y < 0 || d.y > canvas.height) d.vy *= -1;
+    ctx.beginPath();
+    ctx.arc(d.x, d.y, d.r, 0, Math.PI * 2);
+    ctx.fill();
+  });
+  requestAnimationFrame(draw);
+}
+draw();
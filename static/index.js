@@ -2,17 +2,17 @@
 lucide.createIcons();
 
 // Mobile menu toggle
-const menuBtn = document.getElementById("menuBtn");
-const mobileMenu = document.getElementById("mobileMenu");
+const menuBtn = document.getElementById('menuBtn');
+const mobileMenu = document.getElementById('mobileMenu');
 
-menuBtn.addEventListener("click", () => {
-  mobileMenu.classList.toggle("open");
+menuBtn.addEventListener('click', () => {
+  mobileMenu.classList.toggle('open');
 });
 
 // Close mobile menu when clicking links
-mobileMenu.querySelectorAll("a").forEach((link) => {
-  link.addEventListener("click", () => {
-    mobileMenu.classList.remove("open");
+mobileMenu.querySelectorAll('a').forEach(link => {
+  link.addEventListener('click', () => {
+    mobileMenu.classList.remove('open');
   });
 });
 
@@ -99,21 +99,17 @@ function onMousemove(e) {
   function o() {
     window.lines = [];
     for (let e = 0; e < window.E.trails; e++)
-      window.lines.push(
-        new Line({ spring: 0.45 + (e / window.E.trails) * 0.025 })
-      );
+      window.lines.push(new Line({ spring: 0.45 + (e / window.E.trails) * 0.025 }));
   }
   function c(e) {
     e.touches
-      ? ((window.pos.x = e.touches[0].pageX),
-        (window.pos.y = e.touches[0].pageY))
+      ? ((window.pos.x = e.touches[0].pageX), (window.pos.y = e.touches[0].pageY))
       : ((window.pos.x = e.clientX), (window.pos.y = e.clientY)),
       e.preventDefault();
   }
   function l(e) {
     1 == e.touches.length &&
-      ((window.pos.x = e.touches[0].pageX),
-      (window.pos.y = e.touches[0].pageY));
+      ((window.pos.x = e.touches[0].pageX), (window.pos.y = e.touches[0].pageY));
   }
   document.removeEventListener("mousemove", onMousemove),
     document.removeEventListener("touchstart", onMousemove),
@@ -128,15 +124,9 @@ function onMousemove(e) {
 function render() {
   if (window.ctx.running) {
     window.ctx.globalCompositeOperation = "source-over";
-    window.ctx.clearRect(
-      0,
-      0,
-      window.ctx.canvas.width,
-      window.ctx.canvas.height
-    );
+    window.ctx.clearRect(0, 0, window.ctx.canvas.width, window.ctx.canvas.height);
     window.ctx.globalCompositeOperation = "lighter";
-    window.ctx.strokeStyle =
-      "hsla(" + Math.round(window.f.update()) + ",100%,50%,0.025)";
+    window.ctx.strokeStyle = "hsla(" + Math.round(window.f.update()) + ",100%,50%,0.025)";
     window.ctx.lineWidth = 10;
     for (var e, t = 0; t < window.E.trails; t++) {
       (e = window.lines[t]).update();
@@ -199,4 +189,4 @@ function renderCanvas() {
 }
 
 // Initialize canvas when page loads
-window.addEventListener("load", renderCanvas);
+window.addEventListener('load', renderCanvas);
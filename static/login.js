@@ -1,47 +1,473 @@
-document.addEventListener("DOMContentLoaded", function () {
-  const loginForm = document.getElementById("loginForm");
-  const emailInput = document.getElementById("email");
-  const passwordInput = document.getElementById("password");
+// Mobile menu toggle
+document.getElementById("menuBtn").addEventListener("click", () => {
+  document.getElementById("mobileMenu").classList.toggle("open");
+});
+
+// Tab Switching
+document.querySelectorAll(".tab-btn").forEach((btn) => {
+  btn.addEventListener("click", () => {
+    const tab = btn.dataset.tab;
+    document.querySelectorAll(".tab-btn").forEach((b) => b.classList.remove("active"));
+    document.querySelectorAll(".tab-content").forEach((c) => c.classList.remove("active"));
+    btn.classList.add("active");
+    document.getElementById(tab).classList.add("active");
+  });
+});
+
+// Validation Functions
+function validateEmail(email) {
+  return /^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(email);
+}
+
+function validatePassword(password) {
+  return password.length >= 6;
+}
+
+function validateName(name) {
+  const trimmed = name.trim();
+  // Must be at least 2 characters and contain only letters, spaces, hyphens, and apostrophes
+  return trimmed.length >= 2 && /^[a-zA-Z\s'-]+$/.test(trimmed);
+}
+
+function togglePassword(inputId, button) {
+  const input = document.getElementById(inputId);
+  const icon = button.querySelector('i');
+
+  if (input.type === 'password') {
+    input.type = 'text';
+    icon.classList.remove('fa-eye');
+    icon.classList.add('fa-eye-slash');
+  } else {
+    input.type = 'password';
+    icon.classList.remove('fa-eye-slash');
+    icon.classList.add('fa-eye');
+  }
+}
 
-  loginForm.addEventListener("submit", function (e) {
-    e.preventDefault(); // Prevent default form submit
+function showError(inputId, errorId, message) {
+  const input = document.getElementById(inputId);
+  const error = document.getElementById(errorId);
+  input.classList.add('error');
+  input.classList.remove('success');
+  error.textContent = message;
+  error.classList.add('show');
+}
 
-    const formData = new URLSearchParams();
-    formData.append("email", emailInput.value);
-    formData.append("password", passwordInput.value);
+function clearError(inputId, errorId) {
+  const input = document.getElementById(inputId);
+  const error = document.getElementById(errorId);
+  input.classList.remove('error');
+  input.classList.add('success');
+  error.classList.remove('show');
+}
+
+function checkPasswordStrength(password) {
+  const strengthBar = document.getElementById('passwordStrength');
+  const strengthFill = document.getElementById('strengthFill');
+  const strengthText = document.getElementById('strengthText');
+
+  if (password.length === 0) {
+    strengthBar.classList.remove('show');
+    return;
+  }
+
+  strengthBar.classList.add('show');
+
+  let strength = 0;
+  if (password.length >= 6) strength++;
+  if (password.length >= 10) strength++;
+  if (/[a-z]/.test(password) && /[A-Z]/.test(password)) strength++;
+  if (/\d/.test(password)) strength++;
+  if (/[^a-zA-Z\d]/.test(password)) strength++;
+
+  strengthFill.className = 'strength-fill';
+
+  if (strength <= 2) {
+    strengthFill.classList.add('weak');
+    strengthText.textContent = 'Weak password';
+  } else if (strength <= 4) {
+    strengthFill.classList.add('medium');
+    strengthText.textContent = 'Medium password';
+  } else {
+    strengthFill.classList.add('strong');
+    strengthText.textContent = 'Strong password';
+  }
+}
+
+// Password strength checker
+document.getElementById('signupPassword').addEventListener('input', (e) => {
+  checkPasswordStrength(e.target.value);
+});
 
-    fetch("/api/login", {
-      method: "POST",
-      credentials: "include", // Important for cookies
+// Login Form
+document.getElementById("loginForm").addEventListener("submit", async (e) => {
+  e.preventDefault();
+
+  const email = document.getElementById('loginEmail').value.trim();
+  const password = document.getElementById('loginPassword').value;
+  const loginBtn = document.getElementById('loginBtn');
+
+  let hasError = false;
+
+  if (!validateEmail(email)) {
+    showError('loginEmail', 'loginEmailError', 'Please enter a valid email address');
+    hasError = true;
+  } else {
+    clearError('loginEmail', 'loginEmailError');
+  }
+
+  if (!validatePassword(password)) {
+    showError('loginPassword', 'loginPasswordError', 'Password must be at least 6 characters');
+    hasError = true;
+  } else {
+    clearError('loginPassword', 'loginPasswordError');
+  }
+
+  if (hasError) return;
+
+  loginBtn.disabled = true;
+  loginBtn.classList.add('loading');
+  const originalText = loginBtn.textContent;
+  loginBtn.textContent = '';
+
+  const formData = new URLSearchParams();
+  formData.append('email', email);
+  formData.append('password', password);
+
+  try {
+    const response = await fetch('/api/login', {
+      method: 'POST',
+      credentials: 'include',
       headers: {
-        "Content-Type": "application/x-www-form-urlencoded",
+        'Content-Type': 'application/x-www-form-urlencoded',
       },
       body: formData.toString(),
-    })
-      .then((response) => {
-        if (response.redirected) {
-          // ✅ Redirect from FastAPI, follow it
-          window.location.href = response.url;
-        } else if (response.ok) {
-          // fallback in case redirect fails
-          window.location.href = response.url;
-        } else {
-          return response.json().then((data) => {
-            alert("Login failed: " + (data.detail || "Unknown error"));
-          });
-        }
-      })
-      .catch((error) => {
-        console.error("Login error:", error);
-        alert("Network error or server is down.");
-      });
-  });
+    });
 
-  // Password toggle
-  const togglePassword = document.getElementById("togglePassword");
-  togglePassword.addEventListener("click", function () {
-    const type = passwordInput.type === "password" ? "text" : "password";
-    passwordInput.type = type;
-    this.textContent = type === "password" ? "👁️" : "🙈";
-  });
+    if (response.redirected) {
+      window.location.href = response.url;
+      return;
+    }
+
+    if (response.ok) {
+      window.location.href = '/';
+    } else {
+      const data = await response.json();
+      showError('loginPassword', 'loginPasswordError', data.detail || 'Login failed');
+    }
+  } catch (error) {
+    console.error('Login error:', error);
+    showError('loginPassword', 'loginPasswordError', 'Network error. Please try again.');
+  } finally {
+    loginBtn.disabled = false;
+    loginBtn.classList.remove('loading');
+    loginBtn.textContent = originalText;
+  }
 });
+
+// Signup Form
+document.getElementById("signupForm").addEventListener("submit", async (e) => {
+  e.preventDefault();
+
+  const firstName = document.getElementById('signupFirstName').value.trim();
+  const lastName = document.getElementById('signupLastName').value.trim();
+  const email = document.getElementById('signupEmail').value.trim();
+  const password = document.getElementById('signupPassword').value;
+  const confirmPassword = document.getElementById('confirmPassword').value;
+  const signupBtn = document.getElementById('signupBtn');
+
+  let hasError = false;
+
+  if (!validateName(firstName)) {
+    showError('signupFirstName', 'signupFirstNameError', 'First name must be at least 2 characters and contain only letters');
+    hasError = true;
+  } else {
+    clearError('signupFirstName', 'signupFirstNameError');
+  }
+
+  if (!validateName(lastName)) {
+    showError('signupLastName', 'signupLastNameError', 'Last name must be at least 2 characters and contain only letters');
+    hasError = true;
+  } else {
+    clearError('signupLastName', 'signupLastNameError');
+  }
+
+  if (!validateEmail(email)) {
+    showError('signupEmail', 'signupEmailError', 'Please enter a valid email address');
+    hasError = true;
+  } else {
+    clearError('signupEmail', 'signupEmailError');
+  }
+
+  if (!validatePassword(password)) {
+    showError('signupPassword', 'signupPasswordError', 'Password must be at least 6 characters');
+    hasError = true;
+  } else {
+    clearError('signupPassword', 'signupPasswordError');
+  }
+
+  if (password !== confirmPassword) {
+    showError('confirmPassword', 'confirmPasswordError', 'Passwords do not match');
+    hasError = true;
+  } else {
+    clearError('confirmPassword', 'confirmPasswordError');
+  }
+
+  if (hasError) return;
+
+  signupBtn.disabled = true;
+  signupBtn.classList.add('loading');
+  const originalText = signupBtn.textContent;
+  signupBtn.textContent = '';
+
+  const username = `${firstName} ${lastName}`;
+  const formData = new URLSearchParams();
+  formData.append('username', username);
+  formData.append('email', email);
+  formData.append('password', password);
+
+  try {
+    const response = await fetch('/api/register/', {
+      method: 'POST',
+      credentials: 'include',
+      headers: {
+        'Content-Type': 'application/x-www-form-urlencoded',
+      },
+      body: formData.toString(),
+    });
+
+    if (response.redirected) {
+      window.location.href = response.url;
+      return;
+    }
+
+    if (response.ok) {
+      const data = await response.json();
+      if (data.error) {
+        showError('signupEmail', 'signupEmailError', data.error);
+      } else {
+        window.location.href = '/info';
+      }
+    } else {
+      const data = await response.json();
+      showError('signupEmail', 'signupEmailError', data.detail || 'Registration failed');
+    }
+  } catch (error) {
+    console.error('Signup error:', error);
+    showError('signupEmail', 'signupEmailError', 'Network error. Please try again.');
+  } finally {
+    signupBtn.disabled = false;
+    signupBtn.classList.remove('loading');
+    signupBtn.textContent = originalText;
+  }
+});
+
+// Clear errors on input
+['loginEmail', 'loginPassword', 'signupFirstName', 'signupLastName', 'signupEmail', 'signupPassword', 'confirmPassword'].forEach(fieldId => {
+  const input = document.getElementById(fieldId);
+  if (input) {
+    input.addEventListener('input', () => {
+      const errorId = fieldId + 'Error';
+      const errorElement = document.getElementById(errorId);
+      if (errorElement && errorElement.classList.contains('show')) {
+        input.classList.remove('error');
+        errorElement.classList.remove('show');
+      }
+    });
+  }
+});
+
+// Google Login handlers
+document.getElementById("googleLogin").addEventListener("click", (e) => {
+  e.preventDefault();
+  alert("Google login integration pending");
+});
+
+document.getElementById("googleSignup").addEventListener("click", (e) => {
+  e.preventDefault();
+  alert("Google signup Coming Soon");
+});
+
+// Canvas Animation
+function n(e) {
+  this.init(e || {});
+}
+n.prototype = {
+  init: function (e) {
+    this.phase = e.phase || 0;
+    this.offset = e.offset || 0;
+    this.frequency = e.frequency || 0.001;
+    this.amplitude = e.amplitude || 1;
+  },
+  update: function () {
+    return (
+      (this.phase += this.frequency),
+      (window.canvasE = this.offset + Math.sin(this.phase) * this.amplitude)
+    );
+  },
+  value: function () {
+    return window.canvasE;
+  },
+};
+
+function Line(e) {
+  this.init(e || {});
+}
+
+Line.prototype = {
+  init: function (e) {
+    this.spring = e.spring + 0.1 * Math.random() - 0.05;
+    this.friction = window.E.friction + 0.01 * Math.random() - 0.005;
+    this.nodes = [];
+    for (var t, n = 0; n < window.E.size; n++) {
+      t = new Node();
+      t.x = window.pos.x;
+      t.y = window.pos.y;
+      this.nodes.push(t);
+    }
+  },
+  update: function () {
+    let e = this.spring,
+      t = this.nodes[0];
+    t.vx += (window.pos.x - t.x) * e;
+    t.vy += (window.pos.y - t.y) * e;
+    for (var n, i = 0, a = this.nodes.length; i < a; i++)
+      (t = this.nodes[i]),
+        0 < i &&
+          ((n = this.nodes[i - 1]),
+          (t.vx += (n.x - t.x) * e),
+          (t.vy += (n.y - t.y) * e),
+          (t.vx += n.vx * window.E.dampening),
+          (t.vy += n.vy * window.E.dampening)),
+        (t.vx *= this.friction),
+        (t.vy *= this.friction),
+        (t.x += t.vx),
+        (t.y += t.vy),
+        (e *= window.E.tension);
+  },
+  draw: function () {
+    let e,
+      t,
+      n = this.nodes[0].x,
+      i = this.nodes[0].y;
+    window.ctx.beginPath();
+    window.ctx.moveTo(n, i);
+    for (var a = 1, o = this.nodes.length - 2; a < o; a++) {
+      e = this.nodes[a];
+      t = this.nodes[a + 1];
+      n = 0.5 * (e.x + t.x);
+      i = 0.5 * (e.y + t.y);
+      window.ctx.quadraticCurveTo(e.x, e.y, n, i);
+    }
+    e = this.nodes[a];
+    t = this.nodes[a + 1];
+    window.ctx.quadraticCurveTo(e.x, e.y, t.x, t.y);
+    window.ctx.stroke();
+    window.ctx.closePath();
+  },
+};
+
+function onMousemove(e) {
+  function o() {
+    window.lines = [];
+    for (let e = 0; e < window.E.trails; e++)
+      window.lines.push(
+        new Line({ spring: 0.45 + (e / window.E.trails) * 0.025 })
+      );
+  }
+  function c(e) {
+    e.touches
+      ? ((window.pos.x = e.touches[0].pageX),
+        (window.pos.y = e.touches[0].pageY))
+      : ((window.pos.x = e.clientX), (window.pos.y = e.clientY)),
+      e.preventDefault();
+  }
+  function l(e) {
+    1 == e.touches.length &&
+      ((window.pos.x = e.touches[0].pageX),
+      (window.pos.y = e.touches[0].pageY));
+  }
+  document.removeEventListener("mousemove", onMousemove),
+    document.removeEventListener("touchstart", onMousemove),
+    document.addEventListener("mousemove", c),
+    document.addEventListener("touchmove", c),
+    document.addEventListener("touchstart", l),
+    c(e),
+    o(),
+    render();
+}
+
+function render() {
+  if (window.ctx.running) {
+    window.ctx.globalCompositeOperation = "source-over";
+    window.ctx.clearRect(
+      0,
+      0,
+      window.ctx.canvas.width,
+      window.ctx.canvas.height
+    );
+    window.ctx.globalCompositeOperation = "lighter";
+    window.ctx.strokeStyle =
+      "hsla(" + Math.round(window.f.update()) + ",100%,50%,0.025)";
+    window.ctx.lineWidth = 10;
+    for (var e, t = 0; t < window.E.trails; t++) {
+      (e = window.lines[t]).update();
+      e.draw();
+    }
+    window.ctx.frame++;
+    window.requestAnimationFrame(render);
+  }
+}
+
+function resizeCanvas() {
+  window.ctx.canvas.width = window.innerWidth;
+  window.ctx.canvas.height = window.innerHeight;
+}
+
+window.canvasE = 0;
+window.pos = {};
+window.lines = [];
+window.E = {
+  debug: true,
+  friction: 0.5,
+  trails: 80,
+  size: 50,
+  dampening: 0.025,
+  tension: 0.99,
+};
+
+function Node() {
+  this.x = 0;
+  this.y = 0;
+  this.vy = 0;
+  this.vx = 0;
+}
+
+function renderCanvas() {
+  window.ctx = document.getElementById("canvas").getContext("2d");
+  if (!window.ctx) return;
+  window.ctx.running = true;
+  window.ctx.frame = 1;
+  window.f = new n({
+    phase: Math.random() * 2 * Math.PI,
+    amplitude: 85,
+    frequency: 0.0015,
+    offset: 285,
+  });
+  document.addEventListener("mousemove", onMousemove);
+  document.addEventListener("touchstart", onMousemove);
+  document.body.addEventListener("orientationchange", resizeCanvas);
+  window.addEventListener("resize", resizeCanvas);
+  window.addEventListener("focus", () => {
+    if (!window.ctx.running) {
+      window.ctx.running = true;
+      render();
+    }
+  });
+  window.addEventListener("blur", () => {
+    window.ctx.running = true;
+  });
+  resizeCanvas();
+}
+
+window.addEventListener("load", renderCanvas);
@@ -9,9 +9,7 @@ document.addEventListener("DOMContentLoaded", () => {
   const emailInput = document.getElementById("email");
   const toast = document.getElementById("toast");
   const passwordStrength = password.parentElement.nextElementSibling;
-  const passwordStrengthBar = passwordStrength.querySelector(
-    ".password-strength-bar"
-  );
+  const passwordStrengthBar = passwordStrength.querySelector(".password-strength-bar");
   const passwordHint = passwordStrength.nextElementSibling;
 
   // Enhanced validation functions
@@ -39,8 +37,7 @@ document.addEventListener("DOMContentLoaded", () => {
   function showToast(message, type = "success") {
     toast.className = `toast ${type}`;
     toast.querySelector(".toast-message").textContent = message;
-    toast.querySelector(".toast-icon").textContent =
-      type === "success" ? "✓" : "✕";
+    toast.querySelector(".toast-icon").textContent = type === "success" ? "✓" : "✕";
     toast.classList.add("show");
 
     setTimeout(() => {
@@ -126,13 +123,7 @@ document.addEventListener("DOMContentLoaded", () => {
   }
 
   // Clear errors on input
-  [
-    firstNameInput,
-    lastNameInput,
-    emailInput,
-    password,
-    confirmPassword,
-  ].forEach((field) => {
+  [firstNameInput, lastNameInput, emailInput, password, confirmPassword].forEach((field) => {
     field.addEventListener("input", () => {
       field.closest(".form-group").classList.remove("error");
     });
@@ -205,83 +196,71 @@ document.addEventListener("DOMContentLoaded", () => {
     // Validate first name
     const firstNameValue = firstNameInput.value.trim();
     if (!firstNameValue) {
-      isValid =
-        validateField(firstNameInput, false, "First name is required") &&
-        isValid;
+      isValid = validateField(firstNameInput, false, "First name is required") && isValid;
     } else if (!isValidName(firstNameValue)) {
-      isValid =
-        validateField(
-          firstNameInput,
-          false,
-          "First name must be 2-50 characters, letters only"
-        ) && isValid;
+      isValid = validateField(
+        firstNameInput,
+        false,
+        "First name must be 2-50 characters, letters only"
+      ) && isValid;
     }
 
     // Validate last name
     const lastNameValue = lastNameInput.value.trim();
     if (!lastNameValue) {
-      isValid =
-        validateField(lastNameInput, false, "Last name is required") && isValid;
+      isValid = validateField(lastNameInput, false, "Last name is required") && isValid;
     } else if (!isValidName(lastNameValue)) {
-      isValid =
-        validateField(
-          lastNameInput,
-          false,
-          "Last name must be 2-50 characters, letters only"
-        ) && isValid;
+      isValid = validateField(
+        lastNameInput,
+        false,
+        "Last name must be 2-50 characters, letters only"
+      ) && isValid;
     }
 
     // Validate email
     const emailValue = emailInput.value.trim();
     if (!emailValue) {
-      isValid =
-        validateField(emailInput, false, "Email address is required") &&
-        isValid;
+      isValid = validateField(emailInput, false, "Email address is required") && isValid;
     } else if (!isValidEmail(emailValue)) {
-      isValid =
-        validateField(
-          emailInput,
-          false,
-          "Please enter a valid email address (e.g., user@example.com)"
-        ) && isValid;
+      isValid = validateField(
+        emailInput,
+        false,
+        "Please enter a valid email address (e.g., user@example.com)"
+      ) && isValid;
     } else if (emailValue.length > 255) {
-      isValid =
-        validateField(
-          emailInput,
-          false,
-          "Email address is too long (maximum 255 characters)"
-        ) && isValid;
+      isValid = validateField(
+        emailInput,
+        false,
+        "Email address is too long (maximum 255 characters)"
+      ) && isValid;
     }
 
     // Validate password
     if (!password.value) {
-      isValid =
-        validateField(password, false, "Password is required") && isValid;
+      isValid = validateField(password, false, "Password is required") && isValid;
     } else if (!isStrongPassword(password.value)) {
-      isValid =
-        validateField(
-          password,
-          false,
-          "Password must be 8+ chars with uppercase, lowercase, number & special character"
-        ) && isValid;
+      isValid = validateField(
+        password,
+        false,
+        "Password must be 8+ chars with uppercase, lowercase, number & special character"
+      ) && isValid;
     } else if (password.value.length > 128) {
-      isValid =
-        validateField(
-          password,
-          false,
-          "Password is too long (maximum 128 characters)"
-        ) && isValid;
+      isValid = validateField(
+        password,
+        false,
+        "Password is too long (maximum 128 characters)"
+      ) && isValid;
     }
 
     // Validate password confirmation
     if (!confirmPassword.value) {
-      isValid =
-        validateField(confirmPassword, false, "Please confirm your password") &&
-        isValid;
+      isValid = validateField(confirmPassword, false, "Please confirm your password") && isValid;
     } else if (password.value !== confirmPassword.value) {
-      isValid =
-        validateField(confirmPassword, false, "Passwords do not match") &&
-        isValid;
+      isValid = validateField(
+        confirmPassword,
+        false,
+        "Passwords do not match"
+      ) && isValid;
     }
 
     if (!isValid) {
@@ -308,7 +287,8 @@ document.addEventListener("DOMContentLoaded", () => {
       }, 1500);
     }, 1000);
 
-    /* Uncomment this for actual API integration: */
+    /* Uncomment this for actual API integration:*/
+
     const formData = new URLSearchParams();
     formData.append("email", emailValue);
     formData.append("password", password.value);
@@ -1,298 +1,540 @@
-// User data from backend
-let userData = {};
+// ---- Storage helpers ----
+const LS_KEY = 'medred_reminders';
+const deep = o => JSON.parse(JSON.stringify(o));
+const saveStore = (arr)=> localStorage.setItem(LS_KEY, JSON.stringify(arr));
+const loadStore = ()=> {
+  try { return JSON.parse(localStorage.getItem(LS_KEY) || '[]'); } catch { return []; }
+};
 
-// Fetch user data
-async function getUserData() {
-  try {
-    const response = await fetch('/api/me', {
-      method: 'GET',
-      credentials: 'include',
-    });
-    const data = await response.json();
-    userData = data;
-    console.log("User Data:", userData);
-    
-    // Update UI with user data
-    if (userData.fname && userData.lname) {
-      const initials = userData.fname.charAt(0) + userData.lname.charAt(0);
-      document.getElementById("navUserAvatar").textContent = initials.toUpperCase();
-      document.getElementById("navUserName").textContent = `${userData.fname} ${userData.lname}`;
-      document.getElementById("navUserEmail").textContent = userData.email;
-    }
-  } catch (error) {
-    console.error("Error fetching user data:", error);
-  }
+// ---- State ----
+// Server-rendered pages embed the user's reminders. Medicine, dose and times are
+// then saved through /api/reminders; fields the API doesn't store (days, notes,
+// pause, ...) stay in local storage. Without embedded data the page is local-only.
+const initial = window.initialData();
+const serverMode = !!initial;
+let reminders = serverMode ? withLocalFields(fromServer(initial.reminders)) : loadStore();
+if (!initial && !reminders.length) {
+  reminders = [
+    mkRem('Amoxicillin','500 mg',['08:00','20:00'],{daily:true}, {notes:'After food'}),
+    mkRem('Ibuprofen','200 mg',['13:00'],{days:[1,3,5]},{}),
+    mkRem('Lisinopril','10 mg',['21:00'],{daily:true},{}),
+  ];
+  saveStore(reminders);
 }
+let filter = 'all';
+let searchTerm = '';
+let editingId = null;
+
+// ---- Elements ----
+const listEl = document.getElementById('list');
+const emptyEl = document.getElementById('emptyState');
+const avatar = document.getElementById('navUserAvatar');
+
+// Filters
+document.getElementById('filterSeg').addEventListener('click', (e)=>{
+  if (e.target.tagName !== 'BUTTON') return;
+  document.querySelectorAll('#filterSeg button').forEach(b=>b.classList.remove('active'));
+  e.target.classList.add('active');
+  filter = e.target.dataset.filter;
+  renderList();
+});
+
+// Search
+document.getElementById('searchInput').addEventListener('input', (e)=>{
+  searchTerm = e.target.value.trim().toLowerCase();
+  renderList();
+});
+
+// Add button
+document.getElementById('addBtn').addEventListener('click', ()=> openPanel());
+
+// Panel controls
+const overlay = document.getElementById('overlay');
+const panel = document.getElementById('panel');
+document.getElementById('closePanelBtn').addEventListener('click', closePanel);
+document.getElementById('cancelBtn').addEventListener('click', closePanel);
+overlay.addEventListener('click', closePanel);
+const saveBtn = document.getElementById('saveBtn');
+saveBtn.addEventListener('click', onSaveReminder);
+
+const fName = document.getElementById('f_name');
+const fDose = document.getElementById('f_dose');
+const fTime = document.getElementById('f_time');
+const fStart = document.getElementById('f_start');
+const fEnd = document.getElementById('f_end');
+const fPrenotify = document.getElementById('f_prenotify');
+const fNotes = document.getElementById('f_notes');
+const fActive = document.getElementById('f_active');
+const fActiveSwitch = document.getElementById('f_activeSwitch');
+const timeChips = document.getElementById('timeChips');
+const daysWrap = document.getElementById('days');
+const dailyBtn = document.getElementById('dailyBtn');
+const preview = document.getElementById('preview');
+const panelTitle = document.getElementById('panelTitle');
+
+fActiveSwitch.addEventListener('click', ()=> {
+  fActive.checked = !fActive.checked;
+  fActiveSwitch.classList.toggle('active', fActive.checked);
+});
+document.getElementById('addTimeBtn').addEventListener('click', addTimeChip);
+fTime.addEventListener('keydown', (e)=> { if(e.key === 'Enter'){ e.preventDefault(); addTimeChip(); }});
+dailyBtn.addEventListener('click', ()=> {
+  // toggle all days on/off
+  const activeCount = daysSelected().length;
+  if (activeCount === 7) {
+    // clear (switch to none)
+    daysWrap.querySelectorAll('.day').forEach(d=>d.classList.remove('active'));
+    dailyBtn.textContent = 'Daily';
+  } else {
+    // set all
+    daysWrap.querySelectorAll('.day').forEach(d=>d.classList.add('active'));
+    dailyBtn.textContent = 'Daily ✓';
+  }
+  updatePreview();
+});
 
-// Reminders array
-let reminders = [];
-
-// Fetch reminders on page load
-function fetchReminders() {
-  fetch('/api/reminders/user', {
-    method: 'GET',
-    credentials: 'include'
-  })
-    .then(response => response.json())
-    .then(data => {
-      reminders = data.reminders || [];
-      loadReminders();
-      updateStatistics();
+initDays();
+
+// ---- Rendering ----
+function renderList(){
+  const data = reminders
+    .filter(r => {
+      if (filter === 'today' && !occursToday(r)) return false;
+      if (filter === 'active' && !r.active) return false;
+      if (filter === 'paused' && r.active) return false;
+      return true;
     })
-    .catch(error => {
-      console.error("Error fetching reminders:", error);
-      reminders = [];
-      loadReminders();
-      updateStatistics();
+    .filter(r => {
+      if (!searchTerm) return true;
+      const hay = (r.name + ' ' + r.dose + ' ' + (r.notes||'')).toLowerCase();
+      return hay.includes(searchTerm);
     });
+
+  listEl.innerHTML = data.map(r => cardHTML(r)).join('');
+  emptyEl.style.display = data.length ? 'none' : 'block';
+
+  // Bind actions
+  listEl.querySelectorAll('[data-action]').forEach(btn => {
+    btn.addEventListener('click', onCardAction);
+  });
+  listEl.querySelectorAll('.switch').forEach(sw => {
+    sw.addEventListener('click', onToggleActive);
+  });
 }
 
-// Initialize page
-async function initializePage() {
-  // Get user data first
-  await getUserData();
-  
-  // Load reminders from backend
-  fetchReminders();
+function cardHTML(r){
+  const schedule = scheduleSummary(r);
+  const next = nextDue(r);
+  const activeCls = r.active ? 'active' : '';
+  return `
+    <div class="card" data-id="${r.id}">
+      <div>
+        <div class="title-row">
+          <div class="pill">💊</div>
+          <div>
+            <div class="name">${escape(r.name)} • ${escape(r.dose||'')}</div>
+            <div class="muted">${escape(schedule)}</div>
+          </div>
+        </div>
+        <div class="meta">
+          <div>Next: ${escape(next || '—')}</div>
+          <div class="dot"></div>
+          <div>${r.notes ? escape(r.notes) : 'No notes'}</div>
+        </div>
+      </div>
+      <div class="actions">
+        <button class="chip" data-action="snooze">Snooze +10m</button>
+        <button class="chip" data-action="done">Mark Done</button>
+        <button class="chip" data-action="edit">Edit</button>
+        <button class="chip" data-action="delete">Delete</button>
+        <label class="switch ${activeCls}">
+          <input type="checkbox" ${r.active ? 'checked':''}>
+          <div class="knob"></div>
+        </label>
+      </div>
+    </div>
+  `;
 }
 
-// Load reminders
-function loadReminders() {
-  const reminderList = document.getElementById("reminderList");
+// ---- Card Actions ----
+function onCardAction(e){
+  const btn = e.currentTarget;
+  const action = btn.dataset.action;
+  const id = btn.closest('.card')?.dataset.id;
+  const r = reminders.find(x => x.id === id);
+  if (!r) return;
 
-  if (reminders.length === 0) {
-    reminderList.innerHTML = `
-      <div class="empty-state">
-        <div class="empty-icon">💊</div>
-        <h3 class="empty-title">No reminders yet</h3>
-        <p>Click "Add Reminder" to create your first medicine reminder</p>
-      </div>
-    `;
-    return;
+  if (action === 'snooze'){
+    toast('Snoozed 10 minutes ⏱️');
+  } else if (action === 'done'){
+    r.lastTaken = new Date().toISOString();
+    saveStore(reminders);
+    renderList();
+    toast('Marked done 💊');
+  } else if (action === 'edit'){
+    openPanel(r);
+  } else if (action === 'delete'){
+    if (confirm(`Delete reminder "${r.name}"?`)) deleteReminder(r);
   }
+}
 
-  reminderList.innerHTML = reminders
-    .map(
-      (reminder) => {
-        // Try different possible ID field names
-        const reminderId = reminder._id || reminder.id || reminder.reminderId || '';
-        return `
-        <div class="reminder-card">
-          <div class="reminder-header">
-            <div>
-              <div class="reminder-name">${reminder.medicineName}</div>
-              <span class="reminder-dosage">💊 ${reminder.dosage}</span>
-            </div>
-            <button class="btn btn-delete" onclick="deleteReminder('${reminderId}')">
-              <span>🗑️</span>
-              <span>Delete</span>
-            </button>
-          </div>
-          <div class="reminder-details">
-            <div class="reminder-detail-item">
-              <div class="detail-icon">🕐</div>
-              <span><strong>Time:</strong> ${reminder.time}</span>
-            </div>
-          </div>
-        </div>
-      `;
-      }
-    )
-    .join("");
-}
-
-// Update statistics
-function updateStatistics() {
-  document.getElementById("totalReminders").textContent = reminders.length;
-
-  // Count by time of day
-  let morning = 0,
-    afternoon = 0,
-    evening = 0,
-    night = 0;
-
-  reminders.forEach((reminder) => {
-    const time = reminder.time;
-    if (time) {
-      const hour = parseInt(time.split(":")[0]);
-      if (hour >= 5 && hour < 12) morning++;
-      else if (hour >= 12 && hour < 17) afternoon++;
-      else if (hour >= 17 && hour < 21) evening++;
-      else night++;
+async function deleteReminder(r){
+  if (serverMode && r.rows?.length){
+    try {
+      await api('DELETE', '/api/reminders/delete-multiple', { reminderIds: r.rows.map(row => row.reminderId) });
+    } catch (err) {
+      toast(`Couldn't delete: ${err.message}`);
+      await resync();
+      return;
     }
-  });
+  }
+  reminders = reminders.filter(x => x.id !== r.id);
+  saveStore(reminders);
+  renderList();
+  toast('Reminder deleted');
+}
 
-  document.getElementById("morningCount").textContent = morning;
-  document.getElementById("afternoonCount").textContent = afternoon;
-  document.getElementById("eveningCount").textContent = evening;
-  document.getElementById("nightCount").textContent = night;
+// ---- Server sync ----
+async function api(method, url, body){
+  const res = await fetch(url, {
+    method, credentials: 'include',
+    headers: { 'Content-Type': 'application/json' },
+    body: body === undefined ? undefined : JSON.stringify(body)
+  });
+  const data = await res.json().catch(() => ({}));
+  if (!res.ok) throw new Error(data.detail || data.error || `request failed (${res.status})`);
+  return data;
 }
 
-// Open add modal
-function openAddModal() {
-  document.getElementById("addReminderModal").classList.add("show");
-  // Add one time input by default
-  const timeInputsContainer = document.getElementById("timeInputs");
-  timeInputsContainer.innerHTML = "";
-  const input = document.createElement("input");
-  input.type = "time";
-  input.className = "time-input";
-  input.required = true;
-  timeInputsContainer.appendChild(input);
+async function saveToServer(prev, payload){
+  // Diff the card's stored times against the form: delete, update and add only what changed
+  const rows = prev?.rows || [];
+  const kept = rows.filter(row => payload.times.includes(row.time));
+  const removed = rows.filter(row => !payload.times.includes(row.time));
+  const added = payload.times.filter(t => !rows.some(row => row.time === t));
+  const renamed = prev && (prev.name !== payload.name || prev.dose !== payload.dose);
+
+  if (removed.length){
+    await api('DELETE', '/api/reminders/delete-multiple', { reminderIds: removed.map(row => row.reminderId) });
+  }
+  if (renamed && kept.length){
+    await api('PUT', '/api/reminders/update-multiple', {
+      reminders: kept.map(row => ({ reminderId: row.reminderId, medicineName: payload.name, dosage: payload.dose, time: row.time }))
+    });
+  }
+  let created = [];
+  if (added.length){
+    const res = await api('POST', '/api/reminders/add-multiple', { medicineName: payload.name, dosage: payload.dose, times: added });
+    created = added.map((time, i) => ({ reminderId: res.reminder_ids[i], time }));
+  }
+  return kept.concat(created).sort((a, b) => a.time.localeCompare(b.time));
 }
 
-// Close add modal
-function closeAddModal() {
-  document.getElementById("addReminderModal").classList.remove("show");
-  document.getElementById("reminderForm").reset();
+async function resync(){
+  // After a failed or partial save, show what the server actually has
+  try {
+    const rows = [];
+    let cursor = null;
+    do {
+      const query = new URLSearchParams({ limit: '500', ...(cursor ? { cursor } : {}) });
+      const page = await api('GET', `/api/reminders/user?${query}`);
+      rows.push(...page.reminders);
+      cursor = page.nextCursor;
+    } while (cursor);
+    reminders = withLocalFields(fromServer(rows));
+    saveStore(reminders);
+  } catch (err) {
+    console.error('Error reloading reminders:', err);
+  }
+  renderList();
 }
 
-// Add reminder
-let isSubmitting = false; // Flag to prevent double submission
+function withLocalFields(cards){
+  // Days, notes, pause etc. are only kept locally, keyed by the card's first reminder id
+  const local = new Map(loadStore().map(r => [r.id, r]));
+  return cards.map(card => {
+    const saved = local.get(card.id);
+    return saved ? { ...saved, id: card.id, name: card.name, dose: card.dose, times: card.times, rows: card.rows } : card;
+  });
+}
 
-function addReminder(event) {
-  event.preventDefault();
-  event.stopPropagation();
+function onToggleActive(e){
+  const card = e.currentTarget.closest('.card');
+  const id = card?.dataset.id;
+  const r = reminders.find(x => x.id === id);
+  if (!r) return;
+  r.active = !r.active;
+  e.currentTarget.classList.toggle('active', r.active);
+  saveStore(reminders);
+  renderList();
+  toast(r.active ? 'Reminder activated' : 'Reminder paused');
+}
 
-  // Prevent double submission
-  if (isSubmitting) {
-    console.log("Already submitting, ignoring duplicate request");
-    return;
-  }
+// ---- Panel (Add/Edit) ----
+function openPanel(rem=null){
+  overlay.classList.add('open');
+  panel.setAttribute('aria-hidden', 'false');
 
-  const timeInput = document.querySelector(".time-input");
-  const time = timeInput ? timeInput.value : "";
+  if (rem){
+    panelTitle.textContent = 'Edit Reminder';
+    editingId = rem.id;
+    fName.value = rem.name || '';
+    fDose.value = rem.dose || '';
+    fStart.value = rem.startDate || '';
+    fEnd.value = rem.endDate || '';
+    fPrenotify.value = String(rem.preNotify || 10);
+    fNotes.value = rem.notes || '';
+    fActive.checked = !!rem.active;
+    fActiveSwitch.classList.toggle('active', fActive.checked);
 
-  const medicineName = document.getElementById("medicineName").value.trim();
-  const dosage = document.getElementById("dosage").value.trim();
+    // Times
+    renderTimes(rem.times || []);
 
-  // Check if all fields are filled
-  if (!medicineName || !dosage || !time) {
-    alert("Please fill in all fields");
-    return;
+    // Days
+    daysWrap.querySelectorAll('.day').forEach(d=>d.classList.remove('active'));
+    if (rem.daily){
+      daysWrap.querySelectorAll('.day').forEach(d=>d.classList.add('active'));
+      dailyBtn.textContent = 'Daily ✓';
+    } else {
+      (rem.days||[]).forEach(idx => {
+        const btn = daysWrap.querySelector(`[data-day="${idx}"]`);
+        if (btn) btn.classList.add('active');
+      });
+      dailyBtn.textContent = (daysSelected().length === 7) ? 'Daily ✓' : 'Daily';
+    }
+  } else {
+    panelTitle.textContent = 'Add Reminder';
+    editingId = null;
+    fName.value = '';
+    fDose.value = '';
+    fStart.value = '';
+    fEnd.value = '';
+    fPrenotify.value = '10';
+    fNotes.value = '';
+    fActive.checked = true;
+    fActiveSwitch.classList.add('active');
+    renderTimes([]);
+    daysWrap.querySelectorAll('.day').forEach(d=>d.classList.remove('active'));
+    dailyBtn.textContent = 'Daily';
   }
+  updatePreview();
+}
 
-  const reminderData = {
-    medicineName: medicineName,
-    dosage: dosage,
-    time: time,
-  };
+function closePanel(){
+  overlay.classList.remove('open');
+  panel.setAttribute('aria-hidden','true');
+}
 
-  // Set flag and disable submit button
-  isSubmitting = true;
-  const submitButton = event.target.querySelector('button[type="submit"]');
-  if (submitButton) {
-    submitButton.disabled = true;
-    submitButton.textContent = "Saving...";
-  }
+async function onSaveReminder(){
+  const name = fName.value.trim();
+  if (!name){ toast('Enter medicine name'); return; }
+  const dose = fDose.value.trim();
+  const times = currentTimes();
+  if (!times.length){ toast('Add at least one time'); return; }
+  const days = daysSelected();
+  const daily = days.length === 7;
+  const startDate = fStart.value || null;
+  const endDate = fEnd.value || null;
+  const notes = fNotes.value.trim();
+  const preNotify = parseInt(fPrenotify.value || '0',10);
+  const active = !!fActive.checked;
 
-  console.log("Submitting reminder:", reminderData); // Debug log
-
-  fetch('/api/reminders/add', {
-    method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-    },
-    credentials: 'include',
-    body: JSON.stringify(reminderData),
-  })
-    .then(response => {
-      console.log("Response status:", response.status); // Debug log
-      if (!response.ok) {
-        throw new Error('Failed to add reminder');
-      }
-      return response.json();
-    })
-    .then(data => {
-      console.log("Reminder added successfully:", data);
-      closeAddModal();
-      showSuccess("✓ Reminder added successfully!");
-      
-      // Wait a bit before fetching to ensure backend has processed
-      setTimeout(() => {
-        fetchReminders();
-      }, 300);
-    })
-    .catch(error => {
-      console.error("Error adding reminder:", error);
-      alert("Failed to add reminder. Please try again.");
-    })
-    .finally(() => {
-      // Reset flag and re-enable submit button
-      isSubmitting = false;
-      if (submitButton) {
-        submitButton.disabled = false;
-        submitButton.innerHTML = '<span>💾</span><span>Save Reminder</span>';
-      }
-    });
-}
+  const payload = { name, dose, times, daily, days, startDate, endDate, notes, preNotify, active };
 
-// Delete reminder
-function deleteReminder(reminderId) {
-  console.log("Deleting reminder with ID:", reminderId); // Debug log
-  
-  if (!reminderId) {
-    console.error("No reminder ID provided");
-    alert("Error: Cannot delete reminder without ID");
-    return;
+  if (serverMode){
+    const prev = editingId ? reminders.find(r => r.id === editingId) : null;
+    saveBtn.disabled = true;
+    try {
+      payload.rows = await saveToServer(prev, payload);
+    } catch (err) {
+      toast(`Couldn't save: ${err.message}`);
+      await resync();
+      return;
+    } finally {
+      saveBtn.disabled = false;
+    }
+    // Keep the card id while its first reminder still exists, so local fields stay attached
+    const keepId = prev && payload.rows.some(row => row.reminderId === prev.id);
+    payload.id = keepId ? prev.id : payload.rows[0].reminderId;
   }
-  
-  if (confirm("Are you sure you want to delete this reminder?")) {
-    fetch(`/api/reminders/delete/${reminderId}`, {
-      method: 'DELETE',
-      credentials: 'include'
-    })
-      .then(response => {
-        if (!response.ok) {
-          throw new Error('Failed to delete reminder');
-        }
-        return response.json();
-      })
-      .then(data => {
-        console.log("Reminder deleted:", data);
-        showSuccess("✓ Reminder deleted successfully!");
-        fetchReminders(); // Refresh the list from backend
-      })
-      .catch(error => {
-        console.error("Error deleting reminder:", error);
-        alert("Failed to delete reminder. Please try again.");
-      });
+
+  if (editingId){
+    const idx = reminders.findIndex(r => r.id === editingId);
+    if (idx > -1){ reminders[idx] = { ...reminders[idx], ...payload }; }
+    toast('Reminder saved ✅');
+  } else {
+    reminders.unshift({ id: rid(), ...payload });
+    toast('Reminder added ✅');
   }
+  saveStore(reminders);
+  renderList();
+  closePanel();
 }
 
-// Show success message
-function showSuccess(message) {
-  const successMsg = document.getElementById("successMessage");
-  const successText = document.getElementById("successText");
-  successText.textContent = message;
-  successMsg.classList.add("show");
-
-  setTimeout(() => {
-    successMsg.classList.remove("show");
-  }, 3000);
+// ---- Times chips ----
+function addTimeChip(){
+  const val = fTime.value;
+  if (!val) return;
+  const t = normalizeTime(val);
+  const exists = Array.from(timeChips.querySelectorAll('.time-chip')).some(ch => ch.dataset.t === t);
+  if (exists) { toast('Time already added'); return; }
+  const chip = chipHTML(t);
+  timeChips.insertAdjacentHTML('beforeend', chip);
+  bindChipRemove();
+  sortChips();
+  updatePreview();
+}
+function chipHTML(t){
+  return `<span class="time-chip" data-t="${t}">${to12h(t)} <button type="button" data-remove="${t}">✕</button></span>`;
+}
+function bindChipRemove(){
+  timeChips.querySelectorAll('[data-remove]').forEach(btn=>{
+    btn.onclick = () => {
+      timeChips.querySelector(`[data-t="${btn.dataset.remove}"]`)?.remove();
+      updatePreview();
+    };
+  });
+}
+function renderTimes(arr){
+  timeChips.innerHTML = '';
+  (arr || []).sort().forEach(t => {
+    timeChips.insertAdjacentHTML('beforeend', chipHTML(t));
+  });
+  bindChipRemove();
+}
+function currentTimes(){
+  return Array.from(timeChips.querySelectorAll('.time-chip')).map(ch => ch.dataset.t).sort();
+}
+function sortChips(){
+  const chips = Array.from(timeChips.children).sort((a,b)=> a.dataset.t.localeCompare(b.dataset.t));
+  timeChips.innerHTML = '';
+  chips.forEach(ch => timeChips.appendChild(ch));
 }
 
-// Event Listeners
-document.addEventListener("DOMContentLoaded", function() {
-  console.log("DOM loaded, initializing page..."); // Debug log
-  
-  // Initialize page
-  initializePage();
+// ---- Days ----
+function initDays(){
+  const names = ['S','M','T','W','T','F','S'];
+  daysWrap.innerHTML = names.map((n,i)=> `<button class="day" data-day="${i}">${n}</button>`).join('');
+  daysWrap.querySelectorAll('.day').forEach(btn=>{
+    btn.addEventListener('click', ()=>{
+      btn.classList.toggle('active');
+      dailyBtn.textContent = (daysSelected().length === 7) ? 'Daily ✓' : 'Daily';
+      updatePreview();
+    });
+  });
+}
+function daysSelected(){
+  return Array.from(daysWrap.querySelectorAll('.day.active')).map(b => parseInt(b.dataset.day,10));
+}
 
-  // Form submit listener
-  const reminderForm = document.getElementById("reminderForm");
-  if (reminderForm) {
-    console.log("Form found, attaching listener"); // Debug log
-    reminderForm.addEventListener("submit", addReminder);
-  }
+// ---- Preview ----
+function updatePreview(){
+  const times = currentTimes();
+  const days = daysSelected();
+  const daily = days.length === 7;
+  preview.textContent = buildSummary({ times, daily, days });
+}
 
-  // Close modal on outside click
-  const modal = document.getElementById("addReminderModal");
-  if (modal) {
-    modal.addEventListener("click", function (e) {
-      if (e.target === this) {
-        closeAddModal();
+// ---- Utils: Time/Format/Summary ----
+function mkRem(name,dose,times,sched,extra){
+  const daily = !!sched.daily;
+  const days = sched.days || (daily ? [0,1,2,3,4,5,6] : []);
+  return {
+    id: rid(), name, dose, times, daily, days,
+    startDate: null, endDate: null, notes: extra.notes || '',
+    preNotify: 10, active: true
+  };
+}
+function fromServer(rows){
+  // One card per medicine and dosage, with each stored reminder time as a chip
+  const byMedicine = new Map();
+  (rows || []).forEach(row => {
+    const key = `${row.medicineName}\u0000${row.dosage}`;
+    if (!byMedicine.has(key)){
+      const rem = mkRem(row.medicineName || '', row.dosage || '', [], {daily:true}, {});
+      rem.id = row.reminderId;
+      rem.rows = [];
+      byMedicine.set(key, rem);
+    }
+    if (row.time){
+      const time = normalizeTime(row.time);
+      byMedicine.get(key).times.push(time);
+      byMedicine.get(key).rows.push({ reminderId: row.reminderId, time });
+    }
+  });
+  return Array.from(byMedicine.values());
+}
+function occursToday(r){
+  const today = new Date().getDay(); // 0 Sun .. 6 Sat
+  return r.daily || (r.days||[]).includes(today);
+}
+function nextDue(r){
+  if (!r.active || !r.times?.length) return '';
+  const now = new Date();
+  const today = now.getDay();
+  for (let off=0; off<7; off++){
+    const d = (today + off) % 7;
+    if (r.daily || (r.days||[]).includes(d)){
+      const times = deep(r.times).sort();
+      if (off === 0){
+        // find next time today
+        const after = times.find(t => toMinutes(t) > (now.getHours()*60 + now.getMinutes()));
+        if (after) return offLabel(off) + ' ' + to12h(after);
+      } else {
+        return offLabel(off) + ' ' + to12h(times[0]);
       }
-    });
+    }
   }
-});
\ No newline at end of file
+  return '';
+}
+function offLabel(off){
+  if (off===0) return 'Today';
+  if (off===1) return 'Tomorrow';
+  const day = ['Sun','Mon','Tue','Wed','Thu','Fri','Sat'][(new Date().getDay()+off)%7];
+  return day;
+}
+function scheduleSummary(r){
+  const times = (r.times||[]).slice().sort().map(to12h).join(', ');
+  if (r.daily || (r.days||[]).length===7) return `Daily at ${times}`;
+  const dayNames = (r.days||[]).map(i=>['Sun','Mon','Tue','Wed','Thu','Fri','Sat'][i]).join(', ');
+  return `${dayNames} at ${times}`;
+}
+function buildSummary({times, daily, days}){
+  if (!times.length) return '—';
+  if (daily || days.length===7) return `Daily at ${times.map(to12h).join(', ')}`;
+  const dayNames = days.map(i=>['Sun','Mon','Tue','Wed','Thu','Fri','Sat'][i]).join(', ');
+  return `${dayNames} at ${times.map(to12h).join(', ')}`;
+}
+function normalizeTime(v){ // input type="time" -> HH:MM
+  const [h,m] = v.split(':'); return `${h.padStart(2,'0')}:${m.padStart(2,'0')}`;
+}
+function to12h(t){
+  let [h,m] = t.split(':').map(Number);
+  const mer = h>=12 ? 'PM' : 'AM';
+  h = h%12 || 12;
+  return `${String(h).padStart(2,'0')}:${String(m).padStart(2,'0')} ${mer}`;
+}
+function toMinutes(t){ const [h,m]=t.split(':').map(Number); return h*60+m; }
+function escape(s){ return String(s).replace(/[&<>"']/g, c=>({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;'}[c])); }
+function rid(){ return Math.random().toString(36).slice(2); }
+
+// ---- Toasts ----
+const toastEl = document.getElementById('toast');
+function toast(msg){
+  const el = document.createElement('div');
+  el.className = 'item';
+  el.textContent = msg;
+  toastEl.appendChild(el);
+  setTimeout(()=>{
+    el.style.transition='opacity .25s ease, transform .25s ease';
+    el.style.opacity='0'; el.style.transform='translateY(6px)';
+    setTimeout(()=> el.remove(), 220);
+  }, 1800);
+}
+
+// ---- Init page ----
+(function init(){
+  const user = initial?.user || { fname:'John', lname:'Doe' };
+  document.getElementById('navUserAvatar').textContent = ((user.fname||'').charAt(0)+(user.lname||'').charAt(0)).toUpperCase();
+  renderList();
+})();
@@ -1,428 +1,597 @@
 // Initialize user data
 let userData = {
-    fname: '',
-    lname: '',
-    email: ''
+  fname: '',
+  lname: '',
+  email: ''
 };
 
-// Function to load user data from backend
-async function loadUserData() {
-    try {
-        const response = await fetch('/api/me', {
-            method: 'GET',
-            credentials: 'include'
-        });
-        
-        if (!response.ok) {
-            throw new Error('Failed to load user data');
-        }
-        
-        const data = await response.json();
-        console.log('User Data from Backend:', data);
-
-        userData = { fname: data.fname, lname: data.lname, email: data.email };
-        
-        // Populate form fields
-        document.getElementById('fname').value = data.fname || '';
-        document.getElementById('lname').value = data.lname || '';
-        document.getElementById('email').value = data.email || '';
-        
-        // Update header and profile pic
-        updateUserHeader();
-        updateProfilePic();
-    } catch (error) {
-        console.error('Error loading user data:', error);
-        showSuccessMessage('✗ Error loading user data. Please refresh the page.');
-    }
+// Validation Functions
+function validateMobileNumber(mobile) {
+  return /^\d{10}$/.test(mobile);
 }
 
-// Update user header
-function updateUserHeader() {
-    if (userData.fname && userData.lname && userData.email) {
-        const fullName = `${userData.fname} ${userData.lname}`;
-        const initials = `${userData.fname.charAt(0)}${userData.lname.charAt(0)}`.toUpperCase();
-        
-        const header = document.querySelector('.header');
-        const userInfoHTML = `
-            <div class="user-info-header">
-                <div class="user-avatar">${initials}</div>
-                <div class="user-details">
-                    <div class="user-name">${fullName}</div>
-                    <div class="user-email">${userData.email}</div>
-                </div>
-            </div>
-        `;
-        
-        const existingUserInfo = header.querySelector('.user-info-header');
-        if (existingUserInfo) {
-            existingUserInfo.outerHTML = userInfoHTML;
-        } else {
-            header.insertAdjacentHTML('beforeend', userInfoHTML);
-        }
-    }
+function validatePinCode(pin) {
+  return /^\d{6}$/.test(pin);
 }
 
-// Update profile pic
-function updateProfilePic() {
-    if (userData.fname && userData.lname) {
-        const initials = `${userData.fname.charAt(0)}${userData.lname.charAt(0)}`.toUpperCase();
-        document.getElementById('profilePic').textContent = initials;
-    }
+function validateBirthDate(date) {
+  if (!date) return false;
+  const birthDate = new Date(date);
+  const today = new Date();
+  return birthDate < today;
 }
 
-// Handle file upload
-function handleFileUpload(event) {
-    const file = event.target.files[0];
-    if (file) {
-        const reader = new FileReader();
-        reader.onload = function(e) {
-            const profilePic = document.getElementById('profilePic');
-            profilePic.style.backgroundImage = `url(${e.target.result})`;
-            profilePic.style.backgroundSize = 'cover';
-            profilePic.style.backgroundPosition = 'center';
-            profilePic.textContent = '';
-        };
-        reader.readAsDataURL(file);
-    }
+function validateName(name) {
+  const trimmed = name.trim();
+  return trimmed.length >= 2 && /^[a-zA-Z\s'-]+$/.test(trimmed);
 }
 
-// Show success message
-function showSuccessMessage(message) {
-    const existingMessage = document.querySelector('.success-message');
-    if (existingMessage) {
-        existingMessage.remove();
+function showError(inputId, errorId, message) {
+  const input = document.getElementById(inputId);
+  const error = document.getElementById(errorId);
+  if (input && error) {
+    input.classList.add('error');
+    input.classList.remove('success');
+    error.textContent = message;
+    error.classList.add('show');
+  }
+}
+
+function clearError(inputId, errorId) {
+  const input = document.getElementById(inputId);
+  const error = document.getElementById(errorId);
+  if (input && error) {
+    input.classList.remove('error');
+    input.classList.add('success');
+    error.classList.remove('show');
+  }
+}
+
+// Load user data from backend
+async function loadUserData() {
+  try {
+    const response = await fetch('/api/me', {
+      method: 'GET',
+      credentials: 'include'
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to load user data');
     }
 
-    const messageDiv = document.createElement('div');
-    messageDiv.className = 'success-message';
-    messageDiv.textContent = message;
-    document.body.appendChild(messageDiv);
+    const data = await response.json();
+    console.log('User Data from Backend:', data);
 
-    setTimeout(() => messageDiv.classList.add('show'), 100);
-    setTimeout(() => {
-        messageDiv.classList.remove('show');
-        setTimeout(() => messageDiv.remove(), 400);
-    }, 3000);
-}
+    userData = { fname: data.fname, lname: data.lname, email: data.email };
 
-// Validate mobile number (10 digits)
-function validateMobileNumber(mobile) {
-    const mobileRegex = /^\d{10}$/;
-    return mobileRegex.test(mobile);
+    // Populate form fields
+    document.getElementById('fname').value = data.fname || '';
+    document.getElementById('lname').value = data.lname || '';
+    document.getElementById('email').value = data.email || '';
+
+    // Update header and profile pic
+    updateUserHeader();
+    updateProfilePic();
+  } catch (error) {
+    console.error('Error loading user data:', error);
+    showSuccessMessage('Error loading user data. Please refresh the page.');
+  }
 }
 
-// Validate PIN code (6 digits for India)
-function validatePinCode(pin) {
-    const pinRegex = /^\d{6}$/;
-    return pinRegex.test(pin);
+// Update user header
+function updateUserHeader() {
+  if (userData.fname && userData.lname && userData.email) {
+    const fullName = `${userData.fname} ${userData.lname}`;
+    const initials = `${userData.fname.charAt(0)}${userData.lname.charAt(0)}`.toUpperCase();
+
+    document.getElementById('navAvatar').textContent = initials;
+    document.getElementById('navUserName').textContent = fullName;
+    document.getElementById('navUserEmail').textContent = userData.email;
+    document.getElementById('userInfoHeader').style.display = 'flex';
+  }
 }
 
-// Validate date (must be in the past)
-function validateBirthDate(date) {
-    if (!date) return false;
-    const birthDate = new Date(date);
-    const today = new Date();
-    return birthDate < today;
+// Update profile pic
+function updateProfilePic() {
+  if (userData.fname && userData.lname) {
+    const initials = `${userData.fname.charAt(0)}${userData.lname.charAt(0)}`.toUpperCase();
+    document.getElementById('profilePic').textContent = initials;
+  }
 }
 
-// Add error to form group
-function showError(formGroup, message) {
-    formGroup.classList.add('error');
-    let errorDiv = formGroup.querySelector('.error-message');
-    if (!errorDiv) {
-        errorDiv = document.createElement('div');
-        errorDiv.className = 'error-message';
-        formGroup.appendChild(errorDiv);
-    }
-    errorDiv.textContent = message;
+// Handle file upload
+function handleFileUpload(event) {
+  const file = event.target.files[0];
+  if (file) {
+    const reader = new FileReader();
+    reader.onload = function(e) {
+      const profilePic = document.getElementById('profilePic');
+      profilePic.style.backgroundImage = `url(${e.target.result})`;
+      profilePic.style.backgroundSize = 'cover';
+      profilePic.style.backgroundPosition = 'center';
+      profilePic.textContent = '';
+    };
+    reader.readAsDataURL(file);
+  }
 }
 
-// Remove error from form group
-function clearError(formGroup) {
-    formGroup.classList.remove('error');
-    const errorDiv = formGroup.querySelector('.error-message');
-    if (errorDiv) {
-        errorDiv.remove();
-    }
+// Show success message
+function showSuccessMessage(message) {
+  const existingMessage = document.querySelector('.success-message');
+  if (existingMessage) {
+    existingMessage.remove();
+  }
+
+  const messageDiv = document.createElement('div');
+  messageDiv.className = 'success-message';
+  messageDiv.innerHTML = `<i class="fas fa-check-circle"></i> ${message}`;
+  document.body.appendChild(messageDiv);
+
+  setTimeout(() => messageDiv.classList.add('show'), 100);
+  setTimeout(() => {
+    messageDiv.classList.remove('show');
+    setTimeout(() => messageDiv.remove(), 400);
+  }, 3000);
 }
 
 // Validate form
 function validateForm(formData) {
-    let isValid = true;
-
-    // Clear all previous errors
-    document.querySelectorAll('.form-group.error').forEach(group => {
-        clearError(group);
-    });
+  let isValid = true;
+
+  // Mobile number validation
+  if (!formData.mobileNumber || !validateMobileNumber(formData.mobileNumber)) {
+    showError('mobileNumber', 'mobileNumberError', 'Please enter a valid 10-digit mobile number');
+    isValid = false;
+  } else {
+    clearError('mobileNumber', 'mobileNumberError');
+  }
+
+  // Emergency contact validation
+  if (!formData.emergencyContactNumber) {
+    showError('emergencyContactNumber', 'emergencyContactNumberError', 'Emergency contact number is required');
+    isValid = false;
+  } else if (!validateMobileNumber(formData.emergencyContactNumber)) {
+    showError('emergencyContactNumber', 'emergencyContactNumberError', 'Please enter a valid 10-digit emergency contact number');
+    isValid = false;
+  } else {
+    clearError('emergencyContactNumber', 'emergencyContactNumberError');
+  }
+
+  // Gender validation
+  if (!formData.gender) {
+    showError('male', 'genderError', 'Please select a gender');
+    isValid = false;
+  } else {
+    clearError('male', 'genderError');
+  }
+
+  // Blood group validation
+  if (!formData.bloodGroup) {
+    showError('bloodGroup', 'bloodGroupError', 'Blood group is required');
+    isValid = false;
+  } else {
+    clearError('bloodGroup', 'bloodGroupError');
+  }
+
+  // Birth date validation
+  if (!formData.birthDate) {
+    showError('birthDate', 'birthDateError', 'Birth date is required');
+    isValid = false;
+  } else if (!validateBirthDate(formData.birthDate)) {
+    showError('birthDate', 'birthDateError', 'Please enter a valid birth date in the past');
+    isValid = false;
+  } else {
+    clearError('birthDate', 'birthDateError');
+  }
+
+  // Street address validation
+  if (!formData.streetAddress || formData.streetAddress.trim().length < 5) {
+    showError('streetAddress', 'streetAddressError', 'Please enter a valid street address (minimum 5 characters)');
+    isValid = false;
+  } else {
+    clearError('streetAddress', 'streetAddressError');
+  }
+
+  // City validation
+  if (!formData.city || formData.city.trim().length < 2) {
+    showError('city', 'cityError', 'Please enter a valid city name');
+    isValid = false;
+  } else if (!validateName(formData.city)) {
+    showError('city', 'cityError', 'City name should contain only letters');
+    isValid = false;
+  } else {
+    clearError('city', 'cityError');
+  }
+
+  // State validation
+  if (!formData.state || formData.state.trim().length < 2) {
+    showError('state', 'stateError', 'Please enter a valid state name');
+    isValid = false;
+  } else if (!validateName(formData.state)) {
+    showError('state', 'stateError', 'State name should contain only letters');
+    isValid = false;
+  } else {
+    clearError('state', 'stateError');
+  }
+
+  // PIN code validation
+  if (!formData.pinCode || !validatePinCode(formData.pinCode)) {
+    showError('pinCode', 'pinCodeError', 'Please enter a valid 6-digit PIN code');
+    isValid = false;
+  } else {
+    clearError('pinCode', 'pinCodeError');
+  }
+
+  // Country validation
+  if (!formData.country) {
+    showError('country', 'countryError', 'Please select a country');
+    isValid = false;
+  } else {
+    clearError('country', 'countryError');
+  }
+
+  return isValid;
+}
 
-    // Validate mobile number
-    const mobileGroup = document.getElementById('mobileNumber').closest('.form-group');
-    if (!formData.mobileNumber || !validateMobileNumber(formData.mobileNumber)) {
-        showError(mobileGroup, 'Please enter a valid 10-digit mobile number');
-        isValid = false;
-    }
+// Handle form submission
+document.getElementById('userInfoForm').addEventListener('submit', async function (e) {
+  e.preventDefault();
 
-    // Validate emergency contact if provided
-    const emergencyGroup = document.getElementById('emergencyContactNumber').closest('.form-group');
-    if (!formData.emergencyContactNumber) {
-        showError(emergencyGroup, 'Emergency contact number is required');
-        isValid = false;
-    } else if (!validateMobileNumber(formData.emergencyContactNumber)) {
-        showError(emergencyGroup, 'Please enter a valid 10-digit emergency contact number');
-        isValid = false;
-    }
+  const formDataObj = new FormData(this);
+  const data = Object.fromEntries(formDataObj);
 
-    // Validate gender
-    if (!formData.gender) {
-        const genderGroup = document.querySelector('input[name="gender"]').closest('.form-group');
-        showError(genderGroup, 'Please select a gender');
-        isValid = false;
-    }
+  // Validate form
+  if (!validateForm(data)) {
+    return;
+  }
 
-    // Validate birth date
-    const birthDateGroup = document.getElementById('birthDate').closest('.form-group');
-    if (!formData.birthDate) {
-        showError(birthDateGroup, 'Birth date is required');
-        isValid = false;
-    } else if (!validateBirthDate(formData.birthDate)) {
-        showError(birthDateGroup, 'Please enter a valid birth date in the past');
-        isValid = false;
-    }
+  const submitBtn = document.getElementById('submitBtn');
+  const originalText = submitBtn.textContent;
+  submitBtn.textContent = 'Saving...';
+  submitBtn.disabled = true;
+  submitBtn.classList.add('loading');
 
-    // Validate blood group
-    const bloodGroup = document.getElementById('bloodGroup').closest('.form-group');
-    if (!formData.bloodGroup) {
-        showError(bloodGroup, 'Blood group is required');
-        isValid = false;
-    }
+  try {
+    const formData = new FormData();
 
-    // Validate street address
-    const streetGroup = document.getElementById('streetAddress').closest('.form-group');
-    if (!formData.streetAddress || formData.streetAddress.trim().length < 5) {
-        showError(streetGroup, 'Please enter a valid street address (minimum 5 characters)');
-        isValid = false;
-    }
+    formData.append('mobileNumber', data.mobileNumber || '');
+    formData.append('emergencyContactNumber', data.emergencyContactNumber || '');
 
-    // Validate city
-    const cityGroup = document.getElementById('city').closest('.form-group');
-    if (!formData.city || formData.city.trim().length < 2) {
-        showError(cityGroup, 'Please enter a valid city name');
-        isValid = false;
+    if (data.birthDate && data.birthDate.trim()) {
+      formData.append('birthDate', data.birthDate.trim());
+    } else {
+      throw new Error('Please select a birth date');
     }
 
-    // Validate state
-    const stateGroup = document.getElementById('state').closest('.form-group');
-    if (!formData.state || formData.state.trim().length < 2) {
-        showError(stateGroup, 'Please enter a valid state name');
-        isValid = false;
+    formData.append('city', data.city || '');
+    formData.append('gender', data.gender || '');
+    formData.append('streetAddress', data.streetAddress || '');
+    formData.append('state', data.state || '');
+    formData.append('pinCode', data.pinCode || '');
+    formData.append('country', data.country || '');
+    formData.append('bloodGroup', data.bloodGroup || '');
+    formData.append('medicalConditions', data.medicalConditions || '');
+    formData.append('allergies', data.allergies || '');
+
+    console.log('Form Data Being Sent:');
+    for (let [key, value] of formData.entries()) {
+      console.log(`${key}: "${value}"`);
     }
 
-    // Validate PIN code
-    const pinGroup = document.getElementById('pinCode').closest('.form-group');
-    if (!formData.pinCode || !validatePinCode(formData.pinCode)) {
-        showError(pinGroup, 'Please enter a valid 6-digit PIN code');
-        isValid = false;
-    }
+    const response = await fetch('/api/updateUser/', {
+      method: 'PUT',
+      credentials: 'include',
+      body: formData
+    });
 
-    // Validate country
-    const countryGroup = document.getElementById('country').closest('.form-group');
-    if (!formData.country) {
-        showError(countryGroup, 'Please select a country');
-        isValid = false;
+    if (!response.ok) {
+      let errorMessage = 'Failed to save user information';
+      try {
+        const rawResponse = await response.text();
+        const errorData = JSON.parse(rawResponse);
+
+        if (errorData.detail) {
+          if (Array.isArray(errorData.detail)) {
+            const errors = errorData.detail.map(err => {
+              const field = err.loc ? err.loc.join('.') : 'unknown';
+              return `${field}: ${err.msg}`;
+            }).join(', ');
+            errorMessage = errors;
+          } else {
+            errorMessage = errorData.detail;
+          }
+        }
+      } catch (e) {
+        console.error('Could not parse error response:', e);
+      }
+      throw new Error(errorMessage);
     }
 
-    return isValid;
-}
-
-// Handle form submission
-document.getElementById('userInfoForm').addEventListener('submit', async function (e) {
-    e.preventDefault();
-
-    // Convert FormData to object for validation
-    const formDataObj = new FormData(this);
-    const data = Object.fromEntries(formDataObj);
-
-    // Validate form
-    if (!validateForm(data)) {
-        return;
-    }
+    const result = await response.json();
+    console.log('Form submission successful:', result);
+    showSuccessMessage('User information saved successfully!');
 
-    // Disable submit button
-    const submitBtn = this.querySelector('.btn-primary');
-    const originalText = submitBtn.textContent;
-    submitBtn.textContent = 'Saving...';
-    submitBtn.disabled = true;
-
-    try {
-        // Create properly formatted FormData with explicit content type
-        const formData = new FormData();
-        
-        // Add all form fields explicitly with proper validation
-        formData.append('mobileNumber', data.mobileNumber || '');
-        formData.append('emergencyContactNumber', data.emergencyContactNumber || '');
-        
-        // IMPORTANT: Ensure birthDate is properly formatted (YYYY-MM-DD)
-        if (data.birthDate && data.birthDate.trim()) {
-            formData.append('birthDate', data.birthDate.trim());
-        } else {
-            // If no birth date, don't send it or send a default
-            alert('Please select a birth date');
-            return;
-        }
-        
-        formData.append('city', data.city || '');
-        formData.append('gender', data.gender || '');
-        formData.append('streetAddress', data.streetAddress || '');
-        formData.append('state', data.state || '');
-        formData.append('pinCode', data.pinCode || '');
-        formData.append('country', data.country || '');
-        formData.append('bloodGroup', data.bloodGroup || '');
-        formData.append('medicalConditions', data.medicalConditions || '');
-        formData.append('allergies', data.allergies || '');
-
-        // Debug: Log all form data
-        console.log('=== FORM DATA BEING SENT ===');
-        for (let [key, value] of formData.entries()) {
-            console.log(`${key}: "${value}" (type: ${typeof value}, length: ${value.length})`);
-        }
-        console.log('===========================');
-
-        const response = await fetch('/api/updateUser/', {
-            method: 'PUT',
-            credentials: 'include',
-            body: formData
-        });
-
-        console.log('Response status:', response.status);
-        console.log('Response headers:', [...response.headers.entries()]);
-
-        if (!response.ok) {
-            let errorMessage = 'Failed to save user information';
-            let rawResponse = '';
-            try {
-                rawResponse = await response.text();
-                console.error('Raw error response:', rawResponse);
-                
-                const errorData = JSON.parse(rawResponse);
-                console.error('Parsed error response:', errorData);
-                
-                // Handle validation errors
-                if (errorData.detail) {
-                    if (Array.isArray(errorData.detail)) {
-                        // FastAPI validation errors
-                        console.error('Validation errors:', errorData.detail);
-                        const errors = errorData.detail.map(err => {
-                            const field = err.loc ? err.loc.join('.') : 'unknown';
-                            const message = err.msg || 'validation error';
-                            const type = err.type || '';
-                            return `Field: ${field}\nMessage: ${message}\nType: ${type}`;
-                        }).join('\n---\n');
-                        errorMessage = `Validation errors:\n${errors}`;
-                        alert(`Validation errors:\n\n${errors}`);
-                    } else if (typeof errorData.detail === 'string') {
-                        errorMessage = errorData.detail;
-                        alert(`Error: ${errorData.detail}`);
-                    } else {
-                        errorMessage = JSON.stringify(errorData.detail);
-                        alert(`Error: ${errorMessage}`);
-                    }
-                }
-            } catch (e) {
-                console.error('Could not parse error response:', e);
-                console.error('Raw response was:', rawResponse);
-                errorMessage = `Server returned status ${response.status}. Raw response: ${rawResponse.substring(0, 500)}`;
-                alert(errorMessage);
-            }
-            throw new Error(errorMessage);
-        }
-        
-        const result = await response.json();
-        console.log('Form submission successful:', result);
-        showSuccessMessage('✓ User information saved successfully!');
-
-        // Optional: Redirect after a short delay
-        setTimeout(() => {
-            window.location.href = '/';
-        }, 1500);
-
-    } catch (error) {
-        console.error('Error saving user information:', error);
-        showSuccessMessage(`✗ ${error.message}`);
-    } finally {
-        submitBtn.textContent = originalText;
-        submitBtn.disabled = false;
-    }
+    setTimeout(() => {
+      window.location.href = '/';
+    }, 1500);
+
+  } catch (error) {
+    console.error('Error saving user information:', error);
+    showSuccessMessage(error.message);
+  } finally {
+    submitBtn.textContent = originalText;
+    submitBtn.disabled = false;
+    submitBtn.classList.remove('loading');
+  }
 });
 
 // Reset form
 function resetForm() {
-    if (confirm('Are you sure you want to cancel? All unsaved changes will be lost.')) {
-        document.getElementById('userInfoForm').reset();
-        
-        // Restore readonly fields
-        document.getElementById('fname').value = userData.fname;
-        document.getElementById('lname').value = userData.lname;
-        document.getElementById('email').value = userData.email;
-        
-        // Clear all errors
-        document.querySelectorAll('.form-group.error').forEach(group => {
-            clearError(group);
-        });
-    }
+  if (confirm('Are you sure you want to cancel? All unsaved changes will be lost.')) {
+    document.getElementById('userInfoForm').reset();
+
+    document.getElementById('fname').value = userData.fname;
+    document.getElementById('lname').value = userData.lname;
+    document.getElementById('email').value = userData.email;
+
+    // Clear all errors
+    const errorFields = ['mobileNumber', 'emergencyContactNumber', 'gender', 'bloodGroup', 
+                         'birthDate', 'streetAddress', 'city', 'state', 'pinCode', 'country'];
+    errorFields.forEach(field => {
+      const errorId = field + 'Error';
+      if (field === 'gender') {
+        clearError('male', errorId);
+      } else {
+        clearError(field, errorId);
+      }
+    });
+  }
 }
 
 // Logout function
 function logout() {
-    if (confirm('Are you sure you want to logout?')) {
-        fetch('/api/logout', {
-            method: 'GET',
-            credentials: 'include'
-        }).then(response => {
-            if (response.ok) {
-                window.location.href = '/';
-            } else {
-                console.error('Logout failed:', response);
-            }
-        });
-    }
+  if (confirm('Are you sure you want to logout?')) {
+    fetch('/api/logout', {
+      method: 'GET',
+      credentials: 'include'
+    }).then(response => {
+      if (response.ok) {
+        window.location.href = '/';
+      } else {
+        console.error('Logout failed:', response);
+      }
+    });
+  }
 }
 
-// Add input event listeners for real-time validation
-document.querySelectorAll('input, select, textarea').forEach(element => {
-    element.addEventListener('input', function() {
-        const formGroup = this.closest('.form-group');
-        if (formGroup && formGroup.classList.contains('error')) {
-            clearError(formGroup);
-        }
+// Clear errors on input
+['mobileNumber', 'emergencyContactNumber', 'bloodGroup', 'birthDate', 
+ 'streetAddress', 'city', 'state', 'pinCode', 'country'].forEach(fieldId => {
+  const input = document.getElementById(fieldId);
+  if (input) {
+    input.addEventListener('input', () => {
+      const errorId = fieldId + 'Error';
+      clearError(fieldId, errorId);
     });
+  }
+});
+
+// Gender radio buttons
+document.querySelectorAll('input[name="gender"]').forEach(radio => {
+  radio.addEventListener('change', () => {
+    clearError('male', 'genderError');
+  });
 });
 
-// Mobile number formatting (only digits, max 10)
+// Mobile number formatting
 document.getElementById('mobileNumber').addEventListener('input', function(e) {
-    e.target.value = e.target.value.replace(/\D/g, '').slice(0, 10);
+  e.target.value = e.target.value.replace(/\D/g, '').slice(0, 10);
 });
 
 document.getElementById('emergencyContactNumber').addEventListener('input', function(e) {
-    e.target.value = e.target.value.replace(/\D/g, '').slice(0, 10);
+  e.target.value = e.target.value.replace(/\D/g, '').slice(0, 10);
 });
 
-// PIN code formatting (only digits, max 6)
+// PIN code formatting
 document.getElementById('pinCode').addEventListener('input', function(e) {
-    e.target.value = e.target.value.replace(/\D/g, '').slice(0, 6);
+  e.target.value = e.target.value.replace(/\D/g, '').slice(0, 6);
 });
 
-// Set max date for birth date (today)
+// Set max date for birth date
 document.getElementById('birthDate').setAttribute('max', new Date().toISOString().split('T')[0]);
 
+// Canvas Animation (same as login page)
+function n(e) {
+  this.init(e || {});
+}
+n.prototype = {
+  init: function (e) {
+    this.phase = e.phase || 0;
+    this.offset = e.offset || 0;
+    this.frequency = e.frequency || 0.001;
+    this.amplitude = e.amplitude || 1;
+  },
+  update: function () {
+    return (
+      (this.phase += this.frequency),
+      (window.canvasE = this.offset + Math.sin(this.phase) * this.amplitude)
+    );
+  },
+  value: function () {
+    return window.canvasE;
+  },
+};
+
+function Line(e) {
+  this.init(e || {});
+}
+
+Line.prototype = {
+  init: function (e) {
+    this.spring = e.spring + 0.1 * Math.random() - 0.05;
+    this.friction = window.E.friction + 0.01 * Math.random() - 0.005;
+    this.nodes = [];
+    for (var t, n = 0; n < window.E.size; n++) {
+      t = new Node();
+      t.x = window.pos.x;
+      t.y = window.pos.y;
+      this.nodes.push(t);
+    }
+  },
+  update: function () {
+    let e = this.spring,
+      t = this.nodes[0];
+    t.vx += (window.pos.x - t.x) * e;
+    t.vy += (window.pos.y - t.y) * e;
+    for (var n, i = 0, a = this.nodes.length; i < a; i++)
+      (t = this.nodes[i]),
+        0 < i &&
+          ((n = this.nodes[i - 1]),
+          (t.vx += (n.x - t.x) * e),
+          (t.vy += (n.y - t.y) * e),
+          (t.vx += n.vx * window.E.dampening),
+          (t.vy += n.vy * window.E.dampening)),
+        (t.vx *= this.friction),
+        (t.vy *= this.friction),
+        (t.x += t.vx),
+        (t.y += t.vy),
+        (e *= window.E.tension);
+  },
+  draw: function () {
+    let e,
+      t,
+      n = this.nodes[0].x,
+      i = this.nodes[0].y;
+    window.ctx.beginPath();
+    window.ctx.moveTo(n, i);
+    for (var a = 1, o = this.nodes.length - 2; a < o; a++) {
+      e = this.nodes[a];
+      t = this.nodes[a + 1];
+      n = 0.5 * (e.x + t.x);
+      i = 0.5 * (e.y + t.y);
+      window.ctx.quadraticCurveTo(e.x, e.y, n, i);
+    }
+    e = this.nodes[a];
+    t = this.nodes[a + 1];
+    window.ctx.quadraticCurveTo(e.x, e.y, t.x, t.y);
+    window.ctx.stroke();
+    window.ctx.closePath();
+  },
+};
+
+function onMousemove(e) {
+  function o() {
+    window.lines = [];
+    for (let e = 0; e < window.E.trails; e++)
+      window.lines.push(
+        new Line({ spring: 0.45 + (e / window.E.trails) * 0.025 })
+      );
+  }
+  function c(e) {
+    e.touches
+      ? ((window.pos.x = e.touches[0].pageX),
+        (window.pos.y = e.touches[0].pageY))
+      : ((window.pos.x = e.clientX), (window.pos.y = e.clientY)),
+      e.preventDefault();
+  }
+  function l(e) {
+    1 == e.touches.length &&
+      ((window.pos.x = e.touches[0].pageX),
+      (window.pos.y = e.touches[0].pageY));
+  }
+  document.removeEventListener("mousemove", onMousemove),
+    document.removeEventListener("touchstart", onMousemove),
+    document.addEventListener("mousemove", c),
+    document.addEventListener("touchmove", c),
+    document.addEventListener("touchstart", l),
+    c(e),
+    o(),
+    render();
+}
+
+function render() {
+  if (window.ctx.running) {
+    window.ctx.globalCompositeOperation = "source-over";
+    window.ctx.clearRect(
+      0,
+      0,
+      window.ctx.canvas.width,
+      window.ctx.canvas.height
+    );
+    window.ctx.globalCompositeOperation = "lighter";
+    window.ctx.strokeStyle =
+      "hsla(" + Math.round(window.f.update()) + ",100%,50%,0.025)";
+    window.ctx.lineWidth = 10;
+    for (var e, t = 0; t < window.E.trails; t++) {
+      (e = window.lines[t]).update();
+      e.draw();
+    }
+    window.ctx.frame++;
+    window.requestAnimationFrame(render);
+  }
+}
+
+function resizeCanvas() {
+  window.ctx.canvas.width = window.innerWidth;
+  window.ctx.canvas.height = window.innerHeight;
+}
+
+window.canvasE = 0;
+window.pos = {};
+window.lines = [];
+window.E = {
+  debug: true,
+  friction: 0.5,
+  trails: 80,
+  size: 50,
+  dampening: 0.025,
+  tension: 0.99,
+};
+
+function Node() {
+  this.x = 0;
+  this.y = 0;
+  this.vy = 0;
+  this.vx = 0;
+}
+
+function renderCanvas() {
+  window.ctx = document.getElementById("canvas").getContext("2d");
+  if (!window.ctx) return;
+  window.ctx.running = true;
+  window.ctx.frame = 1;
+  window.f = new n({
+    phase: Math.random() * 2 * Math.PI,
+    amplitude: 85,
+    frequency: 0.0015,
+    offset: 285,
+  });
+  document.addEventListener("mousemove", onMousemove);
+  document.addEventListener("touchstart", onMousemove);
+  document.body.addEventListener("orientationchange", resizeCanvas);
+  window.addEventListener("resize", resizeCanvas);
+  window.addEventListener("focus", () => {
+    if (!window.ctx.running) {
+      window.ctx.running = true;
+      render();
+    }
+  });
+  window.addEventListener("blur", () => {
+    window.ctx.running = true;
+  });
+  resizeCanvas();
+}
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
-    loadUserData();
-    
-    // Auto-resize textareas
-    document.querySelectorAll('textarea').forEach(textarea => {
-        textarea.addEventListener('input', function() {
-            this.style.height = 'auto';
-            this.style.height = (this.scrollHeight) + 'px';
-        });
+  loadUserData();
+  renderCanvas();
+
+  // Auto-resize textareas
+  document.querySelectorAll('textarea').forEach(textarea => {
+    textarea.addEventListener('input', function() {
+      this.style.height = 'auto';
+      this.style.height = (this.scrollHeight) + 'px';
     });
-});
\ No newline at end of file
+  });
+});
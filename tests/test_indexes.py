@@ -0,0 +1,30 @@
+"""
+The hot reminder queries must stay index-backed.
+
+Runs EXPLAIN against the database configured in .env and is skipped when
+none is reachable or its schema is behind migrations/:
+
+    python -m models.migrate && python -m pytest tests/test_indexes.py
+"""
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+
+@pytest.fixture(scope="module")
+def migrate():
+    try:
+        from models import migrate
+        pending = migrate.pending_migrations()
+    except Exception as e:
+        pytest.skip(f"no database: {e}")
+    if pending:
+        pytest.skip(f"pending migrations: {', '.join(pending)}")
+    return migrate
+
+
+def test_hot_queries_use_an_index(migrate):
+    problems = migrate.check_indexes()
+    assert not problems, "\n".join(
+        f"{name}: {issue}" for name, issues in problems.items() for issue in issues
+    )
@@ -1,8 +1,15 @@
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+from requests.adapters import HTTPAdapter
+from twilio_transport import AsyncTwilioTransport, CircuitBreaker, CircuitOpenError, TwilioAPIError
 from twilio.twiml.voice_response import VoiceResponse
 from twilio.base.exceptions import TwilioRestException
 import os
-from config import Settings
+import threading
+import time
+from contextlib import contextmanager
+import metrics
+from config import Settings, settings
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,9 +24,54 @@ class TwilioService:
             print("⚠️ Warning: Twilio credentials not found in environment variables")
             self.client = None
         else:
-            self.client = Client(self.account_sid, self.auth_token)
+            # One keep-alive session shared by all threads, sized to the concurrency window
+            http_client = TwilioHttpClient(pool_connections=True, timeout=settings.TWILIO_TIMEOUT)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.TWILIO_MAX_CONCURRENCY)
+            http_client.session.mount("https://", adapter)
+            self.client = Client(self.account_sid, self.auth_token, http_client=http_client)
             print("✅ Twilio client initialized")
+
+        # Bounds the number of in-flight Twilio API requests across all threads
+        self.window = threading.BoundedSemaphore(settings.TWILIO_MAX_CONCURRENCY)
+
+        # Non-blocking transport used by the reminder dispatcher
+        self.transport = None
+        if self.client:
+            self.transport = AsyncTwilioTransport(
+                self.account_sid,
+                self.auth_token,
+                base_url=settings.TWILIO_API_BASE,
+                timeout=settings.TWILIO_TIMEOUT,
+                max_retries=settings.TWILIO_MAX_RETRIES,
+                max_connections=settings.TWILIO_MAX_CONCURRENCY,
+                breaker=CircuitBreaker(settings.TWILIO_BREAKER_THRESHOLD, settings.TWILIO_BREAKER_RESET_SECONDS)
+            )
     
+    @contextmanager
+    def _request(self, resource: str):
+        """Concurrency window plus latency and error-code metrics for one synchronous API call"""
+        start = time.perf_counter()
+        try:
+            with self.window:
+                yield
+        except TwilioRestException as e:
+            metrics.twilio_request_duration.observe(time.perf_counter() - start, resource=resource, status=e.status)
+            metrics.twilio_errors.inc(resource=resource, code=e.code or e.status)
+            raise
+        except Exception as e:
+            metrics.twilio_request_duration.observe(time.perf_counter() - start, resource=resource, status="error")
+            metrics.twilio_errors.inc(resource=resource, code=type(e).__name__)
+            raise
+        metrics.twilio_request_duration.observe(time.perf_counter() - start, resource=resource, status="ok")
+
+    @staticmethod
+    def format_phone(to_phone, country_code: str = None) -> str:
+        """E.164 number; national numbers get the user's (or the default) country code"""
+        to_phone = str(to_phone).replace(' ', '')
+        if not to_phone.startswith('+'):
+            to_phone = (country_code or settings.DEFAULT_COUNTRY_CODE) + to_phone
+        return to_phone
+
     def send_sms(self, to_phone: str, message: str) -> dict:
         """Send SMS to a phone number"""
         if not self.client:
@@ -30,15 +82,15 @@ class TwilioService:
         
         try:
             # Ensure phone number has country code
-            if not to_phone.startswith('+'):
-                to_phone = '+91' + to_phone.replace(' ', '')
+            to_phone = self.format_phone(to_phone)
             
             # Send SMS
-            message_obj = self.client.messages.create(
-                body=message,
-                from_=self.twilio_phone,
-                to=to_phone
-            )
+            with self._request("Messages"):
+                message_obj = self.client.messages.create(
+                    body=message,
+                    from_=self.twilio_phone,
+                    to=to_phone
+                )
             
             print(f"✅ SMS sent! SID: {message_obj.sid}")
             
@@ -63,21 +115,55 @@ class TwilioService:
                 "error": str(e)
             }
     
-    def send_medicine_reminder(self, to_phone: str, medicine_name: str, 
-                               dosage: str, time: str) -> dict:
-        """Send medicine reminder SMS"""
-        message = f"""🔔 MedRed Reminder
+    @staticmethod
+    def reminders_message(reminders: list, time: str) -> str:
+        if len(reminders) == 1:
+            return f"""🔔 MedRed Reminder
 
-Medicine: {medicine_name}
-Dosage: {dosage}
+Medicine: {reminders[0]['medicine_name']}
+Dosage: {reminders[0]['dosage']}
 Time: {time}
 
 Don't forget to take your medicine!
 
 - MedRed Team"""
-        
-        return self.send_sms(to_phone, message)
+
+        medicines = "\n".join(f"• {r['medicine_name']} - {r['dosage']}" for r in reminders)
+        return f"""🔔 MedRed Reminder
+
+Time: {time}
+{medicines}
+
+Don't forget to take your medicines!
+
+- MedRed Team"""
+
+    @staticmethod
+    def reminders_speech(reminders: list, time: str) -> str:
+        if len(reminders) == 1:
+            return (f"Hello! This is your medicine reminder. "
+                    f"Please take {reminders[0]['medicine_name']}, dosage {reminders[0]['dosage']}, at {time}.")
+        medicines = ", ".join(f"{r['medicine_name']}, dosage {r['dosage']}" for r in reminders)
+        return f"Hello! This is your medicine reminder. At {time}, please take {medicines}."
+
+    @staticmethod
+    def twiml_say(text: str) -> str:
+        response = VoiceResponse()
+        response.say(text, voice="alice")
+        return str(response)
+
+    def send_medicine_reminder(self, to_phone: str, medicine_name: str, 
+                               dosage: str, time: str) -> dict:
+        """Send medicine reminder SMS"""
+        return self.send_medicine_reminders(to_phone, [{"medicine_name": medicine_name, "dosage": dosage}], time)
     
+    def send_medicine_reminders(self, to_phone: str, reminders: list, time: str) -> dict:
+        """
+        Send one SMS covering every medicine due for this number at `time`.
+        reminders: [{"medicine_name": ..., "dosage": ...}, ...]
+        """
+        return self.send_sms(to_phone, self.reminders_message(reminders, time))
+
     def get_message_status(self, message_sid: str) -> dict:
         """Check the status of a sent message"""
         if not self.client:
@@ -107,15 +193,15 @@ Don't forget to take your medicine!
 
         try:
             # Ensure phone number has country code
-            if not to_phone.startswith('+'):
-                to_phone = '+91' + to_phone.replace(' ', '')
+            to_phone = self.format_phone(to_phone)
 
             # Make call using TwiML
-            call = self.client.calls.create(
-                to=to_phone,
-                from_=self.twilio_phone,
-                twiml=f'<Response><Say voice="alice">{message}</Say></Response>'
-            )
+            with self._request("Calls"):
+                call = self.client.calls.create(
+                    to=to_phone,
+                    from_=self.twilio_phone,
+                    twiml=f'<Response><Say voice="alice">{message}</Say></Response>'
+                )
 
             print(f"✅ Call initiated! SID: {call.sid}")
             return {
@@ -131,34 +217,74 @@ Don't forget to take your medicine!
             return {"success": False, "error": str(e)}
 
     def send_medicine_reminder_call(self, to_phone: str, medicine_name: str, dosage: str, time: str) -> dict:
+        return self.send_medicine_reminders_call(to_phone, [{"medicine_name": medicine_name, "dosage": dosage}], time)
+
+    def send_medicine_reminders_call(self, to_phone: str, reminders: list, time: str) -> dict:
+        """Place one call covering every medicine due for this number at `time`"""
         if not self.client:
             return {"success": False, "error": "Twilio not configured"}
-    
+
         try:
-            if not to_phone.startswith('+'):
-                to_phone = '+91' + to_phone.replace(' ', '')
+            to_phone = self.format_phone(to_phone)
 
-        # Create a TwiML response
+            # Create a TwiML response
             response = VoiceResponse()
-            response.say(
-                f"Hello! This is your medicine reminder. "
-                f"Please take {medicine_name}, dosage {dosage}, at {time}.",
-                voice="alice"
-            )
+            response.say(self.reminders_speech(reminders, time), voice="alice")
 
             # Make the call
-            call = self.client.calls.create(
-                twiml=response,
-                to=to_phone,
-                from_=self.twilio_phone
-            )
+            with self._request("Calls"):
+                call = self.client.calls.create(
+                    twiml=response,
+                    to=to_phone,
+                    from_=self.twilio_phone
+                )
 
             return {"success": True, "sid": call.sid, "status": call.status, "to": to_phone}
 
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    # ==================== ASYNC API ====================
+
+    async def _send_async(self, kind: str, to_phone: str, create) -> dict:
+        if not self.transport:
+            return {"success": False, "error": "Twilio not configured"}
+        to_phone = self.format_phone(to_phone)
+        try:
+            result = await create(to_phone)
+            print(f"✅ {kind} sent! SID: {result.get('sid')}")
+            return {"success": True, "sid": result.get("sid"), "status": result.get("status"), "to": to_phone}
+        except CircuitOpenError as e:
+            return {"success": False, "error": str(e), "to": to_phone}
+        except TwilioAPIError as e:
+            print(f"❌ Twilio Error: {e.msg}")
+            return {"success": False, "error": str(e), "code": e.code, "to": to_phone}
+        except Exception as e:
+            print(f"❌ Error sending {kind}: {e!r}")
+            return {"success": False, "error": str(e) or repr(e), "to": to_phone}
+
+    async def send_sms_async(self, to_phone: str, message: str) -> dict:
+        return await self._send_async(
+            "SMS", to_phone,
+            lambda to: self.transport.create_message(to=to, from_=self.twilio_phone, body=message)
+        )
+
+    async def make_call_async(self, to_phone: str, twiml: str) -> dict:
+        return await self._send_async(
+            "Call", to_phone,
+            lambda to: self.transport.create_call(to=to, from_=self.twilio_phone, twiml=twiml)
+        )
+
+    async def send_medicine_reminders_async(self, to_phone: str, reminders: list, time: str) -> dict:
+        return await self.send_sms_async(to_phone, self.reminders_message(reminders, time))
+
+    async def send_medicine_reminders_call_async(self, to_phone: str, reminders: list, time: str) -> dict:
+        return await self.make_call_async(to_phone, self.twiml_say(self.reminders_speech(reminders, time)))
+
+    async def aclose(self):
+        if self.transport:
+            await self.transport.close()
 
 
 # Create singleton instance
-twilio_service = TwilioService()
\ No newline at end of file
+twilio_service = TwilioService()
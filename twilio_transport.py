@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+import aiohttp
+import metrics
+
+
+class TwilioAPIError(Exception):
+    """Non-retryable (or retries exhausted) error from the Twilio REST API"""
+
+    def __init__(self, status: int, message: str, code=None):
+        super().__init__(message)
+        self.status = status
+        self.msg = message
+        self.code = code
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Twilio while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and sheds calls for
+    `reset_timeout` seconds, then lets a single trial call through (half-open).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError("Twilio circuit breaker is open")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def status(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class AsyncTwilioTransport:
+    """
+    Minimal async client for the Twilio REST API over one pooled aiohttp session.
+    429 and 5xx responses (and connection errors) are retried with jittered
+    exponential backoff; repeated failures trip the circuit breaker.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, account_sid: str, auth_token: str, base_url: str = "https://api.twilio.com",
+                 timeout: float = 15.0, max_retries: int = 3, max_connections: int = 20,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, breaker: CircuitBreaker = None):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.session = None
+        self.retries = 0
+
+    def _session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the event loop that uses it
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                auth=aiohttp.BasicAuth(self.account_sid, self.auth_token),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _backoff(self, attempt: int, retry_after=None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    async def _read_body(response) -> tuple:
+        """(body dict, decoded) - HTML/empty pages from proxies and non-object JSON give {}"""
+        try:
+            body = await response.json(content_type=None)
+        except ValueError:
+            return {}, False
+        return (body, True) if isinstance(body, dict) else ({}, False)
+
+    async def post(self, resource: str, data: dict) -> dict:
+        """POST form data to /2010-04-01/Accounts/{sid}/{resource}.json"""
+        self.breaker.before_call()
+        url = f"{self.base_url}/2010-04-01/Accounts/{self.account_sid}/{resource}.json"
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                retry_after = None
+                start = time.perf_counter()
+                try:
+                    async with self._session().post(url, data=data) as response:
+                        body, decoded = await self._read_body(response)
+                        metrics.twilio_request_duration.observe(
+                            time.perf_counter() - start, resource=resource, status=response.status
+                        )
+                        if response.status >= 400:
+                            metrics.twilio_errors.inc(resource=resource, code=body.get("code") or response.status)
+                        if response.status < 400:
+                            # Accepted even if the body is unreadable; retrying would send it twice
+                            settled = True
+                            self.breaker.record_success()
+                            return body
+                        if decoded and response.status not in self.RETRY_STATUSES:
+                            # Client errors are the caller's problem, not the provider's
+                            settled = True
+                            self.breaker.record_success()
+                            raise TwilioAPIError(response.status, body.get("message", "Twilio request failed"), body.get("code"))
+                        # 429/5xx, or an error page that didn't come from the Twilio API
+                        error = TwilioAPIError(response.status, body.get("message", "Twilio unavailable"), body.get("code"))
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    metrics.twilio_request_duration.observe(time.perf_counter() - start, resource=resource, status="error")
+                    metrics.twilio_errors.inc(resource=resource, code=type(e).__name__)
+                    error = e
+
+                if attempt >= self.max_retries:
+                    raise error
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+                attempt += 1
+                self.retries += 1
+        except BaseException:
+            # Exhausted retries, unexpected errors and cancellation all count as a
+            # failure, which also clears a half-open trial so the breaker can't wedge
+            if not settled:
+                self.breaker.record_failure()
+            raise
+
+    async def create_message(self, to: str, from_: str, body: str) -> dict:
+        return await self.post("Messages", {"To": to, "From": from_, "Body": body})
+
+    async def create_call(self, to: str, from_: str, twiml: str) -> dict:
+        return await self.post("Calls", {"To": to, "From": from_, "Twiml": twiml})
+
+    def status(self) -> dict:
+        return {"retries": self.retries, "circuit_breaker": self.breaker.status()}